@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+# Ensure workspace root is importable when running from aoi-core/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoi_core.acp.approval_store import ApprovalStore, iso_to_ts
+
+DEFAULT_POLICY = "aoi-core/state/acp_automation_policy_v0_1.json"
+
+
+def load_policy(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def day_bounds(day: str | None, tz: ZoneInfo) -> tuple[float, float]:
+    """[start, end) of a calendar day (default: today) in the policy's timezone."""
+    d = datetime.strptime(day, "%Y-%m-%d").date() if day else datetime.now(tz).date()
+    start = datetime(d.year, d.month, d.day, tzinfo=tz)
+    return start.timestamp(), (start + timedelta(days=1)).timestamp()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Query and maintain the approval store")
+    ap.add_argument("--repo", default=".", help="repo root")
+    ap.add_argument("--policy", default=DEFAULT_POLICY, help="policy JSON (store dir, expiry, timezone)")
+    ap.add_argument("--approvals-dir", default=None, help="store dir (default: policy approval.store_dir)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("list", help="approvals, newest first")
+    p.add_argument("--status", default=None, help="e.g. PENDING_APPROVAL, BLOCKED, EXPIRED")
+    p.add_argument("--action", default=None)
+    p.add_argument("--since", default=None, help="ISO time (inclusive)")
+    p.add_argument("--until", default=None, help="ISO time (exclusive)")
+    p.add_argument("--limit", type=int, default=None)
+    p.add_argument("--json", action="store_true", help="full records as JSONL")
+
+    p = sub.add_parser("show", help="one approval and its status history")
+    p.add_argument("id")
+
+    p = sub.add_parser("set-status", help="record a status change (e.g. APPROVED, REJECTED)")
+    p.add_argument("id")
+    p.add_argument("status")
+    p.add_argument("--note", default=None)
+
+    p = sub.add_parser("expire", help="mark stale PENDING_APPROVAL entries EXPIRED")
+    p.add_argument("--hours", type=float, default=None, help="default: policy approval.expires_hours (72)")
+
+    p = sub.add_parser("totals", help="count and USD per action for one day")
+    p.add_argument("--day", default=None, help="YYYY-MM-DD in the policy timezone (default: today)")
+    p.add_argument("--status", default=None)
+
+    p = sub.add_parser("export", help="write <id>.json files")
+    p.add_argument("--out", default=None, help="output dir (default: the store dir)")
+    p.add_argument("ids", nargs="*")
+
+    p = sub.add_parser("import", help="load per-id JSON files (migration from the file-per-approval layout)")
+    p.add_argument("paths", nargs="*", help="default: *.json in the store dir")
+
+    p = sub.add_parser("compact", help="collapse old status history and vacuum")
+    p.add_argument("--older-than-days", type=float, default=30)
+
+    args = ap.parse_args()
+
+    repo = Path(args.repo).resolve()
+    policy_path = Path(args.policy)
+    policy = load_policy(policy_path if policy_path.is_absolute() else repo / policy_path)
+    approval_cfg = policy.get("approval") or {}
+    approvals_dir = Path(args.approvals_dir) if args.approvals_dir else repo / approval_cfg.get("store_dir", "aoi-core/state/approvals")
+    tz = ZoneInfo(policy.get("timezone") or "UTC")
+
+    with ApprovalStore.in_dir(approvals_dir) as store:
+        if args.cmd == "list":
+            rows = store.query(
+                status=args.status,
+                action=args.action,
+                since=iso_to_ts(args.since) if args.since else None,
+                until=iso_to_ts(args.until) if args.until else None,
+                limit=args.limit,
+            )
+            for a in rows:
+                if args.json:
+                    print(json.dumps(a, ensure_ascii=False))
+                else:
+                    print(f"{a['id']}\t{a['status']}\t{a.get('action')}\t{a.get('risk_level')}\t{a.get('created_at')}")
+        elif args.cmd == "show":
+            a = store.get(args.id)
+            if a is None:
+                print(f"unknown approval: {args.id}", file=sys.stderr)
+                return 1
+            print(json.dumps({"approval": a, "history": store.history(args.id)}, ensure_ascii=False, indent=2))
+        elif args.cmd == "set-status":
+            if not store.set_status(args.id, args.status, note=args.note):
+                print(f"unknown approval: {args.id}", file=sys.stderr)
+                return 1
+        elif args.cmd == "expire":
+            hours = args.hours if args.hours is not None else float(approval_cfg.get("expires_hours", 72))
+            for approval_id in store.expire(hours):
+                print(approval_id)
+        elif args.cmd == "totals":
+            since, until = day_bounds(args.day, tz)
+            print(json.dumps(store.totals(since=since, until=until, status=args.status), indent=2))
+        elif args.cmd == "export":
+            out = Path(args.out) if args.out else approvals_dir
+            for path in store.export_json(out, args.ids or None):
+                print(path)
+        elif args.cmd == "import":
+            paths = [Path(p) for p in args.paths] or sorted(approvals_dir.glob("*.json"))
+            print(f"imported {store.import_json(paths)} of {len(paths)}")
+        elif args.cmd == "compact":
+            print(f"removed {store.compact(older_than_days=args.older_than_days)} log rows")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
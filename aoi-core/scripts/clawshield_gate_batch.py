@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+# Ensure workspace root is importable when running from aoi-core/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoi_core.acp.batch_gate import default_shared_cache_dir, load_manifest, run_batch
+from aoi_core.acp.clawshield_gate import default_workers
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="ClawShield gate over many (repo, commit) pairs, streaming JSONL reports")
+    ap.add_argument("--manifest", required=True,
+                    help='JSONL: {"repo": path, "commit": ref} or {"repo": path, "range": "a..b"} per line')
+    ap.add_argument("--out", default="-", help="JSONL output path (default: stdout)")
+    ap.add_argument("--workers", type=int, default=0, help=f"worker processes (0 = auto, {default_workers()} here)")
+    ap.add_argument("--cache-dir", default=None, help=f"shared per-blob result cache (default: {default_shared_cache_dir()})")
+    args = ap.parse_args()
+
+    jobs = load_manifest(Path(args.manifest))
+    cache_dir = Path(args.cache_dir) if args.cache_dir else None
+    workers = args.workers or default_workers()
+    if args.out == "-":
+        stats = run_batch(jobs, sys.stdout, cache_dir=cache_dir, workers=workers)
+    else:
+        out = Path(args.out).resolve()
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with out.open("w", encoding="utf-8") as f:
+            stats = run_batch(jobs, f, cache_dir=cache_dir, workers=workers)
+
+    print(f"[batch] {asdict(stats)}", file=sys.stderr)
+    return 1 if stats.red or stats.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,7 +10,8 @@ from pathlib import Path
 # Ensure workspace root is importable when running from aoi-core/scripts
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-from aoi_core.acp.clawshield_gate import make_report, scan_repo_snapshot
+from aoi_core.acp.blob_cache import BlobResultCache
+from aoi_core.acp.clawshield_gate import default_workers, ruleset_digest, run_gate
 
 
 def git_verify_commit(repo: Path, commit: str) -> None:
@@ -23,6 +24,15 @@ def main() -> int:
     ap.add_argument("--repo", required=True, help="path to git repo")
     ap.add_argument("--commit", required=True, help="commit sha (must exist locally)")
     ap.add_argument("--out", required=True, help="output json path")
+    ap.add_argument("--workers", type=int, default=1, help=f"parallel scan workers (0 = auto, {default_workers()} here; default 1 = serial)")
+    ap.add_argument("--processes", action="store_true", help="use a process pool instead of threads for --workers")
+    ap.add_argument("--source", choices=["worktree", "tree"], default="worktree",
+                    help="worktree: files on disk; tree: the commit's blobs from the git object store")
+    ap.add_argument("--honor-gitignore", action="store_true",
+                    help="worktree source: skip untracked files matched by .gitignore / .git/info/exclude "
+                         "(tracked files are always scanned)")
+    ap.add_argument("--incremental", action="store_true", help="tree scan reading only blobs not in the per-blob cache")
+    ap.add_argument("--cache-dir", default=None, help="per-blob result cache dir (default: <git-dir>/clawshield-cache)")
     args = ap.parse_args()
 
     repo = Path(args.repo).resolve()
@@ -32,8 +42,17 @@ def main() -> int:
     git_verify_commit(repo, args.commit)
 
     # Safety note: we DO NOT checkout or modify working tree in this PoC.
-    findings = scan_repo_snapshot(repo)
-    report = make_report(repo=str(repo), commit=args.commit, findings=findings)
+    report = run_gate(
+        repo,
+        args.commit,
+        source=args.source,
+        incremental=args.incremental,
+        cache=BlobResultCache(Path(args.cache_dir), ruleset_digest()) if args.cache_dir else None,
+        workers=args.workers or default_workers(),
+        use_processes=args.processes,
+        honor_ignores=args.honor_gitignore,
+    )
+    stats = report.get("scan")
 
     out = Path(args.out).resolve()
     out.parent.mkdir(parents=True, exist_ok=True)
@@ -42,6 +61,8 @@ def main() -> int:
     print("✅ clawshield_gate_poc: wrote")
     print(f"- out: {out}")
     print(f"- signal: {report['result']['signal']} (score {report['result']['score']})")
+    if stats is not None:
+        print(f"- blobs: {stats['blobs']} ({stats['scanned']} scanned, {stats['cached']} cached)")
     return 0
 
 
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+# Ensure workspace root is importable when running from aoi-core/scripts
+WORKSPACE = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(WORKSPACE))
+
+from aoi_core.acp.blob_cache import BlobResultCache
+from aoi_core.acp.clawshield_gate import (
+    default_workers,
+    iter_scan_candidates,
+    make_report,
+    ruleset_digest,
+    scan_commit_incremental,
+    scan_commit_tree,
+    scan_repo_snapshot,
+    score_findings,
+)
+from aoi_core.acp.gate_daemon import GateDaemon, ping
+
+# Benchmark harness for the clawshield gate.
+#
+# Generates a synthetic git repo (seeded, so runs are comparable), then times
+# each scan entry point and the full pre-push hook in a fresh spawned process
+# per stage, so every stage's peak RSS is its own. Results go to JSON; pass a
+# previous result as --baseline to print per-stage deltas.
+#
+#     python3 aoi-core/scripts/gate_bench.py --files 5000 --out bench.json
+#     python3 aoi-core/scripts/gate_bench.py --files 5000 --baseline bench.json
+#
+# The synthetic repo also carries a copy of the gate tooling (aoi_core,
+# aoi-core/scripts, the policy) so pre_push_gate.py runs against it exactly as
+# it does from an installed hook.
+
+SCHEMA = "aoi.acp.gate_bench.v0.1"
+
+DEFAULT_EXT_MIX = "py:25,ts:20,js:20,json:10,md:10,yaml:5,png:10"
+WORDS = [
+    "const", "let", "return", "import", "from", "def", "class", "self", "value", "price", "window",
+    "signal", "oracle", "candle", "market", "config", "result", "items", "index", "length", "await",
+]
+
+# One sample per tree-target rule label (see aoi_core/acp/secret_rules.py).
+# Literals are split so this file does not trip the gate itself.
+SECRET_SAMPLES: list[tuple[str, Callable[[random.Random], str]]] = [
+    ("AWS_ACCESS_KEY_ID", lambda r: "AKIA" + "".join(r.choices(string.ascii_uppercase + string.digits, k=16))),
+    ("OPENAI_API_KEY", lambda r: "sk-" + "".join(r.choices(string.ascii_letters + string.digits, k=40))),
+    ("PRIVATE_KEY_HEX", lambda r: "0x" + "".join(r.choices("0123456789abcdef", k=64))),
+    ("NOTION_TOKEN", lambda r: "ntn_" + "".join(r.choices(string.ascii_letters + string.digits, k=24))),
+    ("GITHUB_TOKEN", lambda r: "ghp_" + "".join(r.choices(string.ascii_letters + string.digits, k=36))),
+    ("PEM_PRIVATE_KEY", lambda r: "-----BEGIN RSA " + "PRIVATE KEY-----"),
+    ("DISCORD_TOKEN_ASSIGNMENT", lambda r: "DISCORD_TOKEN" + " = " + "".join(r.choices(string.ascii_letters, k=24))),
+]
+
+
+@dataclass
+class CorpusSpec:
+    files: int = 2000
+    avg_kb: float = 4.0
+    ext_mix: str = DEFAULT_EXT_MIX
+    depth: int = 4
+    fanout: int = 6
+    large_files: int = 2  # streamed-path files (over SCAN_CHUNK_BYTES)
+    large_mb: float = 8.0
+    node_modules_files: int = 1000
+    secrets: int = 20
+    seed: int = 1337
+
+
+@dataclass
+class Corpus:
+    files: int = 0  # everything written, including node_modules and binaries
+    bytes: int = 0
+    candidates: int = 0  # files the gate actually scans
+    candidate_bytes: int = 0
+    planted: list[list[str]] = field(default_factory=list)  # [path, label] the gate must report
+    planted_ignored: int = 0  # secrets under node_modules (must not be reported)
+
+
+def parse_ext_mix(spec: str) -> list[tuple[str, int]]:
+    out = []
+    for part in spec.split(","):
+        ext, _, weight = part.strip().partition(":")
+        out.append(("." + ext.lstrip(".") if ext else "", int(weight or 1)))
+    return out
+
+
+def filler(rng: random.Random, n: int) -> str:
+    lines, size = [], 0
+    while size < n:
+        line = " ".join(rng.choices(WORDS, k=rng.randint(3, 12)))
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)[:n]
+
+
+def random_dir(rng: random.Random, spec: CorpusSpec) -> Path:
+    return Path(*[f"d{rng.randrange(spec.fanout)}" for _ in range(rng.randint(0, spec.depth))])
+
+
+def copy_tooling(repo: Path) -> None:
+    """Gate tooling the pre-push hook expects inside the repo it runs in."""
+    shutil.copytree(WORKSPACE / "aoi_core", repo / "aoi_core", ignore=shutil.ignore_patterns("__pycache__"))
+    shutil.copytree(WORKSPACE / "aoi-core" / "scripts", repo / "aoi-core" / "scripts", ignore=shutil.ignore_patterns("__pycache__"))
+    (repo / "aoi-core" / "state").mkdir(parents=True, exist_ok=True)
+    shutil.copy2(WORKSPACE / "aoi-core" / "state" / "acp_automation_policy_v0_1.json", repo / "aoi-core" / "state")
+
+
+def generate_repo(repo: Path, spec: CorpusSpec) -> Corpus:
+    """Write a synthetic repo at `repo` per `spec` and commit it."""
+    rng = random.Random(spec.seed)
+    exts, weights = zip(*parse_ext_mix(spec.ext_mix))
+    repo.mkdir(parents=True, exist_ok=True)
+    corpus = Corpus()
+    written: list[Path] = []
+
+    def write(rel: Path, data: bytes) -> None:
+        p = repo / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(data)
+        corpus.files += 1
+        corpus.bytes += len(data)
+
+    for i in range(spec.files):
+        ext = rng.choices(exts, weights)[0]
+        rel = random_dir(rng, spec) / f"f{i}{ext}"
+        size = max(16, int(rng.lognormvariate(0, 1) * spec.avg_kb * 1024 / 1.65))
+        data = rng.randbytes(size) if ext == ".png" else filler(rng, size).encode()
+        write(rel, data)
+        if ext != ".png":
+            written.append(rel)
+
+    for i in range(spec.large_files):
+        rel = Path("vendor") / f"bundle{i}.js"
+        write(rel, filler(rng, int(spec.large_mb * 1024 * 1024)).encode())
+        written.append(rel)
+
+    for i in range(spec.node_modules_files):
+        nested = Path("node_modules", f"pkg{i % 50}")
+        if i % 3 == 0:
+            nested = nested / "node_modules" / f"dep{i % 7}"
+        write(nested / f"index{i}.js", filler(rng, int(spec.avg_kb * 1024)).encode())
+
+    # Plant secrets: appended to existing files, a few of them in node_modules.
+    for i in range(spec.secrets):
+        label, make = SECRET_SAMPLES[i % len(SECRET_SAMPLES)]
+        if i % 5 == 4:
+            rel = Path("node_modules", "pkg0", f"leak{i}.js")
+            write(rel, f"const k = '{make(rng)}';\n".encode())
+            corpus.planted_ignored += 1
+            continue
+        rel = written[rng.randrange(len(written))]
+        with (repo / rel).open("a", encoding="utf-8") as f:
+            f.write(f"\nconst k = '{make(rng)}';\n")
+        if [rel.as_posix(), label] not in corpus.planted:
+            corpus.planted.append([rel.as_posix(), label])
+
+    (repo / "package-lock.json").write_text("{}\n", encoding="utf-8")
+    copy_tooling(repo)
+
+    git = ["git", "-C", str(repo), "-c", "user.name=bench", "-c", "user.email=bench@localhost"]
+    subprocess.run(git[:3] + ["init", "-q"], check=True)
+    subprocess.run(git + ["add", "-A"], check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "synthetic corpus"], check=True)
+
+    candidates = iter_scan_candidates(repo)
+    corpus.candidates = len(candidates)
+    corpus.candidate_bytes = sum(p.stat().st_size for p in candidates)
+    return corpus
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak RSS of this process and of any children it waited for. On Linux
+    VmHWM is used for the process itself: ru_maxrss survives exec, so a
+    spawned worker would report its parent's peak.
+    """
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                own = int(line.split()[1])
+    except OSError:
+        pass
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    rss = max(own, children)
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024  # bytes on macOS, KiB elsewhere
+
+
+def finding_keys(findings: list[Any]) -> list[list[str]]:
+    return sorted(
+        [f.evidence["file"], f.evidence["pattern"]] for f in findings if f.rule_id == "secrets.pattern.match"
+    )
+
+
+def run_pre_push(repo: Path, *extra: str, env: dict[str, str] | None = None) -> float:
+    t0 = time.perf_counter()
+    res = subprocess.run(
+        [sys.executable, str(repo / "aoi-core" / "scripts" / "pre_push_gate.py"), "--repo", str(repo), *extra],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    dt = time.perf_counter() - t0
+    if res.returncode not in (0, 1):  # 1 = blocked on red, expected with planted secrets
+        raise RuntimeError(f"pre_push_gate.py failed ({res.returncode}): {res.stderr}")
+    return dt
+
+
+def run_stage(name: str, repo_s: str, repeat: int) -> dict[str, Any]:
+    """One stage, run inside a fresh worker process; returns timings and findings."""
+    repo = Path(repo_s)
+    out: dict[str, Any] = {"name": name}
+    times: list[float] = []
+    findings: list[Any] = []
+
+    def timed(fn: Callable[[], Any]) -> Any:
+        t0 = time.perf_counter()
+        r = fn()
+        times.append(time.perf_counter() - t0)
+        return r
+
+    cache_dir = Path(tempfile.mkdtemp(prefix="gate-bench-cache-"))
+    try:
+        for _ in range(repeat):
+            if name == "snapshot_serial":
+                findings = timed(lambda: scan_repo_snapshot(repo))
+            elif name == "snapshot_threads":
+                findings = timed(lambda: scan_repo_snapshot(repo, workers=default_workers()))
+            elif name == "snapshot_processes":
+                findings = timed(lambda: scan_repo_snapshot(repo, workers=default_workers(), use_processes=True))
+            elif name == "commit_tree":
+                findings, _ = timed(lambda: scan_commit_tree(repo, "HEAD"))
+            elif name == "incremental_cold":
+                shutil.rmtree(cache_dir / "c", ignore_errors=True)
+                findings, _ = timed(lambda: scan_commit_incremental(repo, "HEAD", cache=BlobResultCache(cache_dir / "c", ruleset_digest())))
+            elif name == "incremental_warm":
+                scan_commit_incremental(repo, "HEAD", cache=BlobResultCache(cache_dir / "w", ruleset_digest()))
+                findings, _ = timed(lambda: scan_commit_incremental(repo, "HEAD", cache=BlobResultCache(cache_dir / "w", ruleset_digest())))
+            elif name == "score_and_report":
+                # Per-call cost on the serial scan's findings; `seconds` is score + report.
+                fs = scan_repo_snapshot(repo)
+                n = 1000
+                t0 = time.perf_counter()
+                for _ in range(n):
+                    score_findings(fs)
+                t1 = time.perf_counter()
+                for _ in range(n):
+                    make_report(repo=str(repo), commit="HEAD", findings=fs)
+                t2 = time.perf_counter()
+                out["score_findings_us"] = min(out.get("score_findings_us", 1e12), (t1 - t0) / n * 1e6)
+                out["make_report_us"] = min(out.get("make_report_us", 1e12), (t2 - t1) / n * 1e6)
+                times.append((t2 - t0) / n)
+            elif name == "pre_push_cold":
+                shutil.rmtree(repo / ".git" / "clawshield-cache", ignore_errors=True)
+                timed(lambda: run_pre_push(repo))
+            elif name == "pre_push_warm":
+                run_pre_push(repo)
+                timed(lambda: run_pre_push(repo))
+            elif name == "pre_push_full":
+                timed(lambda: run_pre_push(repo, "--full"))
+            elif name == "pre_push_daemon":
+                daemon = GateDaemon(repo, socket_path=cache_dir / "gate.sock")
+                server = threading.Thread(target=daemon.serve_forever, daemon=True)
+                server.start()
+                try:
+                    while ping(daemon.socket_path) is None:
+                        time.sleep(0.01)
+                    env = {**os.environ, "CLAWSHIELD_GATE_SOCKET": str(daemon.socket_path)}
+                    run_pre_push(repo, env=env)
+                    timed(lambda: run_pre_push(repo, env=env))
+                finally:
+                    daemon.shutdown()
+                    server.join()
+            else:
+                raise ValueError(f"Unknown stage: {name}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    out["seconds"] = min(times)
+    out["runs"] = [round(t, 6) for t in times]
+    out["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    if findings:
+        out["findings"] = finding_keys(findings)
+    return out
+
+
+STAGES = [
+    "snapshot_serial",
+    "snapshot_threads",
+    "snapshot_processes",
+    "commit_tree",
+    "incremental_cold",
+    "incremental_warm",
+    "score_and_report",
+    "pre_push_cold",
+    "pre_push_warm",
+    "pre_push_full",
+    "pre_push_daemon",
+]
+
+
+def summarize(stage: dict[str, Any], corpus: Corpus) -> dict[str, Any]:
+    s = dict(stage)
+    found = s.pop("findings", None)
+    if s["name"] != "score_and_report" and s["seconds"] > 0:
+        s["files_per_s"] = round(corpus.candidates / s["seconds"], 1)
+        s["mb_per_s"] = round(corpus.candidate_bytes / (1024 * 1024) / s["seconds"], 2)
+    if found is not None:
+        planted = {tuple(k) for k in corpus.planted}
+        got = {tuple(k) for k in found}
+        s["secrets_found"] = len(planted & got)
+        s["secrets_missed"] = sorted(planted - got)
+        s["unexpected_findings"] = len(got - planted)
+    s["seconds"] = round(s["seconds"], 6)
+    return s
+
+
+def print_table(result: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    base = {s["name"]: s for s in (baseline or {}).get("stages", [])}
+    print(f"{'stage':<20} {'seconds':>9} {'files/s':>10} {'MB/s':>8} {'rss MB':>8} {'Δ vs base':>10}")
+    for s in result["stages"]:
+        delta = ""
+        if s["name"] in base and base[s["name"]]["seconds"] > 0:
+            delta = f"{(s['seconds'] / base[s['name']]['seconds'] - 1) * 100:+.1f}%"
+        print(
+            f"{s['name']:<20} {s['seconds']:>9.4f} {s.get('files_per_s', ''):>10} "
+            f"{s.get('mb_per_s', ''):>8} {s['peak_rss_mb']:>8} {delta:>10}"
+        )
+        if s.get("secrets_missed"):
+            print(f"  ! missed planted secrets: {s['secrets_missed']}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="ClawShield gate benchmark on a synthetic repo")
+    ap.add_argument("--out", default=None, help="result json path (default: print only)")
+    ap.add_argument("--baseline", default=None, help="previous result json to compare against")
+    ap.add_argument("--repo-dir", default=None, help="where to generate the repo (default: temp dir, removed afterwards)")
+    ap.add_argument("--stages", default=",".join(STAGES), help="comma-separated stages to run")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per stage (the fastest is reported)")
+    spec_defaults = CorpusSpec()
+    for name, default in asdict(spec_defaults).items():
+        ap.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    args = ap.parse_args()
+
+    spec = CorpusSpec(**{k: getattr(args, k) for k in asdict(spec_defaults)})
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise SystemExit(f"Unknown stages: {sorted(unknown)}")
+
+    tmp = None if args.repo_dir else tempfile.mkdtemp(prefix="gate-bench-")
+    repo = Path(args.repo_dir or tmp) / "repo"
+    if repo.exists():
+        shutil.rmtree(repo)
+    try:
+        t0 = time.perf_counter()
+        corpus = generate_repo(repo, spec)
+        print(f"generated {corpus.files} files ({corpus.bytes / 1e6:.1f} MB), {corpus.candidates} scan candidates "
+              f"in {time.perf_counter() - t0:.1f}s: {repo}")
+
+        results = []
+        ctx = multiprocessing.get_context("spawn")
+        for name in stages:
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                results.append(summarize(pool.submit(run_stage, name, str(repo), args.repeat).result(), corpus))
+
+        corpus_out = asdict(corpus)
+        corpus_out["planted"] = len(corpus.planted)
+        result = {
+            "schema": SCHEMA,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "env": {"python": platform.python_version(), "platform": platform.platform(), "cpus": default_workers()},
+            "spec": asdict(spec),
+            "corpus": corpus_out,
+            "stages": results,
+        }
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")) if args.baseline else None
+    print_table(result, baseline)
+    if args.out:
+        out = Path(args.out).resolve()
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"- out: {out}")
+    return 1 if any(s.get("secrets_missed") for s in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
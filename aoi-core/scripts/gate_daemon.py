@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Ensure workspace root is importable when running from aoi-core/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoi_core.acp.gate_daemon import GateDaemon, default_socket_path, ping, request
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Local ClawShield gate daemon (optional; pre_push_gate.py uses it when running)")
+    ap.add_argument("command", choices=["start", "stop", "status"])
+    ap.add_argument("--repo", default=".", help="git repo path")
+    ap.add_argument("--socket", default=None, help="unix socket path (default: <git-dir>/clawshield-gate.sock)")
+    ap.add_argument("--watch-interval", type=float, default=2.0,
+                    help="seconds between background rescans of changed files and new HEADs (0 = off); "
+                         "polling backs off while idle, and with `watchdog` installed rescans follow file events")
+    ap.add_argument("--honor-gitignore", action="store_true",
+                    help="background rescans skip untracked .gitignore'd files (requests choose for themselves)")
+    args = ap.parse_args()
+
+    repo = Path(args.repo).resolve()
+    if not (repo / ".git").exists():
+        raise SystemExit(f"Not a git repo: {repo}")
+    sock = Path(args.socket) if args.socket else default_socket_path(repo)
+
+    if args.command == "status":
+        info = ping(sock)
+        print(json.dumps(info) if info else f"not running ({sock})")
+        return 0 if info else 1
+
+    if args.command == "stop":
+        if ping(sock) is None:
+            print(f"not running ({sock})")
+            return 1
+        request(sock, {"op": "shutdown"})
+        print("stopped")
+        return 0
+
+    daemon = GateDaemon(repo, socket_path=sock, watch_interval=args.watch_interval or None,
+                        honor_ignores=args.honor_gitignore)
+    print(f"✅ gate daemon listening on {sock} (Ctrl-C or `gate_daemon.py stop` to exit)")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
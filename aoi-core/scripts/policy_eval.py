@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+# Ensure workspace root is importable when running from aoi-core/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoi_core.acp.policy_engine import ActionRequest, PolicyEngine
+
+DEFAULT_POLICY = "aoi-core/state/acp_automation_policy_v0_1.json"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Evaluate agent actions against the ACP automation policy")
+    ap.add_argument("--policy", default=DEFAULT_POLICY, help="policy JSON (reloaded when it changes)")
+    ap.add_argument("--in", dest="inp", default="-",
+                    help='JSONL actions, e.g. {"action": "swap", "provider": "privy", "asset": "USDC", "usd": 1.5}')
+    ap.add_argument("--no-reserve", action="store_true", help="do not count executable actions against the daily limit")
+    ap.add_argument("--spent", type=float, default=0.0, help="USD already spent in the last 24h")
+    ap.add_argument("--bench", type=int, default=0, help="evaluate the input N times and report the rate instead")
+    args = ap.parse_args()
+
+    engine = PolicyEngine(Path(args.policy))
+    if args.spent:
+        engine.record_spend(args.spent)
+    src = sys.stdin if args.inp == "-" else open(args.inp, encoding="utf-8")
+    with src:
+        reqs = [ActionRequest.from_dict(json.loads(line)) for line in src if line.strip()]
+
+    if args.bench:
+        started = time.perf_counter()
+        n = 0
+        for _ in range(args.bench):
+            for req in reqs:
+                engine.evaluate(req, reserve=not args.no_reserve)
+                n += 1
+        elapsed = time.perf_counter() - started
+        print(f"{n} evaluations in {elapsed:.3f}s ({n / elapsed:,.0f}/s)")
+        return 0
+
+    for req in reqs:
+        decision = engine.evaluate(req, reserve=not args.no_reserve)
+        print(json.dumps({"request": asdict(req), **asdict(decision)}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,28 +2,27 @@
 from __future__ import annotations
 
 import argparse
-import os
-import subprocess
-from datetime import datetime, timezone
+import sys
 from pathlib import Path
 
+# Ensure workspace root is importable when running from aoi-core/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-def kst_timestamp() -> str:
-    # Asia/Seoul is UTC+9 (no DST)
-    return datetime.now(timezone.utc).astimezone(timezone.utc).isoformat()
-
-
-def new_approval_id() -> str:
-    # acp-YYYYMMDD-HHMMSS
-    now = datetime.now(timezone.utc).astimezone()
-    return now.strftime("acp-%Y%m%d-%H%M%S")
+from aoi_core.acp.clawshield_gate import default_workers
+from aoi_core.acp.pre_push import DEFAULT_POLICY, run_pre_push
 
 
 def main() -> int:
     ap = argparse.ArgumentParser(description="Pre-push security gate: Gate -> Approval -> Proof (fail-closed)")
     ap.add_argument("--repo", default=".", help="git repo path")
     ap.add_argument("--commit", default="HEAD", help="commit/ref to scan")
-    ap.add_argument("--policy", default="aoi-core/state/acp_automation_policy_v0_1.json", help="policy path")
+    ap.add_argument("--policy", default=DEFAULT_POLICY, help="policy path")
+    ap.add_argument("--full", action="store_true", help="full working-tree scan instead of the incremental commit scan")
+    ap.add_argument("--honor-gitignore", action="store_true",
+                    help="with --full, skip untracked files matched by .gitignore (tracked files are always scanned)")
+    ap.add_argument("--workers", type=int, default=0, help="scan workers for --full (0 = auto, 1 = serial)")
+    ap.add_argument("--export-json", action="store_true", help="also write aoi-core/state/approvals/<id>.json")
+    ap.add_argument("--no-daemon", action="store_true", help="scan here even if a gate daemon (gate_daemon.py) is running")
     args = ap.parse_args()
 
     repo = Path(args.repo).resolve()
@@ -31,70 +30,44 @@ def main() -> int:
         print(f"[pre-push] Not a git repo: {repo}")
         return 2
 
-    # Run gate
-    gate_out = Path("/tmp") / "clawshield_pre_push_gate_report.json"
-    cmd_gate = [
-        "python3",
-        str(repo / "aoi-core" / "scripts" / "clawshield_gate_poc.py"),
-        "--repo",
-        str(repo),
-        "--commit",
-        args.commit,
-        "--out",
-        str(gate_out),
-    ]
-    res = subprocess.run(cmd_gate, capture_output=True, text=True)
-    print(res.stdout.rstrip())
-    if res.returncode != 0:
-        print(res.stderr.rstrip())
-        print("[pre-push] Gate execution failed. Blocking push.")
-        return 1
-
-    # Convert to approval+proof
-    approval_id = new_approval_id()
-    cmd_conv = [
-        "python3",
-        str(repo / "aoi-core" / "scripts" / "gate_to_approval_and_proof.py"),
-        "--gate",
-        str(gate_out),
-        "--policy",
-        str(repo / args.policy),
-        "--id",
-        approval_id,
-        "--action",
-        "git_push",
-        "--provider",
-        "pre_push_gate",
-    ]
-    res2 = subprocess.run(cmd_conv, capture_output=True, text=True, cwd=str(repo))
-    print(res2.stdout.rstrip())
-    if res2.returncode != 0:
-        print(res2.stderr.rstrip())
-        print("[pre-push] Failed to write approval/proof. Blocking push.")
-        return 1
-
-    # Parse signal from gate report by grepping stdout line OR reading file quickly (no json dependency)
     try:
-        import json
-
-        gate = json.loads(gate_out.read_text(encoding="utf-8"))
-        signal = (gate.get("result") or {}).get("signal")
-        score = (gate.get("result") or {}).get("score")
-    except Exception:
-        signal = None
-        score = None
+        res = run_pre_push(
+            repo,
+            args.commit,
+            policy_path=repo / args.policy,
+            full=args.full,
+            workers=args.workers or default_workers(),
+            honor_ignores=args.honor_gitignore,
+            use_daemon=not args.no_daemon,
+            export_json=args.export_json,
+        )
+    except Exception as e:
+        print(f"[pre-push] {type(e).__name__}: {e}")
+        print("[pre-push] Gate or approval/proof failed. Blocking push.")
+        return 1
 
-    if signal == "red":
-        print(f"[pre-push] ❌ BLOCKED: gate signal=red (score={score}).")
+    if res.daemon_error:
+        print(f"[pre-push] gate daemon unavailable ({res.daemon_error}); scanned locally.")
+    scan = res.report.get("scan")
+    if scan:
+        print(f"[pre-push] gate ({res.source}): {scan['blobs']} blobs ({scan['scanned']} scanned, {scan['cached']} cached)")
+    print(f"[pre-push] approval store: {res.record.store_path}")
+    if res.record.approval_path:
+        print(f"[pre-push] approval: {res.record.approval_path}")
+    print(f"[pre-push] proofs: {res.record.proof_dir}")
+
+    approval_id = res.record.approval["id"]
+    if res.signal == "red":
+        print(f"[pre-push] ❌ BLOCKED: gate signal=red (score={res.score}).")
         print(f"[pre-push] Approval created: {approval_id} (see aoi-core/state/approvals)")
         return 1
 
-    if signal == "yellow":
-        print(f"[pre-push] ⚠️ WARN: gate signal=yellow (score={score}). Proceeding with push.")
+    if res.signal == "yellow":
+        print(f"[pre-push] ⚠️ WARN: gate signal=yellow (score={res.score}). Proceeding with push.")
         print(f"[pre-push] Approval created: {approval_id} (for audit trail)")
         return 0
 
-    print(f"[pre-push] ✅ OK: gate signal={signal} (score={score}).")
+    print(f"[pre-push] ✅ OK: gate signal={res.signal} (score={res.score}).")
     print(f"[pre-push] Approval created: {approval_id} (for audit trail)")
     return 0
 
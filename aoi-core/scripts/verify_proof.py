@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure workspace root is importable when running from aoi-core/scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from aoi_core.acp.approval_store import ApprovalStore
+from aoi_core.acp.proof_bundle import verify_bundle
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Verify proof bundle files against the bundle's Merkle root")
+    ap.add_argument("proof_dir", help="aoi-core/state/proofs/<id>")
+    ap.add_argument("files", nargs="*", help="bundle-relative files to check (default: all); only these are read")
+    ap.add_argument("--root", default=None, help="expected Merkle root (default: the approval's, else merkle.json's)")
+    ap.add_argument("--approvals-dir", default="aoi-core/state/approvals", help="approval store to take the root from")
+    args = ap.parse_args()
+
+    proof_dir = Path(args.proof_dir).resolve()
+    root = args.root
+    store_path = Path(args.approvals_dir)
+    if root is None and store_path.is_dir():
+        with ApprovalStore.in_dir(store_path) as store:
+            approval = store.get(proof_dir.name)
+        root = ((approval or {}).get("proof_plan") or {}).get("merkle_root")
+        if root:
+            print(f"root from approval {proof_dir.name}: {root}")
+
+    results = verify_bundle(proof_dir, args.files or None, root=root)
+    for name, ok in results.items():
+        print(f"{'ok ' if ok else 'BAD'} {name}")
+    return 0 if results and all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+from aoi_core.acp.approval_store import ApprovalStore
+from aoi_core.acp.proof_bundle import ProofBundle, copy_tree_artifacts
+
+# Gate report -> Approval Request + Proof bundle (v0.1), on in-memory
+# objects. Each bundle file is hashed as it is written (see proof_bundle);
+# nothing is read back. Artifacts (logs, screenshots) are streamed in under
+# artifacts/, and the approval records the bundle's Merkle root.
+
+PROOF_FILES = ["gate_report.json", "policy_snapshot.json", "inputs.json"]
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def json_bytes(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def new_approval_id() -> str:
+    # acp-YYYYMMDD-HHMMSS
+    now = datetime.now(timezone.utc).astimezone()
+    return now.strftime("acp-%Y%m%d-%H%M%S")
+
+
+def build_approval(gate: dict[str, Any], *, approval_id: str, action: str, provider: str) -> dict[str, Any]:
+    """Approval request for a gate report (simple, compatible with our template); proof hashes are filled in later."""
+    signal = (gate.get("result") or {}).get("signal")
+    score = (gate.get("result") or {}).get("score")
+    max_sev = (gate.get("result") or {}).get("max_severity")
+
+    risk_level = "LOW"
+    if signal == "yellow":
+        risk_level = "MED"
+    elif signal == "red":
+        risk_level = "HIGH"
+
+    status = "PENDING_APPROVAL"
+    if signal == "red":
+        status = "BLOCKED"
+
+    return {
+        "id": approval_id,
+        "created_at": datetime.now(timezone.utc).astimezone().isoformat(),
+        "status": status,
+        "action": action,
+        "provider": provider,
+        "action_mode": "queue_for_approval",
+        "why_now": "Gate report generated; approval required to proceed.",
+        "risk_level": risk_level,
+        "cost_estimate": {"usd": 0, "fees_usd": 0, "slippage_bps": None},
+        "required_inputs": {"account": "", "wallet": "", "params": {"gate_signal": signal, "gate_score": score}},
+        "proof_plan": {
+            "logs": "aoi-core/state/proofs/<id>/",
+            "txhash": None,
+            "screenshots": [],
+            "sha256": None,
+            "merkle_root": None,
+        },
+        "dry_run_result": {"gate": {"signal": signal, "score": score, "max_severity": max_sev}},
+        "operator_notes": "auto-generated from gate_report.json",
+    }
+
+
+@dataclass
+class ApprovalRecord:
+    approval: dict[str, Any]
+    store_path: Path
+    proof_dir: Path
+    approval_path: Path | None = None  # per-id JSON export, when requested
+
+
+def write_approval_and_proof(
+    gate: dict[str, Any],
+    policy: Any,
+    *,
+    approval_id: str,
+    approvals_dir: Path,
+    proofs_dir: Path,
+    action: str = "skill_update",
+    provider: str = "local",
+    gate_path: Path | None = None,
+    policy_path: Path | None = None,
+    export_json: bool = False,
+    artifacts: Iterable[Path] = (),
+) -> ApprovalRecord:
+    """
+    Write the proof bundle (`proofs_dir/<id>/`, with `artifacts` files or
+    directories copied under artifacts/) and record the approval request in
+    the approval store in `approvals_dir` (plus `<id>.json` with
+    `export_json`). `gate_path`/`policy_path` are only recorded in
+    inputs.json; without a gate file the bundle's own copy is recorded.
+    """
+    proof_dir = proofs_dir / approval_id
+    inputs = {
+        "created_at": utc_now_iso(),
+        "gate_path": str(gate_path or proof_dir / "gate_report.json"),
+        "policy_path": str(policy_path) if policy_path else None,
+        "action": action,
+        "provider": provider,
+    }
+    contents = {"gate_report.json": gate, "policy_snapshot.json": policy, "inputs.json": inputs}
+
+    bundle = ProofBundle(proof_dir)
+    for name in PROOF_FILES:  # deterministic order
+        bundle.add_json(name, contents[name])
+    copy_tree_artifacts(bundle, artifacts)
+    root = bundle.finish()
+
+    approval = build_approval(gate, approval_id=approval_id, action=action, provider=provider)
+    approval["proof_plan"]["sha256"] = bundle.hashes
+    approval["proof_plan"]["merkle_root"] = root
+
+    with ApprovalStore.in_dir(approvals_dir) as store:
+        store.put(approval, proof_dir=proof_dir)
+        store_path = store.path
+    approval_path = None
+    if export_json:
+        approval_path = approvals_dir / f"{approval_id}.json"
+        approval_path.write_bytes(json_bytes(approval))
+    return ApprovalRecord(approval=approval, store_path=store_path, proof_dir=proof_dir, approval_path=approval_path)
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+# Indexed approval store: one SQLite database (WAL mode) instead of one JSON
+# file per approval.
+#
+# - approval_log: append-only; one row per create or status change.
+# - approvals: current state per id, indexed by status, action and time, so
+#   "pending", "expired since", "today's totals" are index lookups rather
+#   than a directory listing plus a parse of every file.
+#
+# compact() collapses the log of old approvals to their final state. The
+# per-id JSON files stay available through export_json().
+
+STORE_NAME = "approvals.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS approval_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    note TEXT
+);
+CREATE INDEX IF NOT EXISTS approval_log_id ON approval_log (id, seq);
+CREATE TABLE IF NOT EXISTS approvals (
+    id TEXT PRIMARY KEY,
+    created_ts REAL NOT NULL,
+    updated_ts REAL NOT NULL,
+    status TEXT NOT NULL,
+    action TEXT,
+    provider TEXT,
+    risk_level TEXT,
+    usd REAL,
+    proof_dir TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS approvals_status ON approvals (status, created_ts);
+CREATE INDEX IF NOT EXISTS approvals_action ON approvals (action, created_ts);
+CREATE INDEX IF NOT EXISTS approvals_created ON approvals (created_ts);
+"""
+
+
+def iso_to_ts(s: str) -> float:
+    return datetime.fromisoformat(s).timestamp()
+
+
+class ApprovalStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def in_dir(cls, approvals_dir: Path) -> "ApprovalStore":
+        return cls(Path(approvals_dir) / STORE_NAME)
+
+    def __enter__(self) -> "ApprovalStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def put(self, approval: dict[str, Any], *, proof_dir: Path | str | None = None) -> None:
+        """Record a new approval (an existing id is replaced, as its JSON file was)."""
+        now = time.time()
+        created = iso_to_ts(approval["created_at"]) if approval.get("created_at") else now
+        usd = (approval.get("cost_estimate") or {}).get("usd")
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute(
+                "INSERT INTO approval_log (id, ts, kind, status) VALUES (?, ?, 'create', ?)",
+                (approval["id"], now, approval["status"]),
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO approvals"
+                " (id, created_ts, updated_ts, status, action, provider, risk_level, usd, proof_dir, body)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    approval["id"],
+                    created,
+                    now,
+                    approval["status"],
+                    approval.get("action"),
+                    approval.get("provider"),
+                    approval.get("risk_level"),
+                    usd,
+                    str(proof_dir) if proof_dir else None,
+                    json.dumps(approval, ensure_ascii=False),
+                ),
+            )
+
+    def get(self, approval_id: str) -> dict[str, Any] | None:
+        row = self._db.execute("SELECT body FROM approvals WHERE id = ?", (approval_id,)).fetchone()
+        return json.loads(row["body"]) if row else None
+
+    def query(
+        self,
+        *,
+        status: str | None = None,
+        action: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Approvals matching every given filter (`since`/`until`: epoch seconds on created_at), newest first."""
+        where, args = self._where(status=status, action=action, since=since, until=until)
+        sql = f"SELECT body FROM approvals{where} ORDER BY created_ts DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        return [json.loads(r["body"]) for r in self._db.execute(sql, args)]
+
+    def set_status(self, approval_id: str, status: str, note: str | None = None) -> bool:
+        """Append a status change; False if the id is unknown."""
+        now = time.time()
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            row = self._db.execute("SELECT body FROM approvals WHERE id = ?", (approval_id,)).fetchone()
+            if row is None:
+                return False
+            body = json.loads(row["body"])
+            body["status"] = status
+            self._db.execute(
+                "INSERT INTO approval_log (id, ts, kind, status, note) VALUES (?, ?, 'status', ?, ?)",
+                (approval_id, now, status, note),
+            )
+            self._db.execute(
+                "UPDATE approvals SET status = ?, updated_ts = ?, body = ? WHERE id = ?",
+                (status, now, json.dumps(body, ensure_ascii=False), approval_id),
+            )
+        return True
+
+    def expire(self, expires_hours: float, *, now: float | None = None) -> list[str]:
+        """Mark PENDING_APPROVAL entries older than `expires_hours` as EXPIRED; returns their ids."""
+        cutoff = (now or time.time()) - expires_hours * 3600
+        ids = [
+            r["id"]
+            for r in self._db.execute(
+                "SELECT id FROM approvals WHERE status = 'PENDING_APPROVAL' AND created_ts < ?", (cutoff,)
+            )
+        ]
+        for approval_id in ids:
+            self.set_status(approval_id, "EXPIRED", note=f"older than {expires_hours}h")
+        return ids
+
+    def totals(self, *, since: float, until: float | None = None, status: str | None = None) -> dict[str, dict[str, float]]:
+        """Count and summed `cost_estimate.usd` per action over a time range (e.g. one day)."""
+        where, args = self._where(status=status, since=since, until=until)
+        rows = self._db.execute(
+            f"SELECT action, COUNT(*) AS n, COALESCE(SUM(usd), 0) AS usd FROM approvals{where} GROUP BY action", args
+        )
+        return {r["action"]: {"count": r["n"], "usd": r["usd"]} for r in rows}
+
+    def history(self, approval_id: str) -> list[dict[str, Any]]:
+        rows = self._db.execute(
+            "SELECT ts, kind, status, note FROM approval_log WHERE id = ? ORDER BY seq", (approval_id,)
+        )
+        return [dict(r) for r in rows]
+
+    def compact(self, *, older_than_days: float, now: float | None = None) -> int:
+        """
+        Collapse the log of approvals created more than `older_than_days`
+        ago to their latest entry, then checkpoint and vacuum. Returns the
+        number of log rows removed.
+        """
+        cutoff = (now or time.time()) - older_than_days * 86400
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            cur = self._db.execute(
+                "DELETE FROM approval_log WHERE seq NOT IN (SELECT MAX(seq) FROM approval_log GROUP BY id)"
+                " AND id IN (SELECT id FROM approvals WHERE created_ts < ?)",
+                (cutoff,),
+            )
+            removed = cur.rowcount
+        self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._db.execute("VACUUM")
+        return removed
+
+    def import_json(self, paths: Iterable[Path]) -> int:
+        """Load existing per-id approval JSON files (migration); returns how many were imported."""
+        n = 0
+        for p in paths:
+            try:
+                approval = json.loads(Path(p).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if isinstance(approval, dict) and approval.get("id") and approval.get("status"):
+                self.put(approval)
+                n += 1
+        return n
+
+    def export_json(self, out_dir: Path, ids: Iterable[str] | None = None) -> list[Path]:
+        """Write `<id>.json` per approval (all of them, or just `ids`), as the file-per-approval layout had it."""
+        out_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for body in self._bodies(ids):
+            p = out_dir / f"{body['id']}.json"
+            p.write_text(json.dumps(body, ensure_ascii=False, indent=2), encoding="utf-8")
+            written.append(p)
+        return written
+
+    def _bodies(self, ids: Iterable[str] | None) -> Iterator[dict[str, Any]]:
+        if ids is None:
+            for r in self._db.execute("SELECT body FROM approvals ORDER BY created_ts"):
+                yield json.loads(r["body"])
+            return
+        for approval_id in ids:
+            body = self.get(approval_id)
+            if body is not None:
+                yield body
+
+    @staticmethod
+    def _where(
+        *,
+        status: str | None = None,
+        action: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> tuple[str, list[Any]]:
+        clauses, args = [], []
+        for col, op, val in (("status", "=", status), ("action", "=", action), ("created_ts", ">=", since), ("created_ts", "<", until)):
+            if val is not None:
+                clauses.append(f"{col} {op} ?")
+                args.append(val)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
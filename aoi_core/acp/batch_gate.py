@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+from aoi_core.acp.blob_cache import BlobResultCache
+from aoi_core.acp.clawshield_gate import (
+    GateFinding,
+    ScanStats,
+    findings_for_labels,
+    make_report,
+    ruleset_digest,
+    scan_blobs,
+    tree_metadata,
+    tree_scan_candidates,
+)
+from aoi_core.acp.git_objects import CatFileBatch, git_output, ls_tree, rev_parse
+
+# Batch gating: many (repo, commit) jobs on one worker pool.
+#
+# Jobs are listed first (tree + metadata, one pool task each). Every blob
+# sha not yet in the shared cache is then read once, from whichever repo
+# listed it first, in pool tasks of BLOB_BATCH blobs. Git blob shas are
+# content hashes, so the same file in another repo or commit is the same
+# key: it is scanned once and the result served from the content-addressed
+# cache to every job that has it. A job's report is emitted as soon as its
+# last blob is known.
+#
+# Manifest: one JSON object per line, `{"repo": "path", "commit": "ref"}` or
+# `{"repo": "path", "range": "v1.0..main"}` (every commit in the range, for
+# re-auditing history). Relative repo paths are taken from the manifest's
+# directory; blank and `#` lines are skipped.
+
+BLOB_BATCH = 256
+
+
+@dataclass(frozen=True)
+class GateJob:
+    repo: Path
+    commit: str
+
+
+def default_shared_cache_dir() -> Path:
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "clawshield"
+
+
+def rev_list(repo: Path, rev_range: str) -> list[str]:
+    """Commits in `rev_range`, oldest first."""
+    return git_output(repo, "rev-list", "--reverse", rev_range).decode().split()
+
+
+def load_manifest(path: Path) -> list[GateJob]:
+    jobs = []
+    for n, line in enumerate(path.read_text(encoding="utf-8").splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            entry = json.loads(line)
+            repo = (path.parent / entry["repo"]).resolve()
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"{path}:{n}: bad manifest entry: {e}") from e
+        if "range" in entry:
+            jobs.extend(GateJob(repo, c) for c in rev_list(repo, entry["range"]))
+        else:
+            jobs.append(GateJob(repo, entry.get("commit") or "HEAD"))
+    return jobs
+
+
+def list_job(repo_s: str, commit: str) -> tuple[str, list[tuple[str, str]], list[GateFinding]]:
+    """Pool task: (commit sha, candidate (path, blob sha) in report order, metadata findings)."""
+    repo = Path(repo_s)
+    sha = rev_parse(repo, commit)
+    if sha is None:
+        raise ValueError(f"Unknown commit {commit!r} in {repo}")
+    entries = ls_tree(repo, sha, sizes=False)
+    with CatFileBatch(repo) as cat:
+        metadata = tree_metadata(cat, {e.path: e for e in entries})
+    return sha, [(e.path, e.sha) for e in tree_scan_candidates(entries)], metadata
+
+
+def scan_blob_batch(repo_s: str, shas: list[str]) -> list[tuple[str, list[str]]]:
+    """Pool task: labels for a batch of blobs from one repo's object store."""
+    repo = Path(repo_s)
+    with CatFileBatch(repo) as cat:
+        return list(scan_blobs(repo, cat, shas))
+
+
+@dataclass
+class _Pending:
+    job: GateJob
+    commit_sha: str
+    candidates: list[tuple[str, str]]
+    metadata: list[GateFinding]
+    waiting: set[str]
+    stats: ScanStats
+
+
+@dataclass
+class BatchStats:
+    jobs: int = 0
+    failed: int = 0
+    red: int = 0
+    blobs: int = 0  # candidate (path, blob) entries over all jobs
+    distinct: int = 0  # distinct blob shas over all jobs
+    scanned: int = 0  # distinct blobs read and matched
+    cached: int = 0  # distinct blobs served from the shared cache
+
+
+def iter_batch_reports(
+    jobs: list[GateJob],
+    *,
+    cache: BlobResultCache,
+    pool: Executor,
+    stats: BatchStats,
+    window: int = 8,
+) -> Iterator[dict[str, Any]]:
+    """
+    One report per job (make_report plus "job" and "scan"), yielded as jobs
+    complete, so the order is not the manifest's. A job that fails yields
+    {"job": ..., "error": ...} instead. At most `window` listings are in
+    flight, so blob reads for early jobs are not queued behind every
+    listing and reports start streaming right away.
+    """
+    stats.jobs = len(jobs)
+    listing: dict[Future, int] = {}
+    next_job = 0
+    reading: dict[Future, list[str]] = {}
+    pending: dict[int, _Pending] = {}
+    waiters: dict[str, list[int]] = {}  # blob sha -> jobs waiting on it
+    labels: dict[str, list[str]] = {}
+    unreadable: dict[str, BaseException] = {}  # blobs whose read failed
+    seen: set[str] = set()
+
+    def job_info(i: int, commit_sha: str | None = None) -> dict[str, Any]:
+        return {"index": i, "repo": str(jobs[i].repo), "commit": jobs[i].commit, "commit_sha": commit_sha}
+
+    def finish(i: int) -> dict[str, Any]:
+        p = pending.pop(i)
+        findings = list(p.metadata)
+        for path, sha in p.candidates:
+            findings.extend(findings_for_labels(labels[sha], path))
+        report = make_report(repo=str(p.job.repo), commit=p.job.commit, findings=findings)
+        report["job"] = job_info(i, p.commit_sha)
+        report["scan"] = asdict(p.stats)
+        if report["result"]["signal"] == "red":
+            stats.red += 1
+        return report
+
+    def fail(i: int, error: BaseException) -> dict[str, Any]:
+        stats.failed += 1
+        return {"schema": "aoi.acp.clawshield_gate.v0.1", "job": job_info(i), "error": f"{type(error).__name__}: {error}"}
+
+    while listing or reading or next_job < len(jobs):
+        while next_job < len(jobs) and len(listing) < window:
+            listing[pool.submit(list_job, str(jobs[next_job].repo), jobs[next_job].commit)] = next_job
+            next_job += 1
+        done, _ = wait([*listing, *reading], return_when=FIRST_COMPLETED)
+        for fut in done:
+            if fut in listing:
+                i = listing.pop(fut)
+                try:
+                    commit_sha, candidates, metadata = fut.result()
+                except Exception as e:
+                    yield fail(i, e)
+                    continue
+                job_stats = ScanStats(mode="batch", blobs=len(candidates))
+                stats.blobs += len(candidates)
+                bad = next((unreadable[sha] for _, sha in candidates if sha in unreadable), None)
+                if bad is not None:
+                    yield fail(i, bad)
+                    continue
+                new: list[str] = []
+                waiting: set[str] = set()
+                for _, sha in candidates:
+                    if sha in labels or sha in waiting:
+                        continue
+                    if sha not in seen:
+                        seen.add(sha)
+                        stats.distinct += 1
+                        cached = cache.get(sha)
+                        if cached is not None:
+                            labels[sha] = cached
+                            stats.cached += 1
+                            job_stats.cached += 1
+                            continue
+                        new.append(sha)
+                        job_stats.scanned += 1
+                    waiting.add(sha)
+                    waiters.setdefault(sha, []).append(i)
+                pending[i] = _Pending(jobs[i], commit_sha, candidates, metadata, waiting, job_stats)
+                for k in range(0, len(new), BLOB_BATCH):
+                    batch = new[k:k + BLOB_BATCH]
+                    reading[pool.submit(scan_blob_batch, str(jobs[i].repo), batch)] = batch
+                if not waiting:
+                    yield finish(i)
+            else:
+                batch = reading.pop(fut)
+                try:
+                    results = fut.result()
+                except Exception as e:
+                    for sha in batch:
+                        unreadable[sha] = e
+                        for i in waiters.pop(sha, []):
+                            if i in pending:
+                                pending.pop(i)
+                                yield fail(i, e)
+                    continue
+                stats.scanned += len(results)
+                for sha, found in results:
+                    labels[sha] = found
+                    cache.put(sha, found)
+                    for i in waiters.pop(sha, []):
+                        p = pending.get(i)
+                        if p is None:
+                            continue
+                        p.waiting.discard(sha)
+                        if not p.waiting:
+                            yield finish(i)
+
+
+def run_batch(
+    jobs: list[GateJob],
+    out: TextIO,
+    *,
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+) -> BatchStats:
+    """Gate every job on one process pool, writing one JSONL report line per job as it finishes."""
+    cache = BlobResultCache(cache_dir or default_shared_cache_dir(), ruleset_digest())
+    stats = BatchStats()
+    try:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for report in iter_batch_reports(jobs, cache=cache, pool=pool, stats=stats, window=workers * 2):
+                out.write(json.dumps(report, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        cache.save()  # keep what was scanned even if the batch is interrupted
+    return stats
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# Per-blob scan results, keyed by git blob sha. Results are stored as the
+# matched rule labels (not findings), because the same blob can live at
+# several paths and findings name the path. One log file per rule-set
+# digest: changing any rule starts a fresh log instead of serving stale
+# results.
+#
+# The log is append-only JSON lines: a header {"ruleset": <digest>}, then
+# one [sha, labels] record per line. save() appends only the results added
+# since the cache was loaded, in one O_APPEND write, so a push that read
+# two blobs writes two lines however large the cache is. A line torn by an
+# interrupted writer never parses (a record ends with its closing bracket),
+# so it costs a cache miss, never a wrong result. The log is rewritten
+# (atomically) only when duplicate records from concurrent writers make up
+# most of it.
+
+COMPACT_MIN_RECORDS = 4096
+
+
+def _record(sha: str, labels: list[str]) -> str:
+    return json.dumps([sha, labels], separators=(",", ":")) + "\n"
+
+
+class BlobResultCache:
+    def __init__(self, root: Path, ruleset: str):
+        self.root = Path(root)
+        self.ruleset = ruleset
+        self.path = self.root / f"blobs-{ruleset[:16]}.jsonl"
+        self._index: dict[str, list[str]] | None = None
+        self._new: dict[str, list[str]] = {}
+        self._records = 0  # records in the log, duplicates included
+        self._valid = False  # the log exists, under this rule set, and ends with a newline
+
+    @property
+    def index(self) -> dict[str, list[str]]:
+        if self._index is None:
+            self._index = self._load()
+        return self._index
+
+    def _load(self) -> dict[str, list[str]]:
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except (FileNotFoundError, UnicodeDecodeError):
+            return {}
+        lines = text.splitlines()
+        try:
+            header = json.loads(lines[0]) if lines else None
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("ruleset") != self.ruleset:
+            return {}
+        index: dict[str, list[str]] = {}
+        for line in lines[1:]:
+            try:
+                sha, labels = json.loads(line)
+            except (ValueError, TypeError):
+                continue  # torn by an interrupted writer
+            index[sha] = labels
+            self._records += 1
+        self._valid = text.endswith("\n")
+        return index
+
+    def get(self, sha: str) -> list[str] | None:
+        return self.index.get(sha)
+
+    def put(self, sha: str, labels: list[str]) -> None:
+        if self.index.get(sha) != labels:
+            self.index[sha] = labels
+            self._new[sha] = labels
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def save(self) -> None:
+        if not self._new:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        records = self._records + len(self._new)
+        compact = records > max(COMPACT_MIN_RECORDS, 2 * len(self.index))
+        if self._valid and not compact:
+            data = "".join(_record(sha, labels) for sha, labels in self._new.items()).encode("utf-8")
+            try:
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+            except FileNotFoundError:
+                self._valid = False  # removed since it was loaded
+            else:
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+                self._records = records
+        if compact or not self._valid:
+            self._rewrite()
+        self._new.clear()
+
+    def _rewrite(self) -> None:
+        fd, tmp = tempfile.mkstemp(prefix=".blobs-", dir=self.root)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"ruleset": self.ruleset}) + "\n")
+            f.writelines(_record(sha, labels) for sha, labels in self.index.items())
+        os.replace(tmp, self.path)  # atomic: a concurrent reader sees the old or the new log
+        self._records = len(self.index)
+        self._valid = True
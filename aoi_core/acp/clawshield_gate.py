@@ -2,11 +2,21 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
 import re
-from dataclasses import dataclass
+import subprocess
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any
+from pathlib import Path, PurePath
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from aoi_core.acp.blob_cache import BlobResultCache
+from aoi_core.acp.git_objects import CatFileBatch, TreeEntry, blob_sizes, git_dir, ls_tree, tracked_paths
+from aoi_core.acp.repo_walk import walk_files
+from aoi_core.acp.secret_rules import MAX_MATCH_SPAN, RULES_BY_LABEL, matcher_for, rules_for
 
 
 def utc_now() -> str:
@@ -33,32 +43,46 @@ class GateFinding:
     evidence: dict[str, Any] | None = None
 
 
+# Rules live in aoi_core.acp.secret_rules (shared with security_check.sh and aoi-guard.yml)
 DEFAULT_SECRET_PATTERNS: list[tuple[str, re.Pattern[str]]] = [
-    ("AWS_ACCESS_KEY_ID", re.compile(r"AKIA[0-9A-Z]{16}")),
-    ("OPENAI_API_KEY", re.compile(r"sk-[A-Za-z0-9]{20,}")),
-    ("PRIVATE_KEY_HEX", re.compile(r"0x[a-fA-F0-9]{64}")),
+    (r.label, re.compile(r.pattern)) for r in rules_for("tree")
 ]
 
 
-def scan_repo_snapshot(repo_dir: Path) -> list[GateFinding]:
+LOCKFILES = ["package-lock.json", "pnpm-lock.yaml", "yarn.lock", "poetry.lock", "uv.lock", "Cargo.lock"]
+SKIP_DIRS = {"node_modules", ".git", ".venv", "venv"}
+SCAN_CHUNK_BYTES = 1 << 20  # larger files/blobs are streamed in chunks of this size
+SCAN_BATCH_FILES = 32
+TEXT_EXT_ALLOW = {".py", ".ts", ".js", ".json", ".md", ".sh", ".yaml", ".yml", ".toml", ".env", ""}
+
+
+def scan_repo_metadata(repo_dir: Path) -> list[GateFinding]:
+    """Repo-level checks (lockfile, package.json scripts) that are not per-file content scans."""
+    pkg = repo_dir / "package.json"
+    return scan_metadata(
+        has_file=lambda name: (repo_dir / name).exists(),
+        package_json=pkg.read_bytes() if pkg.exists() else None,
+    )
+
+
+def scan_metadata(*, has_file: Callable[[str], bool], package_json: bytes | None) -> list[GateFinding]:
+    """scan_repo_metadata over any source: `has_file(name)` for top-level files, package.json bytes or None."""
     findings: list[GateFinding] = []
 
-    lockfiles = ["package-lock.json", "pnpm-lock.yaml", "yarn.lock", "poetry.lock", "uv.lock", "Cargo.lock"]
-    has_lock = any((repo_dir / lf).exists() for lf in lockfiles)
+    has_lock = any(has_file(lf) for lf in LOCKFILES)
     if not has_lock:
         findings.append(
             GateFinding(
                 rule_id="repro.lockfile.missing",
                 severity="med",
                 message="No common lockfile detected (reproducibility risk).",
-                evidence={"checked": lockfiles},
+                evidence={"checked": LOCKFILES},
             )
         )
 
-    pkg = repo_dir / "package.json"
-    if pkg.exists():
+    if package_json is not None:
         try:
-            j = json.loads(pkg.read_text(encoding="utf-8"))
+            j = json.loads(package_json.decode("utf-8"))
             scripts = (j.get("scripts") or {})
             suspicious = []
             for name, cmd in scripts.items():
@@ -82,42 +106,313 @@ def scan_repo_snapshot(repo_dir: Path) -> list[GateFinding]:
                 )
             )
 
-    max_bytes = 200_000
-    text_ext_allow = {".py", ".ts", ".js", ".json", ".md", ".sh", ".yaml", ".yml", ".toml", ".env", ""}
+    return findings
+
+
+def is_scan_name(name: str) -> bool:
+    """Extension allow-list check on a bare file name (same reading of the suffix as PurePath.suffix)."""
+    suffix = os.path.splitext(name)[1]
+    return suffix in TEXT_EXT_ALLOW or suffix == "." or name == ".env"
+
+
+def is_scan_candidate(rel: PurePath) -> bool:
+    """Path-only eligibility (extension allow-list, skipped dirs)."""
+    if not is_scan_name(rel.name):
+        return False
+    return not any(part in SKIP_DIRS for part in rel.parts)
 
-    for p in repo_dir.rglob("*"):
-        if not p.is_file():
-            continue
-        if any(part in {"node_modules", ".git", ".venv", "venv"} for part in p.parts):
-            continue
-        try:
-            if p.stat().st_size > max_bytes:
-                continue
-        except FileNotFoundError:
-            continue
 
-        if p.suffix not in text_ext_allow and p.name not in {".env"}:
-            continue
+def is_scan_path(path: str) -> bool:
+    """is_scan_candidate for a "/"-separated repo path, without building a PurePath (tree listings)."""
+    parts = path.split("/")
+    return is_scan_name(parts[-1]) and SKIP_DIRS.isdisjoint(parts)
 
+
+def iter_scan_candidates(repo_dir: Path, *, honor_ignores: bool = False) -> list[Path]:
+    """
+    Files eligible for content scanning, sorted by path so every scan mode
+    reports in the same order. SKIP_DIRS are pruned without being entered.
+    With `honor_ignores`, untracked .gitignore'd paths are skipped as well;
+    tracked files are always scanned, ignored or not. Outside a git repo
+    nothing more is skipped.
+    """
+    tracked: frozenset[str] = frozenset()
+    if honor_ignores:
         try:
-            content = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            continue
+            tracked = tracked_paths(repo_dir)
+        except (OSError, subprocess.CalledProcessError):
+            honor_ignores = False  # cannot tell tracked from untracked: scan everything
+    rels = walk_files(
+        repo_dir,
+        skip_dir=SKIP_DIRS.__contains__,
+        accept_name=is_scan_name,
+        gitignore=honor_ignores,
+        tracked=tracked,
+    )
+    out = [repo_dir / rel for rel in rels]
+    out.sort()
+    return out
+
+
+def ruleset_digest() -> str:
+    """Identifies everything that decides a blob's scan result (rules and chunk overlap)."""
+    return sha256_text(json.dumps({"rules": matcher_for("tree").digest(), "overlap": MAX_MATCH_SPAN}))
+
+
+def match_labels(content: str | bytes) -> list[str]:
+    """Labels of every secret rule found in `content` (one combined regex pass), in rule order."""
+    return [r.label for r in matcher_for("tree").match(content)]
+
+
+def match_labels_chunks(chunks: Iterable[bytes]) -> list[str]:
+    """match_labels over a byte stream, with bounded memory however large it is."""
+    m = matcher_for("tree")
+    return [m.rules[i].label for i in m.match_chunks(chunks)]
+
+
+def findings_for_labels(labels: Iterable[str], rel: str) -> list[GateFinding]:
+    return [
+        GateFinding(
+            rule_id="secrets.pattern.match",
+            severity=RULES_BY_LABEL[label].severity,
+            message=f"Potential secret detected ({label}) in file {rel}.",
+            evidence={"file": rel, "pattern": label},
+        )
+        for label in labels
+    ]
+
+
+def scan_text(content: str, rel: str) -> list[GateFinding]:
+    """Secret-pattern findings for one file's decoded content (`rel` is its repo-relative path)."""
+    return findings_for_labels(match_labels(content), rel)
+
+
+def scan_file_labels(p: Path) -> list[str]:
+    """Labels matched in one file's raw bytes, streamed in SCAN_CHUNK_BYTES chunks (no size cap)."""
+    try:
+        with p.open("rb") as f:
+            return match_labels_chunks(iter(lambda: f.read(SCAN_CHUNK_BYTES), b""))
+    except OSError:
+        return []
+
+
+def scan_file(p: Path, repo_dir: Path) -> list[GateFinding]:
+    """Pattern-scan one candidate file."""
+    return findings_for_labels(scan_file_labels(p), str(p.relative_to(repo_dir)))
 
-        for label, pat in DEFAULT_SECRET_PATTERNS:
-            if pat.search(content):
-                findings.append(
-                    GateFinding(
-                        rule_id="secrets.pattern.match",
-                        severity="high",
-                        message=f"Potential secret detected ({label}) in file {p.relative_to(repo_dir)}.",
-                        evidence={"file": str(p.relative_to(repo_dir)), "pattern": label},
-                    )
-                )
 
+def scan_files(paths: list[Path], repo_dir: Path) -> list[GateFinding]:
+    """scan_file over a batch (one pool task per batch keeps per-task overhead low)."""
+    return [f for p in paths for f in scan_file(p, repo_dir)]
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def bounded_map(pool: Executor, fn: Callable[..., R], items: Iterable[T], *args: Any, window: int) -> Iterator[R]:
+    """
+    pool.map(fn, items) in input order, but with at most `window` tasks in
+    flight, so memory stays bounded however many items there are.
+    """
+    pending: deque = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def scan_repo_snapshot(
+    repo_dir: Path,
+    *,
+    workers: int | None = None,
+    use_processes: bool = False,
+    honor_ignores: bool = False,
+) -> list[GateFinding]:
+    """
+    Scan the working tree at `repo_dir` (skipping untracked .gitignore'd
+    files with `honor_ignores`, see iter_scan_candidates).
+
+    With `workers` > 1, file reads and pattern matching are spread over a
+    thread pool (or a process pool with `use_processes`, for CPU-bound
+    matching on large trees). Results are collected in candidate order, so
+    the findings are identical to the serial scan.
+    """
+    findings = scan_repo_metadata(repo_dir)
+    candidates = iter_scan_candidates(repo_dir, honor_ignores=honor_ignores)
+
+    if not workers or workers <= 1:
+        for p in candidates:
+            findings.extend(scan_file(p, repo_dir))
+        return findings
+
+    batches = [candidates[i:i + SCAN_BATCH_FILES] for i in range(0, len(candidates), SCAN_BATCH_FILES)]
+    pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        for batch_findings in bounded_map(pool, scan_files, batches, repo_dir, window=workers * 4):
+            findings.extend(batch_findings)
     return findings
 
 
+def default_workers() -> int:
+    return min(8, os.cpu_count() or 1)
+
+
+@dataclass
+class ScanStats:
+    mode: str
+    blobs: int = 0  # eligible blobs in the scanned tree
+    scanned: int = 0  # distinct blobs actually read and matched
+    cached: int = 0  # distinct blobs whose result came from the cache
+
+
+def tree_scan_candidates(entries: Iterable[TreeEntry]) -> list[TreeEntry]:
+    """Tree-entry counterpart of iter_scan_candidates (same filters, same order); symlinks are not followed."""
+    out = [e for e in entries if e.is_regular_blob and is_scan_path(e.path)]
+    out.sort(key=lambda e: e.path.split("/"))  # PurePosixPath order, without a PurePath per entry
+    return out
+
+
+def tree_metadata(cat: CatFileBatch, by_path: dict[str, TreeEntry]) -> list[GateFinding]:
+    """scan_metadata over a tree listing (`by_path`: path -> entry)."""
+    pkg = by_path.get("package.json")
+    return scan_metadata(
+        has_file=lambda name: name in by_path,
+        package_json=cat.read(pkg.sha) if pkg and pkg.type == "blob" else None,
+    )
+
+
+def scan_blobs(repo_dir: Path, cat: CatFileBatch, shas: list[str]) -> Iterator[tuple[str, list[str]]]:
+    """
+    (sha, labels) for each blob, read through `cat`. Blobs up to
+    SCAN_CHUNK_BYTES stream through the batch in one go; larger ones are
+    matched chunk by chunk rather than read whole. A blob missing from the
+    object store raises rather than passing as clean, so it is never
+    cached as such.
+    """
+    sizes = blob_sizes(repo_dir, shas)
+    wanted = [sha for sha in shas if sizes.get(sha, 0) <= SCAN_CHUNK_BYTES]
+    large = [sha for sha in shas if sizes.get(sha, 0) > SCAN_CHUNK_BYTES]
+    for sha, data in cat.iter_blobs(wanted):
+        if data is None:
+            raise RuntimeError(f"Blob {sha} is missing from the object store of {repo_dir}")
+        yield sha, match_labels(data)
+    for sha in large:
+        with closing(cat.read_chunks(sha, SCAN_CHUNK_BYTES)) as chunks:
+            yield sha, match_labels_chunks(chunks)
+
+
+def default_blob_cache(repo_dir: Path) -> BlobResultCache:
+    return BlobResultCache(git_dir(repo_dir) / "clawshield-cache", ruleset_digest())
+
+
+def scan_commit_tree(
+    repo_dir: Path,
+    commit: str,
+    *,
+    cache: BlobResultCache | None = None,
+    stats: ScanStats | None = None,
+) -> tuple[list[GateFinding], ScanStats]:
+    """
+    Scan the tree of `commit` straight from the git object store: no
+    checkout, and dirty or untracked working-tree files are not seen.
+
+    Blobs stream through one `git cat-file --batch` process and are matched
+    as they arrive; each distinct blob is read once however many paths
+    share it. Blobs over SCAN_CHUNK_BYTES are matched chunk by chunk rather
+    than read whole. With a `cache`, blobs already in it are not read at all.
+    """
+    entries = ls_tree(repo_dir, commit, sizes=False)
+    by_path = {e.path: e for e in entries}
+    candidates = tree_scan_candidates(entries)
+    stats = stats or ScanStats(mode="tree")
+    stats.blobs = len(candidates)
+
+    labels_by_sha: dict[str, list[str]] = {}
+    with CatFileBatch(repo_dir) as cat:
+        findings = tree_metadata(cat, by_path)
+
+        pending = []
+        for e in candidates:
+            if e.sha in labels_by_sha:
+                continue
+            cached = cache.get(e.sha) if cache is not None else None
+            labels_by_sha[e.sha] = cached
+            if cached is None:
+                pending.append(e.sha)
+        stats.cached = len(labels_by_sha) - len(pending)
+
+        for sha, labels in scan_blobs(repo_dir, cat, pending):
+            labels_by_sha[sha] = labels
+            if cache is not None:
+                cache.put(sha, labels)
+        stats.scanned = len(pending)
+
+    for e in candidates:
+        findings.extend(findings_for_labels(labels_by_sha[e.sha], e.path))
+    if cache is not None:
+        cache.save()
+    return findings, stats
+
+
+def scan_commit_incremental(
+    repo_dir: Path,
+    commit: str,
+    *,
+    cache: BlobResultCache | None = None,
+) -> tuple[list[GateFinding], ScanStats]:
+    """
+    scan_commit_tree with the per-blob result cache: results are cached per
+    (blob sha, rule set), so after the first run only blobs new since the
+    last gate are read; findings for the rest of the tree come from the
+    cache. No diff against a base is needed: the blob sha already says what
+    changed, and an unchanged blob missing from the cache (cold cache, new
+    rule set) has to be read anyway for the score to cover the full tree.
+    """
+    return scan_commit_tree(
+        repo_dir,
+        commit,
+        cache=cache if cache is not None else default_blob_cache(repo_dir),
+        stats=ScanStats(mode="incremental"),
+    )
+
+
+def run_gate(
+    repo_dir: Path,
+    commit: str,
+    *,
+    source: str = "worktree",
+    incremental: bool = False,
+    cache: BlobResultCache | None = None,
+    workers: int | None = None,
+    use_processes: bool = False,
+    honor_ignores: bool = False,
+) -> dict[str, Any]:
+    """
+    Scan, score and build the gate report in one call (what
+    clawshield_gate_poc.py writes). `source` is "worktree" (files on disk)
+    or "tree" (the commit's blobs); `incremental` implies "tree" with the
+    per-blob cache. `honor_ignores` applies to the worktree scan only (a
+    tree holds tracked files alone).
+    """
+    stats = None
+    if incremental:
+        findings, stats = scan_commit_incremental(repo_dir, commit, cache=cache)
+    elif source == "tree":
+        findings, stats = scan_commit_tree(repo_dir, commit, cache=cache)
+    elif source == "worktree":
+        findings = scan_repo_snapshot(repo_dir, workers=workers, use_processes=use_processes,
+                                      honor_ignores=honor_ignores)
+    else:
+        raise ValueError(f"Unknown scan source: {source}")
+    report = make_report(repo=str(repo_dir), commit=commit, findings=findings)
+    if stats is not None:
+        report["scan"] = asdict(stats)
+    return report
+
+
 def score_findings(findings: list[GateFinding]) -> dict[str, Any]:
     weights = {"info": 0, "low": 10, "med": 25, "high": 60}
     score = 100
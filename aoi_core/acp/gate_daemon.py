@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from aoi_core.acp.clawshield_gate import (
+    SKIP_DIRS,
+    GateFinding,
+    ScanStats,
+    default_blob_cache,
+    findings_for_labels,
+    iter_scan_candidates,
+    make_report,
+    ruleset_digest,
+    run_gate,
+    scan_commit_incremental,
+    scan_file_labels,
+    scan_repo_metadata,
+)
+from aoi_core.acp.git_objects import git_dir, rev_parse
+
+# Optional long-running gate for one repo, reachable over a Unix socket in
+# its git dir. It keeps the compiled rules, the per-blob result cache and a
+# stat-validated index of working-tree scan results in memory, so a
+# pre-push request only re-reads what changed since the last one.
+#
+# Protocol: one JSON object per line each way.
+#
+#     {"op": "gate", "repo": "/abs/repo", "commit": "HEAD", "full": false,
+#      "honor_ignores": false, "ruleset": "<digest>"}
+#     -> {"ok": true, "report": {...}}    |    {"ok": false, "error": "..."}
+#
+# plus {"op": "ping"} and {"op": "shutdown"}. A client whose rule set differs
+# from the daemon's (rules changed since it started) is refused, and the
+# hook falls back to scanning by itself.
+#
+# The background watcher is woken by filesystem events when the optional
+# `watchdog` package is installed (inotify / FSEvents / ReadDirectoryChangesW),
+# and otherwise polls, backing off while nothing changes. Either way the
+# walk and stat pass runs without the lock; only reading changed files and
+# swapping in the results hold it.
+
+SOCKET_NAME = "clawshield-gate.sock"
+RACY_NS = 2_000_000_000  # files modified this close to a scan are re-read next time (mtime granularity)
+IDLE_BACKOFF = 16  # an idle poll loop slows down to this many watch intervals
+EVENT_RESYNC_SECONDS = 300.0  # with filesystem events, a full refresh at least this often (missed events)
+
+
+def default_socket_path(repo_dir: Path) -> Path:
+    """$CLAWSHIELD_GATE_SOCKET if set, else the socket in the repo's git dir."""
+    override = os.environ.get("CLAWSHIELD_GATE_SOCKET")
+    return Path(override) if override else git_dir(repo_dir) / SOCKET_NAME
+
+
+class WorktreeIndex:
+    """
+    Working-tree scan results per path, keyed by (mtime_ns, size, inode).
+    A refresh costs one stat per candidate; only files whose key changed are
+    read again. Findings match scan_repo_snapshot's, in the same order.
+    """
+
+    def __init__(self, repo_dir: Path):
+        self.repo_dir = repo_dir
+        self.entries: dict[Path, tuple[tuple[int, int, int] | None, list[str]]] = {}
+
+    def list_candidates(self, honor_ignores: bool = False) -> tuple[int, list[tuple[Path, tuple[int, int, int]]]]:
+        """(start time, [(path, stat key)]): the walk and stat pass, touching no index state."""
+        started = time.time_ns()
+        listing = []
+        for p in iter_scan_candidates(self.repo_dir, honor_ignores=honor_ignores):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            listing.append((p, (st.st_mtime_ns, st.st_size, st.st_ino)))
+        return started, listing
+
+    def refresh(
+        self,
+        honor_ignores: bool = False,
+        listing: tuple[int, list[tuple[Path, tuple[int, int, int]]]] | None = None,
+    ) -> ScanStats:
+        """Bring the index up to date, from `listing` (list_candidates) if already taken."""
+        stats = ScanStats(mode="worktree")
+        started, candidates = listing if listing is not None else self.list_candidates(honor_ignores)
+        fresh: dict[Path, tuple[tuple[int, int, int] | None, list[str]]] = {}
+        for p, key in candidates:
+            old = self.entries.get(p)
+            if old is not None and old[0] == key:
+                fresh[p] = old
+                stats.cached += 1
+                continue
+            labels = scan_file_labels(p)
+            stats.scanned += 1
+            fresh[p] = (None if key[0] >= started - RACY_NS else key, labels)
+        self.entries = fresh
+        stats.blobs = len(fresh)
+        return stats
+
+    def findings(self) -> list[GateFinding]:
+        findings = scan_repo_metadata(self.repo_dir)
+        for p, (_, labels) in self.entries.items():
+            findings.extend(findings_for_labels(labels, str(p.relative_to(self.repo_dir))))
+        return findings
+
+
+class GateDaemon:
+    def __init__(
+        self,
+        repo_dir: Path,
+        socket_path: Path | None = None,
+        watch_interval: float | None = None,
+        honor_ignores: bool = False,
+    ):
+        self.repo_dir = repo_dir.resolve()
+        self.socket_path = socket_path or default_socket_path(self.repo_dir)
+        self.watch_interval = watch_interval
+        self.honor_ignores = honor_ignores  # what the watcher pre-scans; each request says its own
+        self.ruleset = ruleset_digest()
+        self.cache = default_blob_cache(self.repo_dir)
+        self.index = WorktreeIndex(self.repo_dir)
+        self._lock = threading.Lock()  # one scan at a time: the cache and index are not thread-safe
+        self._stop = threading.Event()
+        self._wake = threading.Event()  # filesystem event seen, or shutdown
+        self._seen: dict[Path, tuple[int, int, int]] = {}  # stat keys at the last watcher pass
+        self._server: socketserver.UnixStreamServer | None = None
+
+    def gate(
+        self,
+        commit: str,
+        full: bool = False,
+        honor_ignores: bool = False,
+    ) -> dict[str, Any]:
+        """The report clawshield_gate_poc.py would write for the same request."""
+        with self._lock:
+            if not full:
+                return run_gate(self.repo_dir, commit, incremental=True, cache=self.cache)
+            self.index.refresh(honor_ignores)
+            findings = self.index.findings()
+        return make_report(repo=str(self.repo_dir), commit=commit, findings=findings)
+
+    def handle(self, req: dict[str, Any]) -> dict[str, Any]:
+        op = req.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "repo": str(self.repo_dir), "ruleset": self.ruleset}
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        if op != "gate":
+            return {"ok": False, "error": f"unknown op: {op}"}
+        if Path(req.get("repo") or "").resolve() != self.repo_dir:
+            return {"ok": False, "error": f"daemon serves {self.repo_dir}"}
+        if req.get("ruleset") != self.ruleset:
+            return {"ok": False, "error": "ruleset mismatch (restart the daemon after changing rules)"}
+        try:
+            report = self.gate(
+                str(req.get("commit") or "HEAD"),
+                full=bool(req.get("full")),
+                honor_ignores=bool(req.get("honor_ignores")),
+            )
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        return {"ok": True, "report": report}
+
+    def _warm(self, head: str | None) -> tuple[str | None, bool]:
+        """One watcher pass: rescan changed files, pre-scan a new HEAD. Returns (HEAD, anything changed)."""
+        listing = self.index.list_candidates(self.honor_ignores)  # the walk runs unlocked
+        with self._lock:
+            self.index.refresh(self.honor_ignores, listing)
+        # Compare stat keys, not reads: files too recent to trust are re-read every pass
+        keys = dict(listing[1])
+        changed = keys != self._seen
+        self._seen = keys
+        new_head = rev_parse(self.repo_dir, "HEAD")
+        if new_head and new_head != head:
+            with self._lock:
+                scan_commit_incremental(self.repo_dir, new_head, cache=self.cache)
+            return new_head, True
+        return head, changed
+
+    def _watch(self) -> None:
+        """Keep results warm between pushes: rescan changed files, pre-scan each new HEAD."""
+        observer = start_observer(self.repo_dir, self._wake)
+        head = None
+        delay = self.watch_interval
+        try:
+            while not self._stop.is_set():
+                if observer is not None:
+                    # Sleep until something under the repo changes, then let a
+                    # burst of events (checkout, build) settle before the pass
+                    self._wake.wait(EVENT_RESYNC_SECONDS)
+                    if self._stop.wait(self.watch_interval):
+                        break
+                    self._wake.clear()
+                elif self._stop.wait(delay):
+                    break
+                try:
+                    head, changed = self._warm(head)
+                except Exception:
+                    continue  # a request will surface the error; the watcher only warms caches
+                delay = self.watch_interval if changed else min(delay * 2, self.watch_interval * IDLE_BACKOFF)
+        finally:
+            if observer is not None:
+                observer.stop()
+
+    def serve_forever(self) -> None:
+        if self.socket_path.exists():
+            if ping(self.socket_path) is not None:
+                raise RuntimeError(f"A gate daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()  # stale socket from a daemon that died
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                line = self.rfile.readline()
+                try:
+                    req = json.loads(line)
+                except ValueError as e:
+                    req = None
+                    resp = {"ok": False, "error": f"bad request: {e}"}
+                if isinstance(req, dict):
+                    resp = daemon.handle(req)
+                elif req is not None:
+                    resp = {"ok": False, "error": "bad request: expected a JSON object"}
+                self.wfile.write(json.dumps(resp).encode("utf-8") + b"\n")
+
+        old_umask = os.umask(0o177)  # socket is owner-only
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+
+        if self.watch_interval:
+            threading.Thread(target=self._watch, daemon=True).start()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=self.shutdown, daemon=True).start())
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self.socket_path.unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def start_observer(repo_dir: Path, wake: threading.Event) -> Any | None:
+    """
+    A running watchdog observer that sets `wake` on changes the watcher
+    cares about (skipped directories are ignored; in .git only HEAD and
+    refs), or None when watchdog is not installed or cannot watch the tree.
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    root = str(repo_dir)
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event: Any) -> None:
+            if event.event_type not in ("created", "modified", "deleted", "moved"):
+                return  # opened / closed: the watcher's own reads
+            for path in (event.src_path, getattr(event, "dest_path", "")):
+                parts = os.path.relpath(os.fsdecode(path), root).split(os.sep) if path else []
+                if not parts:
+                    continue
+                if parts[0] == ".git":
+                    if parts[1:2] in (["HEAD"], ["refs"], ["packed-refs"]):
+                        wake.set()
+                elif SKIP_DIRS.isdisjoint(parts):
+                    wake.set()
+
+    observer = Observer()
+    observer.daemon = True
+    try:
+        observer.schedule(Handler(), root, recursive=True)
+        observer.start()
+    except Exception:
+        return None  # e.g. inotify watch limit: poll instead
+    return observer
+
+
+def request(socket_path: Path, payload: dict[str, Any], timeout: float = 120.0) -> dict[str, Any]:
+    """One request/response round trip; raises OSError when no daemon is listening."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(str(socket_path))
+        s.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(1 << 16)
+            if not chunk:
+                break
+            buf += chunk
+    return json.loads(buf)
+
+
+def ping(socket_path: Path) -> dict[str, Any] | None:
+    try:
+        return request(socket_path, {"op": "ping"}, timeout=2.0)
+    except (OSError, ValueError):
+        return None
+
+
+def try_gate(
+    repo_dir: Path,
+    commit: str,
+    *,
+    full: bool = False,
+    honor_ignores: bool = False,
+    socket_path: Path | None = None,
+    timeout: float = 120.0,
+) -> tuple[dict[str, Any] | None, str | None]:
+    """
+    (report, None) from a running daemon, or (None, reason) when there is
+    none or it cannot answer, in which case the caller scans by itself.
+    """
+    repo_dir = repo_dir.resolve()
+    path = socket_path or default_socket_path(repo_dir)
+    if not path.exists():
+        return None, "not running"
+    payload = {
+        "op": "gate",
+        "repo": str(repo_dir),
+        "commit": commit,
+        "full": full,
+        "honor_ignores": honor_ignores,
+        "ruleset": ruleset_digest(),
+    }
+    try:
+        resp = request(path, payload, timeout=timeout)
+    except (OSError, ValueError) as e:
+        return None, f"unreachable ({e})"
+    if not resp.get("ok"):
+        return None, resp.get("error") or "error"
+    return resp["report"], None
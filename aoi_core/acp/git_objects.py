@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# Read-only helpers over the git object store. Nothing here checks out,
+# writes to the index, or touches the working tree.
+
+
+@dataclass(frozen=True)
+class TreeEntry:
+    path: str  # repo-relative, "/"-separated
+    mode: str  # e.g. 100644, 100755, 120000 (symlink), 160000 (submodule)
+    type: str  # blob|commit
+    sha: str
+    size: int  # -1 for non-blobs, or when listed without sizes
+
+    @property
+    def is_regular_blob(self) -> bool:
+        return self.type == "blob" and self.mode in ("100644", "100755")
+
+
+def git_output(repo: Path, *args: str) -> bytes:
+    return subprocess.check_output(["git", "-C", str(repo), *args], stderr=subprocess.PIPE)
+
+
+def rev_parse(repo: Path, ref: str) -> str | None:
+    try:
+        return git_output(repo, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}").decode().strip() or None
+    except subprocess.CalledProcessError:
+        return None
+
+
+def git_dir(repo: Path) -> Path:
+    d = Path(git_output(repo, "rev-parse", "--git-dir").decode().strip())
+    return d if d.is_absolute() else (repo / d).resolve()
+
+
+def tracked_paths(repo: Path) -> frozenset[str]:
+    """Paths in the index (`git ls-files`), repo-relative and "/"-separated."""
+    out = git_output(repo, "ls-files", "-z", "--full-name")
+    return frozenset(p.decode("utf-8", "surrogateescape") for p in out.split(b"\0") if p)
+
+
+def ls_tree(repo: Path, commit: str, *, sizes: bool = True) -> list[TreeEntry]:
+    """
+    Every entry of `commit`'s tree, recursively. Blob sizes cost git a
+    header read per blob (~5x the listing time); pass sizes=False and use
+    blob_sizes() for just the blobs that need one.
+    """
+    out = git_output(repo, "ls-tree", "-r", "-z", "--full-tree", *(["--long"] if sizes else []), commit)
+    entries = []
+    for rec in out.split(b"\0"):
+        if not rec:
+            continue
+        meta, path = rec.split(b"\t", 1)
+        mode, typ, sha, *rest = meta.split()
+        size = rest[0] if rest else b"-"
+        entries.append(
+            TreeEntry(
+                path=os.fsdecode(path),
+                mode=mode.decode(),
+                type=typ.decode(),
+                sha=sha.decode(),
+                size=int(size) if size != b"-" else -1,
+            )
+        )
+    return entries
+
+
+def blob_sizes(repo: Path, shas: Iterable[str]) -> dict[str, int]:
+    """Object sizes via one `git cat-file --batch-check` (objects that do not exist are left out)."""
+    shas = list(shas)
+    if not shas:
+        return {}
+    out = subprocess.run(
+        ["git", "-C", str(repo), "cat-file", "--batch-check=%(objectname) %(objectsize)"],
+        input="".join(f"{sha}\n" for sha in shas).encode(),
+        capture_output=True,
+        check=True,
+    ).stdout
+    sizes = {}
+    for line in out.splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[1].isdigit():
+            sizes[parts[0].decode()] = int(parts[1])
+    return sizes
+
+
+def read_blob(repo: Path, sha: str) -> bytes:
+    return git_output(repo, "cat-file", "blob", sha)
+
+
+class CatFileBatch:
+    """
+    One long-lived `git cat-file --batch` process. Objects are streamed back
+    over its stdout, so reading thousands of blobs costs one subprocess and
+    nothing is checked out or written to disk.
+    """
+
+    def __init__(self, repo: Path):
+        self._proc = subprocess.Popen(
+            ["git", "-C", str(repo), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "CatFileBatch":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.wait()
+        self._proc.stdout.close()
+
+    def _read_object(self) -> bytes | None:
+        header = self._proc.stdout.readline()
+        if not header:
+            raise RuntimeError("git cat-file --batch exited unexpectedly")
+        parts = header.split()
+        if len(parts) != 3:  # "<name> missing" / "<name> ambiguous"
+            return None
+        size = int(parts[2])
+        data = self._proc.stdout.read(size)
+        self._proc.stdout.read(1)  # trailing LF
+        return data
+
+    def read_chunks(self, sha: str, chunk_size: int) -> Iterator[bytes]:
+        """
+        Contents of one object as a stream of `chunk_size` pieces (nothing
+        for a missing object), so a large blob is never held in memory
+        whole. Close the iterator (or exhaust it) before the next request:
+        an abandoned stream is drained on close to keep the pipe aligned.
+        """
+        with self._lock:
+            self._proc.stdin.write(f"{sha}\n".encode())
+            self._proc.stdin.flush()
+            header = self._proc.stdout.readline()
+            if not header:
+                raise RuntimeError("git cat-file --batch exited unexpectedly")
+            parts = header.split()
+            if len(parts) != 3:
+                return
+            left = int(parts[2])
+            try:
+                while left:
+                    data = self._proc.stdout.read(min(chunk_size, left))
+                    if not data:
+                        raise RuntimeError("git cat-file --batch exited unexpectedly")
+                    left -= len(data)
+                    yield data
+            finally:
+                while left:
+                    data = self._proc.stdout.read(min(chunk_size, left))
+                    if not data:
+                        break
+                    left -= len(data)
+                self._proc.stdout.read(1)  # trailing LF
+
+    def read(self, sha: str) -> bytes | None:
+        """Contents of one object (None if it does not exist)."""
+        with self._lock:
+            self._proc.stdin.write(f"{sha}\n".encode())
+            self._proc.stdin.flush()
+            return self._read_object()
+
+    def iter_blobs(self, shas: Iterable[str]) -> Iterator[tuple[str, bytes | None]]:
+        """
+        (sha, contents) for every requested object, in request order, yielded
+        as each arrives. Requests are written from a helper thread so neither
+        side's pipe buffer can fill up and deadlock.
+        """
+        shas = list(shas)
+        stdin = self._proc.stdin
+
+        def feed() -> None:
+            for sha in shas:
+                stdin.write(f"{sha}\n".encode())
+            stdin.flush()
+
+        with self._lock:
+            writer = threading.Thread(target=feed, daemon=True)
+            writer.start()
+            done = 0
+            try:
+                for sha in shas:
+                    data = self._read_object()
+                    done += 1
+                    yield sha, data
+            finally:
+                writer.join()
+                for _ in range(len(shas) - done):  # consumer stopped early: keep the stream aligned
+                    self._read_object()
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# ACP automation policy (acp_automation_policy_v0_1.json), compiled once into
+# a decision function:
+#
+#     (action, provider, asset, usd) -> execute_if_preapproved
+#                                       | queue_for_approval
+#                                       | report_only
+#                                       | blocked
+#
+# Rules, in order (the first that applies decides):
+#
+# - blocked: a negative amount; a provider outside allowed_providers or a
+#   missing asset (with block_if_unknown_provider / block_if_unknown_asset);
+#   external posting while allow_external_posting is off (with
+#   block_if_external_posting, else queued); on-chain or signing while the
+#   policy disallows it.
+# - the action's routing mode; an action without a route is queued (only
+#   routed actions may run without a human).
+# - execute_if_preapproved is downgraded to queue_for_approval when the asset
+#   is not in allowed_assets, a preapproval guard is unmet (cost estimate,
+#   dry run, proof plan), or the amount breaks max_usd_per_tx or would take
+#   the rolling 24h spend past max_usd_per_day.
+#
+# Spend is kept in fixed time buckets with a running total, so a check is
+# O(1) whatever the number of recorded actions.
+
+EXECUTE = "execute_if_preapproved"
+QUEUE = "queue_for_approval"
+REPORT = "report_only"
+BLOCKED = "blocked"
+MODES = (EXECUTE, QUEUE, REPORT)
+
+DAY_S = 86400
+
+
+@dataclass(frozen=True)
+class ActionRequest:
+    action: str
+    provider: str | None
+    asset: str | None
+    usd: float | None  # None: no cost estimate
+    onchain: bool = False
+    signing: bool = False
+    external_posting: bool = False
+    dry_run_possible: bool = False
+    dry_run_done: bool = False
+    proof_plan: bool = True
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "ActionRequest":
+        usd = d.get("usd")
+        return cls(
+            action=str(d.get("action") or ""),
+            provider=d.get("provider"),
+            asset=d.get("asset"),
+            usd=None if usd is None else float(usd),
+            onchain=bool(d.get("onchain", False)),
+            signing=bool(d.get("signing", False)),
+            external_posting=bool(d.get("external_posting", False)),
+            dry_run_possible=bool(d.get("dry_run_possible", False)),
+            dry_run_done=bool(d.get("dry_run_done", False)),
+            proof_plan=bool(d.get("proof_plan", True)),
+        )
+
+
+@dataclass(frozen=True)
+class Decision:
+    mode: str  # EXECUTE | QUEUE | REPORT | BLOCKED
+    reasons: tuple[str, ...] = ()
+    spent_24h: float = 0.0  # rolling spend before this action
+
+    @property
+    def allowed(self) -> bool:
+        return self.mode == EXECUTE
+
+
+class CompiledPolicy:
+    """A policy dict reduced to sets, limits and a route table; decide() does no parsing."""
+
+    def __init__(self, policy: dict[str, Any]):
+        d = policy.get("defaults") or {}
+        g = policy.get("preapproval_guards") or {}
+        self.version = policy.get("version")
+        self.max_usd_per_tx = float(d.get("max_usd_per_tx", 0))
+        self.max_usd_per_day = float(d.get("max_usd_per_day", 0))
+        self.allowed_assets = frozenset(a.upper() for a in d.get("allowed_assets") or ())
+        self.allowed_providers = frozenset(p.lower() for p in d.get("allowed_providers") or ())
+        self.allow_onchain = bool(d.get("allow_onchain", False))
+        self.allow_signing = bool(d.get("allow_signing", False))
+        self.allow_external_posting = bool(d.get("allow_external_posting", False))
+        self.require_cost_estimate = bool(g.get("require_cost_estimate", True))
+        self.require_dry_run = bool(g.get("require_dry_run_when_possible", True))
+        self.require_proof_plan = bool(g.get("require_proof_plan", True))
+        self.block_external_posting = bool(g.get("block_if_external_posting", True))
+        self.block_unknown_asset = bool(g.get("block_if_unknown_asset", True))
+        self.block_unknown_provider = bool(g.get("block_if_unknown_provider", True))
+        routing = policy.get("routing") or {}
+        bad = {a: m for a, m in routing.items() if m not in MODES}
+        if bad:
+            raise ValueError(f"Unknown routing mode(s): {bad}")
+        self.routing: dict[str, str] = dict(routing)
+
+    def decide(self, req: ActionRequest, spent_24h: float = 0.0) -> Decision:
+        usd = req.usd
+        if usd is not None and (usd < 0 or math.isnan(usd)):
+            return Decision(BLOCKED, ("negative or invalid amount",), spent_24h)
+        blocked = []
+        if self.block_unknown_provider and (req.provider or "").lower() not in self.allowed_providers:
+            blocked.append(f"provider not allowed: {req.provider}")
+        if self.block_unknown_asset and not req.asset:
+            blocked.append("asset unknown")
+        if req.onchain and not self.allow_onchain:
+            blocked.append("on-chain actions disabled")
+        if req.signing and not self.allow_signing:
+            blocked.append("signing disabled")
+        if req.external_posting and not self.allow_external_posting and self.block_external_posting:
+            blocked.append("external posting disabled")
+        if blocked:
+            return Decision(BLOCKED, tuple(blocked), spent_24h)
+
+        mode = self.routing.get(req.action)
+        if mode is None:
+            return Decision(QUEUE, (f"no route for action: {req.action}",), spent_24h)
+        if mode != EXECUTE:
+            return Decision(mode, (), spent_24h)
+
+        queued = []
+        if req.external_posting and not self.allow_external_posting:
+            queued.append("external posting disabled")
+        if (req.asset or "").upper() not in self.allowed_assets:
+            queued.append(f"asset not allowed: {req.asset}")
+        if usd is None:
+            if self.require_cost_estimate:
+                queued.append("no cost estimate")
+        else:
+            if usd > self.max_usd_per_tx:
+                queued.append(f"over max_usd_per_tx ({usd} > {self.max_usd_per_tx})")
+            if spent_24h + usd > self.max_usd_per_day:
+                queued.append(f"over max_usd_per_day ({spent_24h} + {usd} > {self.max_usd_per_day})")
+        if self.require_dry_run and req.dry_run_possible and not req.dry_run_done:
+            queued.append("dry run required")
+        if self.require_proof_plan and not req.proof_plan:
+            queued.append("no proof plan")
+        if queued:
+            return Decision(QUEUE, tuple(queued), spent_24h)
+        return Decision(EXECUTE, (), spent_24h)
+
+
+@dataclass
+class SpendWindow:
+    """
+    Rolling spend over `window_s`, in `bucket_s` buckets. add() and total()
+    are O(1): the running total is kept, and advancing only clears the
+    buckets that fell out of the window (at most all of them, once).
+    """
+
+    window_s: int = DAY_S
+    bucket_s: int = 300
+    buckets: list[float] = field(default_factory=list)
+    total_usd: float = 0.0
+    head: int | None = None  # absolute index of the newest bucket
+
+    def __post_init__(self) -> None:
+        if not self.buckets:
+            # one extra bucket: spend leaves the window no earlier than window_s after it was added
+            self.buckets = [0.0] * (self.window_s // self.bucket_s + 1)
+
+    def _advance(self, now: float) -> int:
+        idx = int(now // self.bucket_s)
+        if self.head is None:
+            self.head = idx
+        elif idx > self.head:
+            n = len(self.buckets)
+            for i in range(self.head + 1, min(idx, self.head + n) + 1):
+                slot = i % n
+                self.total_usd -= self.buckets[slot]
+                self.buckets[slot] = 0.0
+            self.head = idx
+            if self.total_usd < 1e-9:
+                self.total_usd = 0.0  # float drift from repeated subtraction
+        return idx
+
+    def total(self, now: float | None = None) -> float:
+        self._advance(time.time() if now is None else now)
+        return self.total_usd
+
+    def add(self, usd: float, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        idx = self._advance(now)
+        if idx <= self.head - len(self.buckets):
+            return  # older than the window
+        self.buckets[idx % len(self.buckets)] += usd
+        self.total_usd += usd
+
+
+class PolicyEngine:
+    """
+    Compiled policy plus rolling spend, reloaded when the policy file
+    changes (checked at most every `reload_interval` seconds, by stat). A
+    file that fails to load keeps the previous policy in force and is
+    reported in `load_error`. Thread-safe.
+    """
+
+    def __init__(self, path: Path, *, reload_interval: float = 1.0, spend: SpendWindow | None = None):
+        self.path = Path(path)
+        self.reload_interval = reload_interval
+        self.spend = spend or SpendWindow()
+        self.load_error: str | None = None
+        self._lock = threading.Lock()
+        self._stamp: tuple[int, int] | None = None
+        self._next_check = 0.0
+        self.policy = self._load()
+
+    def _load(self) -> CompiledPolicy:
+        st = self.path.stat()
+        policy = CompiledPolicy(json.loads(self.path.read_text(encoding="utf-8")))
+        self._stamp = (st.st_mtime_ns, st.st_size)
+        return policy
+
+    def maybe_reload(self, force: bool = False) -> bool:
+        """Recompile if the file changed; True when a new policy was loaded."""
+        mono = time.monotonic()
+        if not force and mono < self._next_check:
+            return False
+        self._next_check = mono + self.reload_interval
+        try:
+            st = self.path.stat()
+            if not force and (st.st_mtime_ns, st.st_size) == self._stamp:
+                return False
+            policy = self._load()
+        except (OSError, ValueError) as e:
+            self.load_error = f"{type(e).__name__}: {e}"
+            return False
+        self.policy, self.load_error = policy, None
+        return True
+
+    def evaluate(self, req: ActionRequest, *, reserve: bool = True, now: float | None = None) -> Decision:
+        """
+        Decide `req`. With `reserve`, an executable action's amount is
+        counted against the daily limit right away, so concurrent callers
+        cannot overspend between deciding and recording.
+        """
+        self.maybe_reload()
+        with self._lock:
+            decision = self.policy.decide(req, self.spend.total(now))
+            if reserve and decision.mode == EXECUTE and req.usd:
+                self.spend.add(req.usd, now)
+        return decision
+
+    def record_spend(self, usd: float, now: float | None = None) -> None:
+        """Count spend decided elsewhere (e.g. an approved queued action, or history at startup)."""
+        with self._lock:
+            self.spend.add(usd, now)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from aoi_core.acp.approval_proof import ApprovalRecord, new_approval_id, write_approval_and_proof
+from aoi_core.acp.clawshield_gate import run_gate
+from aoi_core.acp.gate_daemon import try_gate
+
+# Pre-push pipeline: Gate -> Approval -> Proof in one process, on in-memory
+# objects. The gate report comes from the gate daemon when one is running,
+# else from a local scan; files are written once, by the proof writer.
+
+DEFAULT_POLICY = "aoi-core/state/acp_automation_policy_v0_1.json"
+
+
+@dataclass
+class PrePushResult:
+    report: dict[str, Any]
+    record: ApprovalRecord
+    source: str  # daemon|local
+    daemon_error: str | None = None  # why a running daemon could not answer
+
+    @property
+    def signal(self) -> str | None:
+        return (self.report.get("result") or {}).get("signal")
+
+    @property
+    def score(self) -> int | None:
+        return (self.report.get("result") or {}).get("score")
+
+    @property
+    def blocked(self) -> bool:
+        return self.signal == "red"
+
+
+def run_pre_push(
+    repo_dir: Path,
+    commit: str = "HEAD",
+    *,
+    policy_path: Path | None = None,
+    full: bool = False,
+    workers: int | None = None,
+    honor_ignores: bool = False,
+    use_daemon: bool = True,
+    approval_id: str | None = None,
+    approvals_dir: Path | None = None,
+    proofs_dir: Path | None = None,
+    export_json: bool = False,
+) -> PrePushResult:
+    """
+    Gate `commit` (incremental commit scan, or the working tree with
+    `full`, skipping untracked .gitignore'd files with `honor_ignores`),
+    then write the approval request and proof bundle under the repo's
+    aoi-core/state. Raises on gate or write failure (callers fail
+    closed).
+    """
+    repo_dir = repo_dir.resolve()
+    report, why = (
+        try_gate(repo_dir, commit, full=full, honor_ignores=honor_ignores) if use_daemon else (None, "disabled")
+    )
+    source = "daemon"
+    if report is None:
+        source = "local"
+        if full:
+            report = run_gate(repo_dir, commit, source="worktree", workers=workers, honor_ignores=honor_ignores)
+        else:
+            report = run_gate(repo_dir, commit, incremental=True)
+
+    policy_path = policy_path or repo_dir / DEFAULT_POLICY
+    policy = json.loads(policy_path.read_text(encoding="utf-8"))
+    state = repo_dir / "aoi-core" / "state"
+    record = write_approval_and_proof(
+        report,
+        policy,
+        approval_id=approval_id or new_approval_id(),
+        approvals_dir=approvals_dir or state / "approvals",
+        proofs_dir=proofs_dir or state / "proofs",
+        action="git_push",
+        provider="pre_push_gate",
+        policy_path=policy_path,
+        export_json=export_json,
+    )
+    return PrePushResult(
+        report=report,
+        record=record,
+        source=source,
+        daemon_error=None if why in (None, "not running", "disabled") else why,
+    )
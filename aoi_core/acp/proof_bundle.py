@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable
+
+# Proof bundle writer. Every file is hashed as it is written (the writer
+# tees each chunk into SHA-256), so nothing is read back, and artifacts such
+# as logs or screenshots are copied in chunks rather than loaded whole.
+#
+# finish() writes:
+#   sha256.json  {name: sha256}, as before
+#   merkle.json  {"algorithm", "leaves": [names], "root"}: a Merkle tree over
+#                the files in write order. One file can then be checked
+#                against the root with its audit path, without rehashing the
+#                rest of the bundle.
+#
+# Tree: leaf = H(0x00 || name || 0x00 || file digest), node = H(0x01 || l || r);
+# an odd node at the end of a level is carried up unchanged.
+
+SHA256_NAME = "sha256.json"
+MERKLE_NAME = "merkle.json"
+COPY_CHUNK = 1 << 20
+
+
+def _h(*parts: bytes) -> bytes:
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(p)
+    return h.digest()
+
+
+def merkle_leaf(name: str, digest_hex: str) -> bytes:
+    return _h(b"\x00", name.encode("utf-8"), b"\x00", bytes.fromhex(digest_hex))
+
+
+def merkle_levels(leaves: list[bytes]) -> list[list[bytes]]:
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        cur = levels[-1]
+        nxt = [_h(b"\x01", cur[i], cur[i + 1]) for i in range(0, len(cur) - 1, 2)]
+        if len(cur) % 2:
+            nxt.append(cur[-1])
+        levels.append(nxt)
+    return levels
+
+
+def merkle_root(leaves: list[bytes]) -> bytes:
+    return merkle_levels(leaves)[-1][0] if leaves else _h(b"")
+
+
+def merkle_path(leaves: list[bytes], index: int) -> list[tuple[str, str]]:
+    """Audit path for leaf `index`: (side, sibling hex) pairs from the leaf up; side is where the sibling sits."""
+    path = []
+    for level in merkle_levels(leaves)[:-1]:
+        sib = index ^ 1
+        if sib < len(level):
+            path.append(("L" if sib < index else "R", level[sib].hex()))
+        index //= 2
+    return path
+
+
+def verify_merkle_path(leaf: bytes, path: list[tuple[str, str]], root_hex: str) -> bool:
+    node = leaf
+    for side, sib_hex in path:
+        sib = bytes.fromhex(sib_hex)
+        node = _h(b"\x01", sib, node) if side == "L" else _h(b"\x01", node, sib)
+    return node.hex() == root_hex
+
+
+class HashingWriter:
+    """Binary writer that feeds every chunk to SHA-256 on its way to the file."""
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, b: bytes) -> int:
+        self._hash.update(b)
+        self.size += len(b)
+        return self._f.write(b)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def hash_file(path: Path, chunk_size: int = COPY_CHUNK) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ProofBundle:
+    """Write files into `proof_dir`, hashing as they go; finish() records sha256.json and merkle.json."""
+
+    def __init__(self, proof_dir: Path):
+        self.proof_dir = proof_dir
+        self.hashes: dict[str, str] = {}  # write order is leaf order
+        proof_dir.mkdir(parents=True, exist_ok=True)
+
+    def _target(self, name: str) -> Path:
+        if name in self.hashes or name in (SHA256_NAME, MERKLE_NAME):
+            raise ValueError(f"Duplicate or reserved bundle file: {name}")
+        p = self.proof_dir / name
+        if not p.resolve().is_relative_to(self.proof_dir.resolve()):
+            raise ValueError(f"Bundle file outside the bundle: {name}")
+        p.parent.mkdir(parents=True, exist_ok=True)
+        return p
+
+    def add_chunks(self, name: str, chunks: Iterable[bytes]) -> str:
+        with self._target(name).open("wb") as f:
+            w = HashingWriter(f)
+            for chunk in chunks:
+                w.write(chunk)
+        self.hashes[name] = w.hexdigest()
+        return self.hashes[name]
+
+    def add_bytes(self, name: str, data: bytes) -> str:
+        return self.add_chunks(name, (data,))
+
+    def add_json(self, name: str, obj: Any) -> str:
+        return self.add_bytes(name, json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def add_file(self, name: str, src: Path) -> str:
+        """Copy an artifact (log, screenshot, ...) into the bundle in COPY_CHUNK pieces."""
+        with src.open("rb") as f:
+            return self.add_chunks(name, iter(lambda: f.read(COPY_CHUNK), b""))
+
+    def finish(self) -> str:
+        """Write sha256.json and merkle.json; returns the Merkle root (hex)."""
+        names = list(self.hashes)
+        root = merkle_root([merkle_leaf(n, self.hashes[n]) for n in names]).hex()
+        (self.proof_dir / SHA256_NAME).write_text(json.dumps(self.hashes, ensure_ascii=False, indent=2), encoding="utf-8")
+        merkle = {"algorithm": "sha256", "leaves": names, "root": root}
+        (self.proof_dir / MERKLE_NAME).write_text(json.dumps(merkle, ensure_ascii=False, indent=2), encoding="utf-8")
+        return root
+
+
+def load_merkle(proof_dir: Path) -> dict[str, Any]:
+    merkle = json.loads((proof_dir / MERKLE_NAME).read_text(encoding="utf-8"))
+    merkle["hashes"] = json.loads((proof_dir / SHA256_NAME).read_text(encoding="utf-8"))
+    return merkle
+
+
+def verify_bundle(proof_dir: Path, names: Iterable[str] | None = None, root: str | None = None) -> dict[str, bool]:
+    """
+    Rehash `names` (default: every file) and check each against the Merkle
+    root via its audit path; only the named files are read. Pass `root`
+    (e.g. from the approval's proof_plan) to check against a root recorded
+    outside the bundle. Returns {name: ok}.
+    """
+    merkle = load_merkle(proof_dir)
+    root = root or merkle["root"]
+    leaves_names: list[str] = merkle["leaves"]
+    leaves = [merkle_leaf(n, merkle["hashes"][n]) for n in leaves_names]
+    consistent = merkle_root(leaves).hex() == root  # sha256.json, merkle.json and `root` agree
+    result = {}
+    for name in leaves_names if names is None else names:
+        if name not in leaves_names:
+            result[name] = False
+            continue
+        try:
+            leaf = merkle_leaf(name, hash_file(proof_dir / name))
+        except OSError:
+            result[name] = False
+            continue
+        result[name] = consistent and verify_merkle_path(leaf, merkle_path(leaves, leaves_names.index(name)), root)
+    return result
+
+
+def copy_tree_artifacts(bundle: ProofBundle, paths: Iterable[Path], prefix: str = "artifacts") -> None:
+    """Add artifact files (directories recursively, sorted) under `prefix/`."""
+    for p in paths:
+        if p.is_dir():
+            for f in sorted(x for x in p.rglob("*") if x.is_file()):
+                bundle.add_file(f"{prefix}/{p.name}/{f.relative_to(p).as_posix()}", f)
+        else:
+            bundle.add_file(f"{prefix}/{p.name}", p)
+
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Callable, Iterator
+
+# Working-tree walk for the gate. Built on os.scandir: excluded directories
+# are pruned before they are entered (so a huge node_modules costs one
+# directory entry, not a walk), and names and types come from the DirEntry
+# without a stat per file.
+#
+# Optionally, untracked paths excluded by .gitignore are skipped too. That
+# follows .gitignore semantics for the common subset: per-directory
+# .gitignore files plus .git/info/exclude, `!` negation, trailing `/` for
+# directories, leading or inner `/` to anchor, and `*`, `?`, `[...]`, `**`.
+# Ignore rules never hide a tracked file (git keeps tracking, and pushing,
+# a file that was committed before it was ignored), so the caller passes
+# the tracked paths and an ignored directory is only pruned when nothing
+# under it is tracked. Inside a directory kept that way, everything else
+# stays ignored: git cannot re-include a path below an excluded directory.
+
+
+def glob_to_regex(pat: str) -> str:
+    out = []
+    i, n = 0, len(pat)
+    while i < n:
+        if pat.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pat.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        c = pat[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[" and "]" in pat[i + 2:]:
+            j = pat.index("]", i + 2)
+            body = pat[i + 1:j]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = j
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """The patterns of one ignore file, matched against paths relative to its directory."""
+
+    def __init__(self, lines: list[str]):
+        self._rules: list[tuple[re.Pattern[str], bool, bool]] = []  # (regex, negated, dir_only)
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            if line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            regex = glob_to_regex(line.lstrip("/"))
+            if not anchored:
+                regex = "(?:.*/)?" + regex
+            self._rules.append((re.compile(regex + r"\Z"), negated, dir_only))
+
+    @classmethod
+    def load(cls, path: Path) -> "IgnoreRules | None":
+        try:
+            rules = cls(path.read_text(encoding="utf-8", errors="ignore").splitlines())
+        except OSError:
+            return None
+        return rules if rules._rules else None
+
+    def match(self, rel: str, is_dir: bool) -> bool | None:
+        """True if ignored, False if re-included by a `!` rule, None if no rule matches (last match wins)."""
+        for regex, negated, dir_only in reversed(self._rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel):
+                return not negated
+        return None
+
+
+def walk_files(
+    root: Path,
+    *,
+    skip_dir: Callable[[str], bool],
+    accept_name: Callable[[str], bool],
+    gitignore: bool = False,
+    tracked: set[str] | frozenset[str] = frozenset(),
+) -> Iterator[str]:
+    """
+    Repo-relative ("/"-separated) paths of the files under `root` that pass
+    every filter. Directories are checked (`skip_dir(name)`, and with
+    `gitignore` the ignore rules) before they are entered; symlinked
+    directories are not followed. With `gitignore`, paths in `tracked` (and
+    directories holding any of them) are kept even when ignored. Order is
+    unspecified.
+    """
+    tracked_dirs = {p[:i] for p in tracked for i, c in enumerate(p) if c == "/"} if gitignore else set()
+    stack0: list[tuple[str, IgnoreRules]] = []
+    if gitignore:
+        rules = IgnoreRules.load(root / ".git" / "info" / "exclude")
+        if rules is not None:
+            stack0.append(("", rules))
+
+    def ignored(rel: str, is_dir: bool, stack: list[tuple[str, IgnoreRules]]) -> bool:
+        for base, rules in reversed(stack):  # deeper ignore files take precedence
+            verdict = rules.match(rel[len(base):], is_dir)
+            if verdict is not None:
+                return verdict
+        return False
+
+    # (abs dir, rel dir + "/", ignore rules in scope, dir itself ignored but holds tracked files)
+    pending: list[tuple[str, str, list[tuple[str, IgnoreRules]], bool]] = [(str(root), "", stack0, False)]
+    while pending:
+        abs_dir, rel_dir, stack, excluded = pending.pop()
+        try:
+            with os.scandir(abs_dir) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        if gitignore and any(e.name == ".gitignore" for e in entries):
+            rules = IgnoreRules.load(Path(abs_dir) / ".gitignore")
+            if rules is not None:
+                stack = stack + [(rel_dir, rules)]
+
+        for entry in entries:
+            name = entry.name
+            rel = rel_dir + name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if skip_dir(name):
+                    continue
+                sub_excluded = excluded or bool(stack and ignored(rel, True, stack))
+                if sub_excluded and rel not in tracked_dirs:
+                    continue
+                pending.append((entry.path, rel + "/", stack, sub_excluded))
+                continue
+            if not accept_name(name):
+                continue
+            if (excluded or stack and ignored(rel, False, stack)) and rel not in tracked:
+                continue
+            try:
+                if entry.is_file():  # stats only for symlinks
+                    yield rel
+            except OSError:
+                continue
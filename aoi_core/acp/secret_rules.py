@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+# Single registry of secret-detection rules shared by every entry point:
+#
+# - target "tree": file contents (clawshield gate, scripts/security_check.sh)
+# - target "diff": pushed diffs (.github/workflows/aoi-guard.yml), matched
+#   case-insensitively. Any hit fails CI, so only rules precise enough to
+#   block on go here: the keyword heuristics plus token prefixes, not bare
+#   shapes like 64 hex digits (every tx signature and sha256 has one)
+#
+# Patterns are kept to the subset that Python `re`, `grep -E` and ripgrep
+# all read the same way (no \d \s \w \b escapes, lookarounds or lazy
+# quantifiers; tabs are written as a literal tab), so the shell entry points
+# can use the exported ERE directly:
+#
+#     python3 -m aoi_core.acp.secret_rules --ere tree
+#
+# Streaming scans look at MAX_MATCH_SPAN bytes either side of a chunk edge,
+# so a rule must be able to match within that many bytes (unbounded tails
+# like `{20,}` are fine: their shortest match is what counts).
+
+
+@dataclass(frozen=True)
+class SecretRule:
+    label: str
+    pattern: str
+    severity: str = "high"  # info|low|med|high
+    targets: tuple[str, ...] = ("tree", "diff")
+
+
+_ASSIGN = "[ \t]*="  # literal tab: `\t` inside [] is not a tab for grep -E
+
+SECRET_RULES: tuple[SecretRule, ...] = (
+    # Secret-shaped values
+    SecretRule("AWS_ACCESS_KEY_ID", r"AKIA[0-9A-Z]{16}"),
+    SecretRule("OPENAI_API_KEY", r"sk-[A-Za-z0-9]{20,}"),
+    SecretRule("PRIVATE_KEY_HEX", r"0x[a-fA-F0-9]{64}", targets=("tree",)),  # also tx hashes: not for CI
+    SecretRule("NOTION_TOKEN", r"ntn_[A-Za-z0-9]{10,}"),
+    SecretRule("NOTION_SECRET", r"secret_[A-Za-z0-9]{10,}"),
+    SecretRule("GITHUB_TOKEN", r"ghp_[A-Za-z0-9]{20,}"),
+    SecretRule("SLACK_TOKEN", r"xox[baprs]-", targets=("diff",)),
+    SecretRule("PEM_PRIVATE_KEY", r"-----BEGIN (RSA|OPENSSH) PRIVATE KEY-----", targets=("tree",)),
+    # Credentials assigned in env/config files
+    SecretRule("AWS_CREDENTIAL_ASSIGNMENT", "AWS_(ACCESS_KEY_ID|SECRET_ACCESS_KEY)" + _ASSIGN, targets=("tree",)),
+    SecretRule("SLACK_TOKEN_ASSIGNMENT", "SLACK_(BOT|APP)_TOKEN" + _ASSIGN, targets=("tree",)),
+    SecretRule("DISCORD_TOKEN_ASSIGNMENT", "DISCORD_TOKEN" + _ASSIGN, targets=("tree",)),
+    SecretRule("TELEGRAM_BOT_TOKEN_ASSIGNMENT", "TELEGRAM_BOT_TOKEN" + _ASSIGN, targets=("tree",)),
+    # Keyword heuristics: fine for a diff, too noisy for whole files
+    SecretRule("KEYWORD_API_KEY", r"api[_-]?key", targets=("diff",)),
+    SecretRule("KEYWORD_SECRET", r"secret", targets=("diff",)),
+    SecretRule("KEYWORD_PRIVATE_KEY", r"private[_-]?key", targets=("diff",)),
+    SecretRule("KEYWORD_MNEMONIC", r"mnemonic|seed phrase", targets=("diff",)),
+    SecretRule("PEM_PRIVATE_KEY_ANY", r"BEGIN (RSA|EC|OPENSSH) PRIVATE KEY", targets=("diff",)),
+)
+
+TARGET_IGNORE_CASE = {"tree": False, "diff": True}
+MAX_MATCH_SPAN = 4096
+
+_NON_PORTABLE = re.compile(r"\\[A-Za-z0-9]|\(\?|[*+?}]\?")
+
+
+def check_portable(pattern: str) -> None:
+    m = _NON_PORTABLE.search(pattern)
+    if m:
+        raise ValueError(f"Non-portable regex construct {m.group(0)!r} in {pattern!r}")
+
+
+RULES_BY_LABEL = {r.label: r for r in SECRET_RULES}
+
+
+def rules_for(target: str) -> list[SecretRule]:
+    if target not in TARGET_IGNORE_CASE:
+        raise ValueError(f"Unknown rule target: {target}")
+    return [r for r in SECRET_RULES if target in r.targets]
+
+
+def export_ere(target: str) -> str:
+    """All rules of `target` as one POSIX ERE alternation."""
+    return "|".join(f"({r.pattern})" for r in rules_for(target))
+
+
+class SecretMatcher:
+    """
+    All rules of a target compiled into one alternation, so a clean file
+    costs a single regex pass whatever the number of rules.
+
+    The alternation is only a prefilter: when it finds anything, the rules
+    are searched one by one to tell which matched. Files with hits are
+    rare, and the result is exactly the per-rule search. The branches are
+    non-capturing on purpose: named groups stop `re` from using its
+    first-character prefilter and make the combined pass ~20x slower.
+
+    Rules are also compiled as bytes patterns, so raw file contents can be
+    matched without a UTF-8 decode (every rule is ASCII).
+    """
+
+    def __init__(self, rules: list[SecretRule], ignore_case: bool = False):
+        for r in rules:
+            check_portable(r.pattern)
+        self.rules = list(rules)
+        flags = re.IGNORECASE if ignore_case else 0
+        combined = "|".join(f"(?:{r.pattern})" for r in self.rules)
+        self._each = [re.compile(r.pattern, flags) for r in self.rules]
+        self._combined = re.compile(combined, flags)
+        self._each_b = [re.compile(r.pattern.encode("ascii"), flags) for r in self.rules]
+        self._combined_b = re.compile(combined.encode("ascii"), flags)
+
+    def digest(self) -> str:
+        body = [[r.label, r.pattern, r.severity] for r in self.rules]
+        return hashlib.sha256(json.dumps({"rules": body, "flags": self._combined.flags}).encode("utf-8")).hexdigest()
+
+    def match_indices(self, content: str | bytes, skip: set[int] | None = None) -> list[int]:
+        """Indices (into self.rules) of every rule that matches `content`, in rule order."""
+        if isinstance(content, str):
+            combined, each = self._combined, self._each
+        else:
+            combined, each = self._combined_b, self._each_b
+        if not combined.search(content):
+            return []
+        skip = skip or set()
+        return [i for i, pat in enumerate(each) if i not in skip and pat.search(content)]
+
+    def match_chunks(self, chunks: Iterable[bytes], overlap: int = MAX_MATCH_SPAN) -> list[int]:
+        """
+        match_indices over a stream of byte chunks, holding one chunk plus
+        `overlap` trailing bytes at a time. Each chunk is matched together
+        with the tail of the previous one, so a match straddling a chunk
+        edge is still seen. Stops reading once every rule has matched.
+        """
+        hit: set[int] = set()
+        tail = b""
+        for chunk in chunks:
+            buf = tail + chunk
+            hit.update(self.match_indices(buf, skip=hit))
+            if len(hit) == len(self.rules):
+                break
+            tail = buf[-overlap:]
+        return sorted(hit)
+
+    def match(self, content: str | bytes) -> list[SecretRule]:
+        return [self.rules[i] for i in self.match_indices(content)]
+
+
+_MATCHERS: dict[str, SecretMatcher] = {}
+
+
+def matcher_for(target: str) -> SecretMatcher:
+    m = _MATCHERS.get(target)
+    if m is None:
+        m = _MATCHERS[target] = SecretMatcher(rules_for(target), TARGET_IGNORE_CASE[target])
+    return m
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Shared secret-rule registry")
+    ap.add_argument("--ere", metavar="TARGET", choices=sorted(TARGET_IGNORE_CASE), help="print the ERE alternation for a target (default: list rules)")
+    args = ap.parse_args()
+
+    if args.ere:
+        print(export_ere(args.ere))
+        return 0
+    for r in SECRET_RULES:
+        print(f"{r.label:<32} {r.severity:<5} {','.join(r.targets):<10} {r.pattern}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
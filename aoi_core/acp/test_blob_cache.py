@@ -0,0 +1,89 @@
+"""
+BlobResultCache: the append-only log round-trips, saves only new results,
+and never turns a damaged log into a wrong result.
+
+    python -m pytest -q aoi_core/acp/test_blob_cache.py
+"""
+
+from aoi_core.acp import blob_cache
+from aoi_core.acp.blob_cache import BlobResultCache
+
+RULESET = "ab" * 32
+
+
+def _sha(i: int) -> str:
+    return f"{i:040x}"
+
+
+def _filled(root, n: int = 50) -> BlobResultCache:
+    cache = BlobResultCache(root, RULESET)
+    for i in range(n):
+        cache.put(_sha(i), ["AWS_ACCESS_KEY_ID"] if i % 7 == 0 else [])
+    cache.save()
+    return cache
+
+
+def test_results_round_trip(tmp_path):
+    _filled(tmp_path)
+    cache = BlobResultCache(tmp_path, RULESET)
+    assert len(cache) == 50
+    assert cache.get(_sha(14)) == ["AWS_ACCESS_KEY_ID"]
+    assert cache.get(_sha(15)) == []
+    assert cache.get(_sha(99)) is None
+
+
+def test_save_appends_only_new_results(tmp_path):
+    path = _filled(tmp_path).path
+    before = path.read_bytes()
+
+    cache = BlobResultCache(tmp_path, RULESET)
+    cache.put(_sha(3), [])  # already known: nothing to write
+    cache.put(_sha(100), ["GITHUB_TOKEN"])
+    cache.save()
+    after = path.read_bytes()
+    assert after.startswith(before)
+    assert after[len(before):].count(b"\n") == 1
+
+    cache.save()  # nothing new since the last save
+    assert path.read_bytes() == after
+
+
+def test_torn_tail_is_a_miss_and_is_repaired(tmp_path):
+    path = _filled(tmp_path).path
+    text = path.read_text()
+    path.write_text(text[:-20])  # writer died mid-record
+
+    cache = BlobResultCache(tmp_path, RULESET)
+    assert len(cache) == 49 and cache.get(_sha(49)) is None
+    cache.put(_sha(49), ["AWS_ACCESS_KEY_ID"])
+    cache.save()
+    assert path.read_text() == text  # rewritten whole, not glued onto the torn line
+
+
+def test_other_ruleset_starts_fresh(tmp_path):
+    _filled(tmp_path)
+    other = BlobResultCache(tmp_path, RULESET[:16] + "cd" * 24)  # same file name, other rules
+    assert len(other) == 0
+    other.put(_sha(1), ["OPENAI_API_KEY"])
+    other.save()
+    assert len(BlobResultCache(tmp_path, RULESET)) == 0
+    assert BlobResultCache(tmp_path, other.ruleset).get(_sha(1)) == ["OPENAI_API_KEY"]
+
+
+def test_duplicates_from_concurrent_writers_are_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_cache, "COMPACT_MIN_RECORDS", 10)
+    path = _filled(tmp_path, n=2).path
+    # Four gates that loaded the same log all scan the same new blobs
+    gates = [BlobResultCache(tmp_path, RULESET) for _ in range(4)]
+    for cache in gates:
+        for i in range(2, 8):
+            cache.put(_sha(i), [])
+    for cache in gates:
+        cache.save()
+    assert len(path.read_text().splitlines()) == 1 + 2 + 4 * 6
+
+    late = BlobResultCache(tmp_path, RULESET)
+    late.put(_sha(8), [])
+    late.save()  # 27 records for 9 blobs: compacted
+    assert len(path.read_text().splitlines()) == 1 + 9
+    assert len(BlobResultCache(tmp_path, RULESET)) == 9
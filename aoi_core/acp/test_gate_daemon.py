@@ -0,0 +1,79 @@
+"""
+GateDaemon's background watcher: what a pass reports, that the walk runs
+without the lock, and that the poll loop backs off while idle.
+
+    python -m pytest -q aoi_core/acp/test_gate_daemon.py
+"""
+
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from aoi_core.acp import gate_daemon
+from aoi_core.acp.gate_daemon import GateDaemon
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def _repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "gate@example.com")
+    _git(repo, "config", "user.name", "gate")
+    (repo / "app.py").write_text("print('ok')\n", encoding="utf-8")
+    _git(repo, "add", "app.py")
+    _git(repo, "commit", "-q", "-m", "init")
+    return repo
+
+
+def test_warm_reports_changes_only(tmp_path):
+    repo = _repo(tmp_path)
+    daemon = GateDaemon(repo, socket_path=tmp_path / "gate.sock")
+    head, changed = daemon._warm(None)
+    assert head and changed
+    assert daemon._warm(head) == (head, False)
+
+    (repo / "new.py").write_text("x = 1\n", encoding="utf-8")
+    assert daemon._warm(head) == (head, True)
+    (repo / "new.py").unlink()
+    assert daemon._warm(head) == (head, True)
+
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "next")
+    new_head, changed = daemon._warm(head)
+    assert new_head != head and changed
+
+
+def test_walk_runs_without_the_lock(tmp_path, monkeypatch):
+    daemon = GateDaemon(_repo(tmp_path), socket_path=tmp_path / "gate.sock")
+    list_candidates = daemon.index.list_candidates
+    held = []
+
+    def spy(*args, **kwargs):
+        held.append(daemon._lock.locked())
+        return list_candidates(*args, **kwargs)
+
+    monkeypatch.setattr(daemon.index, "list_candidates", spy)
+    daemon._warm(None)
+    assert held == [False]
+
+
+def test_idle_polling_backs_off(tmp_path, monkeypatch):
+    monkeypatch.setattr(gate_daemon, "start_observer", lambda repo_dir, wake: None)
+    daemon = GateDaemon(_repo(tmp_path), socket_path=tmp_path / "gate.sock", watch_interval=0.01)
+    passes = []
+    monkeypatch.setattr(daemon, "_warm", lambda head: passes.append(time.monotonic()) or (head, False))
+
+    watcher = threading.Thread(target=daemon._watch)
+    watcher.start()
+    time.sleep(0.6)
+    daemon.shutdown()
+    watcher.join(2)
+    assert not watcher.is_alive()
+    # 0.01, 0.02, 0.04, 0.08, then capped at 0.16: a handful of passes, not 60
+    assert 3 <= len(passes) <= 10
+    gaps = [b - a for a, b in zip(passes, passes[1:])]
+    assert gaps[-1] > 4 * gaps[0]
@@ -0,0 +1,157 @@
+"""
+PolicyEngine against the shipped ACP automation policy: routing modes, the
+per-tx and per-day limits at their boundaries, reserved spend leaving the
+rolling window, and hot reload.
+
+    python -m pytest -q aoi_core/acp/test_policy_engine.py
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from aoi_core.acp.policy_engine import (
+    BLOCKED,
+    DAY_S,
+    EXECUTE,
+    QUEUE,
+    REPORT,
+    ActionRequest,
+    CompiledPolicy,
+    PolicyEngine,
+)
+
+POLICY_PATH = Path(__file__).resolve().parents[2] / "aoi-core" / "state" / "acp_automation_policy_v0_1.json"
+POLICY = json.loads(POLICY_PATH.read_text(encoding="utf-8"))
+T0 = 1_700_000_010.0  # 10s into a 300s spend bucket
+
+
+def _swap(usd, **kwargs) -> ActionRequest:
+    return ActionRequest(**{"action": "swap", "provider": "privy", "asset": "USDC", "usd": usd, **kwargs})
+
+
+def _engine(tmp_path: Path, policy=POLICY) -> PolicyEngine:
+    path = tmp_path / "policy.json"
+    path.write_text(json.dumps(policy), encoding="utf-8")
+    return PolicyEngine(path, reload_interval=0)
+
+
+def _rewrite(path: Path, text: str) -> None:
+    st = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))  # a new stamp even on coarse clocks
+
+
+@pytest.mark.parametrize("action, mode", [
+    ("swap", EXECUTE),
+    ("buy", QUEUE),
+    ("transfer", QUEUE),
+    ("register_offering", QUEUE),
+    ("update_offering", QUEUE),
+    ("market_research", REPORT),
+    ("bridge", QUEUE),  # no route: a human decides
+])
+def test_routing_modes(action, mode):
+    decision = CompiledPolicy(POLICY).decide(ActionRequest(action, "privy", "USDC", 1.0))
+    assert decision.mode == mode
+    assert decision.allowed == (mode == EXECUTE)
+
+
+@pytest.mark.parametrize("req, reason", [
+    (ActionRequest("swap", "binance", "USDC", 1.0), "provider not allowed: binance"),
+    (ActionRequest("swap", "privy", None, 1.0), "asset unknown"),
+    (ActionRequest("swap", "privy", "USDC", -1.0), "negative or invalid amount"),
+    (ActionRequest("swap", "privy", "USDC", float("nan")), "negative or invalid amount"),
+    (ActionRequest("market_research", "privy", "USDC", 0.0, external_posting=True), "external posting disabled"),
+])
+def test_blocked_before_routing(req, reason):
+    decision = CompiledPolicy(POLICY).decide(req)
+    assert decision.mode == BLOCKED
+    assert reason in decision.reasons
+
+
+@pytest.mark.parametrize("req, reason", [
+    (_swap(1.0, asset="SOL"), "asset not allowed: SOL"),
+    (_swap(None), "no cost estimate"),
+    (_swap(1.0, dry_run_possible=True), "dry run required"),
+    (_swap(1.0, proof_plan=False), "no proof plan"),
+])
+def test_preapproval_guards_queue(req, reason):
+    decision = CompiledPolicy(POLICY).decide(req)
+    assert decision.mode == QUEUE
+    assert decision.reasons == (reason,)
+    assert CompiledPolicy(POLICY).decide(_swap(1.0, dry_run_possible=True, dry_run_done=True)).mode == EXECUTE
+
+
+def test_per_tx_boundary():
+    policy = CompiledPolicy(POLICY)
+    assert policy.max_usd_per_tx == 2
+    assert policy.decide(_swap(2.0)).mode == EXECUTE
+    over = policy.decide(_swap(2.01))
+    assert over.mode == QUEUE
+    assert over.reasons[0].startswith("over max_usd_per_tx")
+
+
+def test_per_day_boundary():
+    policy = CompiledPolicy(POLICY)
+    assert policy.max_usd_per_day == 7
+    assert policy.decide(_swap(2.0), spent_24h=5.0).mode == EXECUTE
+    over = policy.decide(_swap(2.0), spent_24h=5.01)
+    assert over.mode == QUEUE
+    assert over.reasons[0].startswith("over max_usd_per_day")
+    assert over.spent_24h == 5.01
+
+
+def test_reserved_spend_counts_until_it_leaves_the_window(tmp_path):
+    engine = _engine(tmp_path)
+    for _ in range(3):
+        assert engine.evaluate(_swap(2.0), now=T0).mode == EXECUTE  # 6 reserved
+    assert engine.evaluate(_swap(2.0), now=T0 + 1).mode == QUEUE  # 6 + 2 > 7, not reserved
+    assert engine.evaluate(_swap(1.0), now=T0 + 2).mode == EXECUTE  # exactly 7
+    assert engine.spend.total(T0 + 2) == 7.0
+
+    # Spend never leaves before a full day, and at most one bucket after
+    assert engine.evaluate(_swap(0.5), now=T0 + DAY_S - 1).mode == QUEUE
+    assert engine.evaluate(_swap(0.5), now=T0 + DAY_S).mode == QUEUE
+    assert engine.spend.total(T0 + DAY_S) == 7.0
+    decision = engine.evaluate(_swap(2.0), now=T0 + DAY_S + engine.spend.bucket_s)
+    assert decision.mode == EXECUTE
+    assert decision.spent_24h == 0.0
+
+
+def test_evaluate_without_reserve_does_not_count(tmp_path):
+    engine = _engine(tmp_path)
+    for _ in range(5):
+        assert engine.evaluate(_swap(2.0), reserve=False, now=T0).mode == EXECUTE
+    assert engine.spend.total(T0) == 0.0
+    engine.record_spend(6.5, now=T0)
+    assert engine.evaluate(_swap(1.0), now=T0).mode == QUEUE
+
+
+def test_hot_reload_keeps_the_old_policy_on_a_bad_file(tmp_path):
+    engine = _engine(tmp_path)
+    assert engine.evaluate(_swap(3.0), now=T0).mode == QUEUE
+
+    looser = json.loads(json.dumps(POLICY))
+    looser["defaults"]["max_usd_per_tx"] = 5
+    _rewrite(engine.path, json.dumps(looser))
+    assert engine.evaluate(_swap(3.0), now=T0).mode == EXECUTE
+    assert engine.load_error is None
+
+    _rewrite(engine.path, json.dumps(looser)[:-40])  # truncated mid-write
+    assert engine.evaluate(_swap(1.0), now=T0).mode == EXECUTE
+    assert engine.policy.max_usd_per_tx == 5
+    assert engine.load_error.startswith("JSONDecodeError")
+
+    bad_route = json.loads(json.dumps(looser))
+    bad_route["routing"]["swap"] = "always"
+    _rewrite(engine.path, json.dumps(bad_route))
+    assert engine.evaluate(_swap(0.5), now=T0).mode == EXECUTE
+    assert engine.load_error.startswith("ValueError")
+
+    _rewrite(engine.path, json.dumps(POLICY))
+    assert engine.evaluate(_swap(0.5), now=T0).mode == EXECUTE
+    assert engine.policy.max_usd_per_tx == 2
+    assert engine.load_error is None
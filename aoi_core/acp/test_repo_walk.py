@@ -0,0 +1,86 @@
+"""
+The gate's working-tree walk with and without .gitignore handling, on a
+throwaway git repo.
+
+    python -m pytest -q aoi_core/acp/test_repo_walk.py
+"""
+
+import subprocess
+from pathlib import Path
+
+from aoi_core.acp.clawshield_gate import iter_scan_candidates, run_gate
+
+SECRET = "AKIA" + "ABCDEFGHIJKLMNOP"
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def _write(repo: Path, rel: str, text: str = "print('ok')\n") -> None:
+    p = repo / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+def _repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "gate@example.com")
+    _git(repo, "config", "user.name", "gate")
+    _write(repo, ".gitignore", "build/\n*.md\n!KEEP.md\n/root_only.py\nlogs/**/*.json\n")
+    _write(repo, "src/app.py")
+    _write(repo, "src/build/out.py")  # ignored via build/
+    _write(repo, "build/vendored.py")  # committed before the rule: stays tracked
+    _write(repo, "notes.md")
+    _write(repo, "KEEP.md")  # re-included by `!`
+    _write(repo, "root_only.py")  # anchored: only at the top level
+    _write(repo, "src/root_only.py")
+    _write(repo, "logs/a/b/trace.json", "{}")
+    _write(repo, "node_modules/x/index.js")
+    _write(repo, "local.py")  # ignored by .git/info/exclude
+    (repo / ".git" / "info").mkdir(exist_ok=True)
+    (repo / ".git" / "info" / "exclude").write_text("local.py\n", encoding="utf-8")
+    _git(repo, "add", ".gitignore", "src/app.py", "KEEP.md")
+    _git(repo, "add", "-f", "build/vendored.py")
+    _git(repo, "commit", "-q", "-m", "init")
+    return repo
+
+
+def _rels(repo: Path, **kwargs) -> list[str]:
+    return [p.relative_to(repo).as_posix() for p in iter_scan_candidates(repo, **kwargs)]
+
+
+def test_default_walk_scans_ignored_files(tmp_path):
+    repo = _repo(tmp_path)
+    assert _rels(repo) == sorted([
+        ".gitignore", "KEEP.md", "build/vendored.py", "local.py", "logs/a/b/trace.json",
+        "notes.md", "root_only.py", "src/app.py", "src/build/out.py", "src/root_only.py",
+    ])
+
+
+def test_honor_ignores_skips_untracked_ignored_files_only(tmp_path):
+    repo = _repo(tmp_path)
+    assert _rels(repo, honor_ignores=True) == [
+        ".gitignore", "KEEP.md", "build/vendored.py", "src/app.py", "src/root_only.py",
+    ]
+
+
+def test_honor_ignores_outside_a_repo_scans_everything(tmp_path):
+    _write(tmp_path, ".gitignore", "*.py\n")
+    _write(tmp_path, "a.py")
+    assert _rels(tmp_path, honor_ignores=True) == [".gitignore", "a.py"]
+
+
+def test_worktree_gate_reports_by_ignore_mode(tmp_path):
+    repo = _repo(tmp_path)
+    _write(repo, "build/creds.py", f"KEY = '{SECRET}'\n")  # untracked and ignored
+    _write(repo, "build/vendored.py", f"KEY = '{SECRET}'\n")  # tracked, ignored rule or not
+
+    def secret_files(**kwargs) -> set[str]:
+        report = run_gate(repo, "HEAD", source="worktree", **kwargs)
+        return {f["evidence"]["file"] for f in report["findings"] if f["rule_id"] == "secrets.pattern.match"}
+
+    assert secret_files() == {"build/creds.py", "build/vendored.py"}
+    assert secret_files(honor_ignores=True) == {"build/vendored.py"}
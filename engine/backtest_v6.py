@@ -0,0 +1,271 @@
+"""
+Alpha Oracle V6 — Event-Driven Backtester
+
+Replays a local candle file bar by bar through the same decision path as
+run_oracle_v6():
+
+    snapshot → detect_regime → compute_omega_v6 → make_decision
+
+Each non-HOLD decision buys the binary market (YES for LONG, NO for SHORT)
+at `market_price`, staked with the Kelly fraction from make_decision, and
+settles at the close `horizon` bars later: the market resolves YES when that
+close is strictly above the entry close.
+
+Snapshots come from compute_snapshot_series (one vectorized pass, same
+trailing-window seeding as the live 100-candle fetch) and decisions from the
+array kernels in §8b of sim_engine_v6 (value-for-value identical to the
+scalar functions), so the event loop only moves cash and a year of 5m bars
+replays in well under a second. trend_alignment is the real 15m/1h/4h one
+the live path gets from its CandleStore (multi_timeframe.mtf_alignment_series),
+falling back to the 5m-offset approximation until a higher timeframe has a
+full window; pass mtf_alignment=False (--no-mtf) for the approximation only.
+
+Usage:
+    python engine/backtest_v6.py --candles btc_5m.csv --out report.json
+"""
+
+import argparse
+import heapq
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from sim_engine_v6 import (
+    DEFAULT_CONFIG,
+    CandleSeries,
+    V6Config,
+    compute_omega_v6_array,
+    compute_snapshot_series,
+    detect_regime_array,
+    make_decision_array,
+)
+from multi_timeframe import with_mtf_alignment
+
+
+# ─────────────────────────────────────────────────────────────
+# §1. Candle File Loading
+# ─────────────────────────────────────────────────────────────
+
+def load_candle_file(path: str) -> CandleSeries:
+    """
+    Load a local candle history.
+
+    Supported formats:
+    - .json: Binance kline dump (list of [open_time, "o", "h", "l", "c", "v", ...])
+    - .csv:  first six columns timestamp,open,high,low,close,volume (header optional)
+    - .npy:  (n, 6) float64 array in CandleSeries layout
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            return CandleSeries.from_klines(json.load(f))
+    if ext == ".npy":
+        return CandleSeries(np.load(path))
+    if ext == ".csv":
+        with open(path, "r", encoding="utf-8") as f:
+            first = f.readline()
+        skip = 0 if first.split(",")[0].strip().replace(".", "", 1).isdigit() else 1
+        data = np.loadtxt(path, delimiter=",", skiprows=skip, usecols=range(6), ndmin=2)
+        return CandleSeries(data)
+    raise ValueError(f"Unsupported candle file format: {path}")
+
+
+# ─────────────────────────────────────────────────────────────
+# §2. Result Container
+# ─────────────────────────────────────────────────────────────
+
+@dataclass
+class BacktestResult:
+    """Outcome of one replay."""
+    equity_curve: np.ndarray        # Equity after each bar, through the last settlement
+    timestamps: np.ndarray          # Bar timestamps aligned with equity_curve
+    initial_equity: float
+    trades: int
+    wins: int
+    bars_evaluated: int
+    brier_score: float              # Mean (posterior - outcome)² over all evaluated bars
+    decisions: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def final_equity(self) -> float:
+        return float(self.equity_curve[-1]) if len(self.equity_curve) else self.initial_equity
+
+    @property
+    def total_return(self) -> float:
+        return self.final_equity / self.initial_equity - 1.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.wins / self.trades if self.trades else 0.0
+
+    @property
+    def max_drawdown(self) -> float:
+        """Largest peak-to-trough equity decline as a fraction of the peak."""
+        if len(self.equity_curve) == 0:
+            return 0.0
+        curve = np.concatenate([[self.initial_equity], self.equity_curve])
+        peaks = np.maximum.accumulate(curve)
+        return float(np.max((peaks - curve) / peaks))
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "bars_evaluated": self.bars_evaluated,
+            "trades": self.trades,
+            "wins": self.wins,
+            "hit_rate": round(self.hit_rate, 4),
+            "brier_score": round(self.brier_score, 6),
+            "initial_equity": self.initial_equity,
+            "final_equity": round(self.final_equity, 4),
+            "total_return": round(self.total_return, 6),
+            "max_drawdown": round(self.max_drawdown, 6),
+            "decisions": dict(self.decisions),
+        }
+
+
+# ─────────────────────────────────────────────────────────────
+# §3. Event Loop
+# ─────────────────────────────────────────────────────────────
+
+def run_backtest(candles: CandleSeries,
+                 market_price: float = 0.50,
+                 horizon: int = 1,
+                 initial_equity: float = 1000.0,
+                 historical_winrate: float = 0.55,
+                 config: Optional[V6Config] = None,
+                 series: Optional[Dict[str, np.ndarray]] = None,
+                 interval: str = "5m",
+                 mtf_alignment: bool = True) -> BacktestResult:
+    """
+    Replay `candles` through the V6 decision path.
+
+    Bar t is decided on its own close using the config.lookback_candles
+    candles ending at t. Positions settle at bar t + horizon; bars without a
+    settlement close are not traded, and the replay runs on through the
+    final `horizon` bars so every opened position settles. Stakes are
+    kelly_fraction × equity (capped by free cash), and open stakes are
+    counted at cost until they settle.
+
+    `interval` is the candle interval, used to resample the higher
+    timeframes for the MTF trend alignment.
+
+    `series` may pass a precomputed compute_snapshot_series result for the
+    same candles and config.indicator_key() (sweeps reuse it across
+    regime-only parameter changes); it is used as given, so it should
+    already carry the MTF alignment (with_mtf_alignment) if wanted.
+    """
+    if horizon < 1:
+        raise ValueError("horizon must be >= 1 bar")
+    cfg = config or DEFAULT_CONFIG
+    n = len(candles)
+    closes = np.ascontiguousarray(candles.close)
+    if series is None:
+        series = compute_snapshot_series(candles.high, candles.low, closes, candles.volume,
+                                         config=cfg)
+        if mtf_alignment:
+            series = with_mtf_alignment(series, candles, interval, cfg)
+
+    first, last = cfg.lookback_candles - 1, n - 1 - horizon
+    if last < first:
+        return BacktestResult(np.empty(0), np.empty(0), initial_equity, 0, 0, 0, 0.0)
+
+    # ── Decide every bar at once (array kernels, §8b) ──
+    bars = {name: arr[first:last + 1] for name, arr in series.items()}
+    regime = detect_regime_array(bars, cfg)
+    omega = compute_omega_v6_array(bars, regime, historical_winrate)
+    batch = make_decision_array(omega, regime, bars, market_price)
+
+    outcome = closes[first + horizon:last + 1 + horizon] > closes[first:last + 1]
+    brier_score = float(np.mean((omega.bayesian_posterior - outcome) ** 2))
+
+    cash = initial_equity
+    locked = 0.0
+    # (settle_bar, seq, decision_code, stake, win_payout, entry_close)
+    pending: List[Tuple[int, int, int, float, float, float]] = []
+    seq = 0
+    payouts = {1: 1.0 / market_price - 1.0 if market_price > 0 else 0.0,
+               2: 1.0 / (1.0 - market_price) - 1.0 if market_price < 1 else 0.0}
+
+    equity = np.empty(n - first)  # decision bars, then the bars that only settle
+    trades = wins = 0
+    codes = batch.code.tolist()
+    kellys = batch.kelly_fraction.tolist()
+    close_list = closes.tolist()
+
+    for i, t in enumerate(range(first, n)):
+        # ── Settle everything due at this bar's close ──
+        while pending and pending[0][0] <= t:
+            _, _, code, stake, payout, entry = heapq.heappop(pending)
+            went_up = close_list[t] > entry
+            won = went_up if code == 1 else not went_up
+            locked -= stake
+            cash += stake * (1.0 + payout) if won else 0.0
+            wins += won
+
+        # ── Open a position if this bar trades ──
+        code = codes[i] if t <= last else 0
+        if code and kellys[i] > 0:
+            stake = min(cash, kellys[i] * (cash + locked))
+            if stake > 0:
+                cash -= stake
+                locked += stake
+                trades += 1
+                heapq.heappush(pending, (t + horizon, seq, code, stake, payouts[code], close_list[t]))
+                seq += 1
+
+        equity[i] = cash + locked
+
+    return BacktestResult(
+        equity_curve=equity,
+        timestamps=np.asarray(candles.timestamp[first:]),
+        initial_equity=initial_equity,
+        trades=trades,
+        wins=int(wins),
+        bars_evaluated=last - first + 1,
+        brier_score=brier_score,
+        decisions=batch.counts(),
+    )
+
+
+# ─────────────────────────────────────────────────────────────
+# §4. Entry Point
+# ─────────────────────────────────────────────────────────────
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Replay a candle file through the Alpha Oracle V6 pipeline")
+    ap.add_argument("--candles", required=True, help="candle file (.json Binance klines, .csv, .npy)")
+    ap.add_argument("--market-price", type=float, default=0.50, help="binary market YES price")
+    ap.add_argument("--horizon", type=int, default=1, help="settlement horizon in bars")
+    ap.add_argument("--equity", type=float, default=1000.0, help="initial equity")
+    ap.add_argument("--winrate", type=float, default=0.55, help="historical win-rate prior")
+    ap.add_argument("--interval", default="5m", help="candle interval of the file")
+    ap.add_argument("--no-mtf", action="store_true",
+                    help="use the 5m-offset trend alignment instead of resampled timeframes")
+    ap.add_argument("--out", help="optional JSON report path (summary + equity curve)")
+    args = ap.parse_args()
+
+    candles = load_candle_file(args.candles)
+    result = run_backtest(candles, market_price=args.market_price, horizon=args.horizon,
+                          initial_equity=args.equity, historical_winrate=args.winrate,
+                          interval=args.interval, mtf_alignment=not args.no_mtf)
+    summary = result.summary()
+
+    print("═" * 70)
+    print("  📈 [Alpha Oracle V6] Backtest")
+    print("═" * 70)
+    for k, v in summary.items():
+        print(f"   {k:<16} {v}")
+
+    if args.out:
+        report = dict(summary, equity_curve=result.equity_curve.round(4).tolist(),
+                      timestamps=result.timestamps.tolist())
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,206 @@
+"""
+Alpha Oracle V6 — Multi-Market Batch Oracle
+
+Evaluates the V6 pipeline for hundreds of (symbol, interval, market_price)
+markets per tick:
+
+1. All klines (+ Pyth) are fetched concurrently through one pooled
+   MarketDataClient (optionally backed by the on-disk CandleStore).
+2. The latest `lookback_candles` window of every market is stacked into a
+   2-D (markets × bars) array and every indicator is computed in one
+   vectorized compute_snapshot_series pass along the bar axis.
+3. With a CandleStore, each market's trend_alignment is replaced by the
+   real higher-timeframe one (multi_timeframe.store_trend_alignment, store
+   backfilled to mtf_history_rows candles), as in run_oracle_v6.
+4. Regime, Ω and decision come from the array kernels (§8b of
+   sim_engine_v6) in one call each, and everything lands in one NumPy
+   structured array (one record per market) instead of console output.
+
+Usage:
+    python engine/batch_oracle_v6.py --market BTCUSDT:5m:0.50 --market ETHUSDT:5m:0.48
+    python engine/batch_oracle_v6.py --markets markets.json --out tick.csv
+"""
+
+import argparse
+import csv
+import json
+from dataclasses import fields
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from sim_engine_v6 import (
+    DEFAULT_CONFIG,
+    CandleSeries,
+    MarketDataClient,
+    TechnicalSnapshot,
+    V6Config,
+    compute_omega_v6_array,
+    compute_snapshot_series,
+    detect_regime_array,
+    get_historical_winrate,
+    get_market_data_client,
+    get_winrate_tracker,
+    make_decision_array,
+)
+from multi_timeframe import mtf_history_rows, store_trend_alignment
+
+SNAPSHOT_FIELDS = [f.name for f in fields(TechnicalSnapshot)]
+
+BATCH_RESULT_DTYPE = np.dtype(
+    [("symbol", "U20"), ("interval", "U8"), ("market_price", "f8"), ("ok", "?")]
+    + [(name, "f8") for name in SNAPSHOT_FIELDS]
+    + [("regime", "U16"), ("regime_strength", "f8"), ("adaptive_threshold", "f8"),
+       ("raw_score", "f8"), ("bayesian_posterior", "f8"), ("regime_adjusted", "f8"),
+       ("final_confidence", "f8"), ("decision", "U5"), ("kelly_fraction", "f8"),
+       ("expected_value", "f8")]
+)
+
+
+# ─────────────────────────────────────────────────────────────
+# §1. 2-D Indicator Pass
+# ─────────────────────────────────────────────────────────────
+
+def stack_windows(candles: Sequence[CandleSeries], window: int) -> np.ndarray:
+    """Stack the latest `window` candles of each series into (markets, window, 6)."""
+    return np.stack([c.window(window).data for c in candles])
+
+
+def compute_batch_snapshots(candles: Sequence[CandleSeries],
+                            config: Optional[V6Config] = None) -> Dict[str, np.ndarray]:
+    """
+    Latest snapshot fields for every market (each series needs at least
+    config.lookback_candles candles). Returns field → (markets,) array.
+    """
+    cfg = config or DEFAULT_CONFIG
+    block = stack_windows(candles, cfg.lookback_candles)
+    series = compute_snapshot_series(block[..., 2], block[..., 3], block[..., 4], block[..., 5],
+                                     config=cfg)
+    return {name: arr[:, -1] for name, arr in series.items()}
+
+
+def apply_store_alignment(snaps: Dict[str, np.ndarray], client: MarketDataClient,
+                          markets: Sequence[Tuple[str, str]],
+                          config: Optional[V6Config] = None) -> None:
+    """
+    Replace snaps["trend_alignment"] in place with the multi-timeframe
+    alignment from the client's CandleStore, for every market whose
+    interval has a ready higher timeframe.
+    """
+    cfg = config or DEFAULT_CONFIG
+    client.backfill({m: mtf_history_rows(m[1], config=cfg) for m in dict.fromkeys(markets)})
+    for k, (symbol, interval) in enumerate(markets):
+        alignment = store_trend_alignment(client.store, symbol, interval, cfg)
+        if alignment is not None:
+            snaps["trend_alignment"][k] = alignment
+
+
+# ─────────────────────────────────────────────────────────────
+# §2. Batch Orchestrator
+# ─────────────────────────────────────────────────────────────
+
+def run_batch_oracle(markets: Sequence[Tuple[str, str, float]],
+                     client: Optional[MarketDataClient] = None,
+                     supabase_client=None,
+                     config: Optional[V6Config] = None,
+                     historical_winrate: Optional[float] = None) -> np.ndarray:
+    """
+    Run V6 for every (symbol, interval, market_price) and return a
+    BATCH_RESULT_DTYPE record array in input order. Markets without enough
+    candle data come back with ok=False and NaN fields.
+    """
+    cfg = config or DEFAULT_CONFIG
+    client = client or get_market_data_client()
+    tick = client.fetch_tick([(s, i) for s, i, _ in markets], limit=cfg.lookback_candles,
+                             pyth_feeds=())
+    winrate = historical_winrate
+    if winrate is None:
+        winrate = get_historical_winrate(supabase_client, tracker=get_winrate_tracker())
+
+    out = np.zeros(len(markets), dtype=BATCH_RESULT_DTYPE)
+    for name in BATCH_RESULT_DTYPE.names:
+        if BATCH_RESULT_DTYPE[name].kind == "f":
+            out[name] = np.nan
+    out["symbol"] = [m[0] for m in markets]
+    out["interval"] = [m[1] for m in markets]
+    out["market_price"] = [m[2] for m in markets]
+
+    ready = [i for i, (s, iv, _) in enumerate(markets) if len(tick.candles[(s, iv)]) >= cfg.lookback_candles]
+    if not ready:
+        return out
+
+    snaps = compute_batch_snapshots([tick.candles[markets[i][:2]] for i in ready], cfg)
+    if client.store is not None:
+        apply_store_alignment(snaps, client, [markets[i][:2] for i in ready], cfg)
+    for name, arr in snaps.items():
+        out[name][ready] = arr
+
+    regime = detect_regime_array(snaps, cfg)
+    omega = compute_omega_v6_array(snaps, regime, winrate)
+    batch = make_decision_array(omega, regime, snaps, out["market_price"][ready])
+
+    out["ok"][ready] = True
+    out["regime"][ready] = regime.regime
+    out["regime_strength"][ready] = regime.regime_strength
+    out["adaptive_threshold"][ready] = regime.adaptive_threshold
+    out["raw_score"][ready] = omega.raw_score
+    out["bayesian_posterior"][ready] = omega.bayesian_posterior
+    out["regime_adjusted"][ready] = omega.regime_adjusted
+    out["final_confidence"][ready] = omega.final_confidence
+    out["decision"][ready] = batch.decision
+    out["kelly_fraction"][ready] = batch.kelly_fraction
+    out["expected_value"][ready] = batch.expected_value
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# §3. Entry Point
+# ─────────────────────────────────────────────────────────────
+
+def _parse_market(spec: str) -> Tuple[str, str, float]:
+    parts = spec.split(":")
+    interval = parts[1] if len(parts) > 1 else "5m"
+    price = float(parts[2]) if len(parts) > 2 else 0.50
+    return parts[0], interval, price
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Run Alpha Oracle V6 across many markets in one tick")
+    ap.add_argument("--market", action="append", default=[], help="SYMBOL:INTERVAL:PRICE (repeatable)")
+    ap.add_argument("--markets", help='JSON file: [["BTCUSDT", "5m", 0.5], ...]')
+    ap.add_argument("--winrate", type=float, default=None, help="override the historical win-rate prior")
+    ap.add_argument("--out", help="write the result table (.csv or .json)")
+    args = ap.parse_args()
+
+    markets: List[Tuple[str, str, float]] = [_parse_market(m) for m in args.market]
+    if args.markets:
+        with open(args.markets, "r", encoding="utf-8") as f:
+            markets += [(s, i, float(p)) for s, i, p in json.load(f)]
+    if not markets:
+        raise SystemExit("Provide --market or --markets")
+
+    table = run_batch_oracle(markets, historical_winrate=args.winrate)
+    emoji = {"LONG": "🟢", "SHORT": "🔴", "HOLD": "⚪"}
+    for rec in table:
+        if not rec["ok"]:
+            print(f"⚠️ {rec['symbol']:<12} {rec['interval']:<4} insufficient data")
+            continue
+        print(f"{emoji.get(rec['decision'], '⚪')} {rec['symbol']:<12} {rec['interval']:<4} "
+              f"{rec['decision']:<5} conf={rec['final_confidence']:.2%} "
+              f"kelly={rec['kelly_fraction']:.2%} ev={rec['expected_value']:+.4f} [{rec['regime']}]")
+
+    if args.out:
+        if args.out.endswith(".json"):
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump([{k: rec[k].item() for k in table.dtype.names} for rec in table], f, indent=2)
+        else:
+            with open(args.out, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(table.dtype.names)
+                writer.writerows(rec.tolist() for rec in table)
+        print(f"\n✅ wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
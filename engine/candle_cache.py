@@ -0,0 +1,114 @@
+"""
+Local on-disk candle store for incremental kline sync.
+
+One append-only file per (symbol, interval) holding raw float64 rows in
+CandleSeries layout (timestamp, open, high, low, close, volume — 48 bytes
+per candle). Reads are a memory map of that file wrapped in a CandleSeries,
+so a warm run loads any amount of history with no parsing at all.
+
+fetch_binance_klines(..., store=CandleStore(...)) asks Binance only for
+candles from the last stored open time onward and merges them in. The last
+stored candle is usually still open when written, so it is re-fetched and
+overwritten in place. A store holding less history than asked for is
+extended backwards (prepend), which rewrites the file once.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from sim_engine_v6 import CANDLE_FIELDS, CandleSeries
+
+ROW_BYTES = len(CANDLE_FIELDS) * 8
+
+
+class CandleStore:
+    """Append-only, memory-mapped candle files keyed by symbol/interval."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._maps: Dict[Path, Tuple[int, np.memmap]] = {}
+
+    def path(self, symbol: str, interval: str) -> Path:
+        return self.root / f"{symbol.upper()}_{interval}.f64"
+
+    def load(self, symbol: str, interval: str) -> CandleSeries:
+        """All stored candles as a read-only, memory-mapped CandleSeries."""
+        p = self.path(symbol, interval)
+        try:
+            size = p.stat().st_size
+        except FileNotFoundError:
+            return CandleSeries.empty()
+        rows = size // ROW_BYTES
+        if rows == 0:
+            return CandleSeries.empty()
+
+        cached = self._maps.get(p)
+        if cached is None or cached[0] != rows:
+            mm = np.memmap(p, dtype=np.float64, mode="r", shape=(rows, len(CANDLE_FIELDS)))
+            cached = self._maps[p] = (rows, mm)
+        return CandleSeries(cached[1])
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[float]:
+        """Open time of the newest stored candle (reads only the last row)."""
+        p = self.path(symbol, interval)
+        try:
+            with p.open("rb") as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell() - f.tell() % ROW_BYTES
+                if size == 0:
+                    return None
+                f.seek(size - ROW_BYTES)
+                return float(np.frombuffer(f.read(8), dtype=np.float64)[0])
+        except FileNotFoundError:
+            return None
+
+    def merge(self, symbol: str, interval: str, candles: CandleSeries) -> int:
+        """
+        Merge newer candles into the store; returns the number of rows written.
+
+        Rows at or after the first incoming timestamp are replaced (normally
+        just the previously-open last candle); everything else is appended.
+        """
+        if len(candles) == 0:
+            return 0
+        p = self.path(symbol, interval)
+        new = np.ascontiguousarray(candles.data, dtype=np.float64)
+        with self._lock:
+            stored = self.load(symbol, interval)
+            if len(stored) and new[0, 0] <= stored.timestamp[-1]:
+                start = int(np.searchsorted(stored.timestamp, new[0, 0]))
+            else:
+                start = len(stored)
+            with open(p, "r+b" if p.exists() else "wb") as f:
+                f.seek(start * ROW_BYTES)
+                f.write(new.tobytes())  # never truncates, so live memory maps stay valid
+            self._maps.pop(p, None)
+        return len(new)
+
+    def prepend(self, symbol: str, interval: str, candles: CandleSeries) -> int:
+        """
+        Add candles older than the first stored one; returns the rows added.
+        The file is rewritten and swapped in atomically, so live memory maps
+        keep the previous contents.
+        """
+        p = self.path(symbol, interval)
+        with self._lock:
+            stored = self.load(symbol, interval)
+            old = np.ascontiguousarray(candles.data, dtype=np.float64)
+            if len(stored):
+                old = old[old[:, 0] < stored.timestamp[0]]
+            if len(old) == 0:
+                return 0
+            tmp = p.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                f.write(old.tobytes())
+                f.write(np.ascontiguousarray(stored.data).tobytes())
+            os.replace(tmp, p)
+            self._maps.pop(p, None)
+        return len(old)
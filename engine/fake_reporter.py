@@ -0,0 +1,195 @@
+"""
+Local stand-in for `report_trade.ts --serve`.
+
+Speaks the trade_reporter batch protocol on stdin/stdout with a simulated
+startup cost (Node + ts-node + Anchor + IDL) and per-batch confirmation
+latency, and appends every delivered report to a log file, so the queue
+can be exercised end to end without Node or a validator. Like
+report_trade.ts it keeps the V6_REPORT_LEDGER ledger (every "transaction"
+lands at once) and answers reports already in it without re-delivering.
+
+Usage:
+    # As the reporter
+    V6_REPORTER_CMD="python engine/fake_reporter.py --serve --log /tmp/reported.jsonl" \\
+        python engine/sim_engine_v6.py
+
+    # Durability/latency check: a submitter that dies before delivering,
+    # then a fresh worker that drains its journal through a reporter that
+    # crashes once after delivering a batch, without answering; then a poison report that
+    # fails its whole batch, which must end up alone in failed.jsonl
+    python engine/fake_reporter.py --check --reports 200 --startup-ms 1500
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from trade_reporter import SubprocessReporter, TradeReportQueue, TradeReporter
+
+HERE = Path(__file__).resolve().parent
+
+
+def _landed(ledger: str) -> set:
+    sent, landed = {}, set()
+    if ledger and os.path.exists(ledger):
+        for line in open(ledger, encoding="utf-8"):
+            rec = json.loads(line)
+            if "ids" in rec:
+                sent[rec["sig"]] = rec["ids"]
+            elif rec.get("landed"):
+                landed.update(sent.get(rec["sig"], ()))
+    return landed
+
+
+def serve(log: str, startup_ms: float, delay_ms: float, reject_loss_over: float, fail_loss_over: float,
+          crash_after: int = 0, crash_flag: str = "") -> int:
+    time.sleep(startup_ms / 1000.0)
+    print("fake reporter ready", file=sys.stderr)
+    ledger = os.environ.get("V6_REPORT_LEDGER", "")
+    landed = _landed(ledger)
+    n = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        batch = json.loads(line)["batch"]
+        time.sleep(delay_ms / 1000.0)
+        n += 1
+        if fail_loss_over and any(r["pnl_bps"] < -fail_loss_over for r in batch):
+            sys.stdout.write(json.dumps({"ok": False, "error": "transaction failed"}) + "\n")
+            sys.stdout.flush()
+            continue
+        results = []
+        sig = f"fake-tx-{os.getpid()}-{n}"
+        with open(log, "a", encoding="utf-8") as f:
+            for r in batch:
+                if r.get("id") in landed:
+                    results.append({"id": r.get("id"), "ok": True})
+                    continue
+                if reject_loss_over and r["pnl_bps"] < -reject_loss_over:
+                    results.append({"id": r.get("id"), "ok": False, "error": "rejected"})
+                    continue
+                f.write(json.dumps(r) + "\n")
+                landed.add(r.get("id"))
+                results.append({"id": r.get("id"), "ok": True, "tx": sig})
+        if ledger:
+            with open(ledger, "a", encoding="utf-8") as f:
+                ids = [r["id"] for r in results if r.get("tx") == sig]
+                f.write(json.dumps({"sig": sig, "ids": ids}) + "\n" + json.dumps({"sig": sig, "landed": True}) + "\n")
+        if n == crash_after and crash_flag and not os.path.exists(crash_flag):
+            open(crash_flag, "w").close()
+            os._exit(1)  # delivered, but the answer is lost
+        sys.stdout.write(json.dumps({"ok": True, "results": results}) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+def _submit_and_die(queue_dir: str, reports: int) -> None:
+    """Child process: journal `reports` reports, then exit without delivering any."""
+    queue = TradeReportQueue(Path(queue_dir))
+    lat = []
+    for k in range(reports):
+        t0 = time.perf_counter()
+        queue.put({"pnl_bps": k % 50 - 20, "is_win": k % 3 != 0, "seq": k})
+        lat.append(time.perf_counter() - t0)
+    print(json.dumps({"p50": statistics.median(lat), "max": max(lat)}))
+    sys.stdout.flush()
+    os._exit(0)  # no atexit flush: simulates a crash after submitting
+
+
+def check(reports: int, startup_ms: float, delay_ms: float) -> int:
+    tmp = Path(tempfile.mkdtemp(prefix="trade-reports-"))
+    try:
+        queue_dir, log = tmp / "queue", tmp / "reported.jsonl"
+        out = subprocess.run([sys.executable, __file__, "--submit-and-die", str(queue_dir), "--reports", str(reports)],
+                             cwd=HERE, check=True, capture_output=True, text=True).stdout
+        submit = json.loads(out)
+        queue = TradeReportQueue(queue_dir)
+        print(f"🧪 {reports} reports journaled by a submitter that exited undelivered; {queue.pending()} pending")
+        print(f"   submit(): p50 {submit['p50'] * 1000:.2f} ms, max {submit['max'] * 1000:.2f} ms (fsync'ed append)")
+
+        cmd = [sys.executable, str(HERE / "fake_reporter.py"), "--serve", "--log", str(log),
+               "--startup-ms", str(startup_ms), "--delay-ms", str(delay_ms),
+               "--crash-after", "2", "--crash-flag", str(tmp / "crashed")]
+        reporter = TradeReporter(queue, SubprocessReporter(cmd, cwd=HERE, ledger=queue.ledger),
+                                 max_batch=16, max_wait=0.05, backoff=0.05)
+        t0 = time.perf_counter()
+        reporter.start()
+        drained = reporter.flush(timeout=120)
+        elapsed = time.perf_counter() - t0
+        reporter.close()
+
+        seqs = [json.loads(line)["seq"] for line in log.read_text().splitlines()]
+        missing = set(range(reports)) - set(seqs)
+        batches = -(-reports // 16)
+        print(f"   drained by one worker in {elapsed:.2f}s ({batches} batches, {startup_ms:.0f}ms startup per reporter process)")
+        print(f"   per-trade process spawn would cost ≥ {reports * (startup_ms + delay_ms) / 1000:.1f}s "
+              f"on the decision path")
+        dupes = len(seqs) - len(set(seqs))
+        ok = drained and not missing and not dupes and queue.pending() == 0
+        if ok:
+            print(f"   ✅ all {reports} delivered exactly once across a reporter crash, journal compacted")
+        else:
+            print(f"   ❌ drained={drained} missing={len(missing)} duplicates={dupes} pending={queue.pending()}")
+        return (0 if ok else 1) | check_poison(tmp / "poison")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def check_poison(root: Path, reports: int = 40, poison: int = 27) -> int:
+    """One report fails every batch it is in (no per-item answer): it alone must be dead-lettered."""
+    queue, log = TradeReportQueue(root / "queue"), root / "reported.jsonl"
+    for k in range(reports):
+        queue.put({"pnl_bps": -900 if k == poison else k % 50 - 20, "is_win": k % 3 != 0, "seq": k})
+    cmd = [sys.executable, str(HERE / "fake_reporter.py"), "--serve", "--log", str(log),
+           "--startup-ms", "0", "--delay-ms", "0", "--fail-batch-loss-over", "500"]
+    reporter = TradeReporter(queue, SubprocessReporter(cmd, cwd=HERE), max_batch=16, max_wait=0,
+                             max_attempts=2, backoff=0.01)
+    reporter.start()
+    drained = reporter.flush(timeout=60)
+    reporter.close()
+    seqs = sorted(json.loads(line)["seq"] for line in log.read_text().splitlines())
+    failed = [json.loads(line) for line in queue.failed.read_text().splitlines()] if queue.failed.exists() else []
+    ok = drained and seqs == [k for k in range(reports) if k != poison] and [f["seq"] for f in failed] == [poison]
+    if ok:
+        print(f"   ✅ poison report isolated: {len(seqs)} delivered, 1 dead-lettered ({failed[0].get('error')})")
+    else:
+        print(f"   ❌ poison: drained={drained} delivered={len(seqs)} failed={[f['seq'] for f in failed]}")
+    return 0 if ok else 1
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Stand-in for report_trade.ts --serve")
+    ap.add_argument("--serve", action="store_true", help="run as the reporter (stdin/stdout protocol)")
+    ap.add_argument("--log", default="reported.jsonl", help="where delivered reports are appended")
+    ap.add_argument("--startup-ms", type=float, default=1500.0, help="simulated Node/Anchor startup")
+    ap.add_argument("--delay-ms", type=float, default=400.0, help="simulated confirmation time per batch")
+    ap.add_argument("--reject-loss-over", type=float, default=0.0, help="reject reports losing more bps (dead-letter path)")
+    ap.add_argument("--fail-batch-loss-over", type=float, default=0.0,
+                    help="fail the whole batch when a report loses more bps (no per-item answer)")
+    ap.add_argument("--crash-after", type=int, default=0, help="exit unanswered after delivering this batch")
+    ap.add_argument("--crash-flag", default="", help="crash only while this file does not exist (then create it)")
+    ap.add_argument("--check", action="store_true", help="run the durability/latency check")
+    ap.add_argument("--reports", type=int, default=200)
+    ap.add_argument("--submit-and-die", default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.submit_and_die:
+        _submit_and_die(args.submit_and_die, args.reports)
+    if args.serve:
+        return serve(args.log, args.startup_ms, args.delay_ms, args.reject_loss_over, args.fail_batch_loss_over,
+                     args.crash_after, args.crash_flag)
+    if args.check:
+        return check(args.reports, args.startup_ms, args.delay_ms)
+    ap.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+"""
+Local stand-in for the slice of the Supabase client the V6 engine uses.
+
+An in-memory `predictions` table behind the same query chain
+(table().select().not_.is_().gte().execute(), plus insert/update) with
+optional artificial latency per execute(), so the win-rate prior can be
+exercised without the network.
+
+Usage:
+    # Check WinRateTracker against the direct query over a simulated day of
+    # settlements, and compare per-tick prior latency
+    python engine/fake_supabase.py --check --predictions 2000 --delay-ms 80
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from sim_engine_v6 import WinRateTracker, get_historical_winrate
+
+
+def _ts(value) -> float:
+    dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp()
+
+
+class _Query:
+    def __init__(self, client: "FakeSupabase", table: str):
+        self._client = client
+        self._table = table
+        self._columns: Optional[List[str]] = None
+        self._filters = []
+        self._negate = False
+        self._write = None
+
+    # ── reads ──
+    def select(self, columns: str = "*") -> "_Query":
+        self._columns = None if columns.strip() == "*" else [c.strip() for c in columns.split(",")]
+        return self
+
+    @property
+    def not_(self) -> "_Query":
+        self._negate = True
+        return self
+
+    def is_(self, column: str, value: str) -> "_Query":
+        want_null = value == "null"
+        negate, self._negate = self._negate, False
+        self._filters.append(lambda r: ((r.get(column) is None) == want_null) != negate)
+        return self
+
+    def eq(self, column: str, value) -> "_Query":
+        self._filters.append(lambda r: r.get(column) == value)
+        return self
+
+    def gte(self, column: str, value) -> "_Query":
+        bound = _ts(value)
+        self._filters.append(lambda r: r.get(column) is not None and _ts(r[column]) >= bound)
+        return self
+
+    # ── writes ──
+    def insert(self, rows) -> "_Query":
+        self._write = ("insert", rows if isinstance(rows, list) else [rows])
+        return self
+
+    def update(self, values: Dict) -> "_Query":
+        self._write = ("update", values)
+        return self
+
+    def execute(self) -> SimpleNamespace:
+        if self._client.delay_s:
+            time.sleep(self._client.delay_s)
+        self._client.calls += 1
+        with self._client.lock:
+            rows = self._client.tables.setdefault(self._table, [])
+            if self._write and self._write[0] == "insert":
+                rows.extend(dict(r) for r in self._write[1])
+                return SimpleNamespace(data=[dict(r) for r in self._write[1]])
+            hits = [r for r in rows if all(f(r) for f in self._filters)]
+            if self._write:
+                for r in hits:
+                    r.update(self._write[1])
+            if self._columns is not None:
+                hits = [{c: r.get(c) for c in self._columns} for r in hits]
+            return SimpleNamespace(data=[dict(r) for r in hits])
+
+
+class FakeSupabase:
+    """In-memory tables; `calls` counts execute() round-trips."""
+
+    def __init__(self, delay_ms: float = 0.0):
+        self.delay_s = delay_ms / 1000.0
+        self.tables: Dict[str, List[Dict]] = {}
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+
+def check(predictions: int, delay_ms: float, seed: int = 7) -> int:
+    """
+    Simulate a day of predictions settling one per tick; after each, the
+    tracker's prior must equal the direct query's. Returns 0 on agreement.
+    """
+    rng = random.Random(seed)
+    sb = FakeSupabase()
+    bucket = 300
+    now = time.time()
+    start = now - 36 * 3600
+    # Older history, some of it outside the 24h window
+    for k in range(predictions):
+        ts = start + rng.random() * (now - start)
+        created = datetime.fromtimestamp(ts, timezone.utc)
+        sb.table("predictions").insert({"id": k, "created_at": created.isoformat(),
+                                        "is_win": rng.random() < 0.58}).execute()
+    tracker = WinRateTracker(bucket_seconds=bucket, resync_seconds=None)
+    tracker.backfill(sb, now=now)
+
+    sb.delay_s = delay_ms / 1000.0
+    mismatches = 0
+    direct_s, tracked_s = [], []
+    for k in range(50):
+        created = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        is_win = rng.random() < 0.58
+        sb.table("predictions").insert({"id": predictions + k, "created_at": created, "is_win": is_win}).execute()
+        tracker.record(is_win, created, now=now)
+
+        t0 = time.perf_counter()
+        direct = get_historical_winrate(sb)
+        direct_s.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        tracked = tracker.winrate(now=now)
+        tracked_s.append(time.perf_counter() - t0)
+        if direct != tracked:
+            mismatches += 1
+            print(f"   mismatch at tick {k}: direct {direct} vs tracker {tracked}")
+
+    wins, total = tracker.counts(now=now)
+    print(f"🧪 {total} settled predictions in window ({wins} wins), prior {tracker.winrate(now=now):.2%}")
+    print(f"   direct query: p50 {statistics.median(direct_s) * 1000:.2f} ms per tick "
+          f"({delay_ms:.0f}ms stub latency)")
+    print(f"   tracker:      p50 {statistics.median(tracked_s) * 1e6:.1f} µs per tick")
+    print("   ✅ tracker matches the direct query" if not mismatches else f"   ❌ {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="In-memory Supabase stand-in for the V6 win-rate prior")
+    ap.add_argument("--check", action="store_true", help="check WinRateTracker against the direct query")
+    ap.add_argument("--predictions", type=int, default=1000, help="history rows to seed")
+    ap.add_argument("--delay-ms", type=float, default=0.0, help="artificial per-query latency")
+    args = ap.parse_args()
+    if args.check:
+        return check(args.predictions, args.delay_ms)
+    ap.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+"""
+Local stand-in for the Binance kline and Pyth Hermes endpoints.
+
+Serves deterministic synthetic candles (a smooth function of the candle
+index, so any window can be generated without state) with optional
+artificial latency, so MarketDataClient can be exercised and timed end to
+end without the network.
+
+Usage:
+    # Serve on a fixed port
+    python engine/market_stub_server.py --port 8765 --delay-ms 40
+
+    # Or measure tick latency against an in-process stub
+    python engine/market_stub_server.py --bench --symbols 50 --ticks 20 --delay-ms 40
+"""
+
+import argparse
+import json
+import math
+import statistics
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from sim_engine_v6 import LOOKBACK_CANDLES, PYTH_BTC_FEED, MarketDataClient
+
+INTERVAL_MS = {"1m": 60_000, "5m": 300_000, "15m": 900_000, "1h": 3_600_000, "4h": 14_400_000}
+
+
+def synthetic_kline(symbol: str, interval_ms: int, index: int) -> list:
+    """Binance-shaped kline row for candle `index` (open time = index × interval)."""
+    seed = zlib.crc32(symbol.encode()) % 1000
+    base = 100.0 + seed * 50.0
+
+    def price(k: float) -> float:
+        return base * math.exp(0.02 * math.sin((k + seed) / 37.0) + 0.004 * math.sin((k + seed) / 5.0))
+
+    open_, close = price(index), price(index + 1)
+    high = max(open_, close) * 1.0008
+    low = min(open_, close) * 0.9992
+    volume = 50.0 + 40.0 * math.sin((index + seed) / 11.0) ** 2
+    open_time = index * interval_ms
+    return [open_time, f"{open_:.2f}", f"{high:.2f}", f"{low:.2f}", f"{close:.2f}",
+            f"{volume:.4f}", open_time + interval_ms - 1]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoints
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        delay = self.server.delay_s
+        if delay:
+            time.sleep(delay)
+        url = urlparse(self.path)
+        qs = parse_qs(url.query)
+        if url.path.endswith("/klines"):
+            body = self._klines(qs)
+        elif url.path.endswith("/updates/price/latest"):
+            body = {"parsed": [{"id": feed, "price": {"price": "6543210000000", "expo": -8}}
+                               for feed in qs.get("ids[]", [PYTH_BTC_FEED])]}
+        else:
+            self.send_error(404)
+            return
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _klines(self, qs) -> list:
+        symbol = qs.get("symbol", ["BTCUSDT"])[0]
+        interval_ms = INTERVAL_MS.get(qs.get("interval", ["5m"])[0], 300_000)
+        limit = min(int(qs.get("limit", [500])[0]), 1000)
+        now_index = int(time.time() * 1000) // interval_ms  # the still-open candle
+        if "startTime" in qs:
+            first = -(-int(qs["startTime"][0]) // interval_ms)
+            last = min(now_index, first + limit - 1)
+        else:
+            last = now_index
+            first = last - limit + 1
+        return [synthetic_kline(symbol, interval_ms, i) for i in range(first, last + 1)]
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def start_stub_server(port: int = 0, delay_ms: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub on a background thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _StubHandler)
+    server.daemon_threads = True
+    server.delay_s = delay_ms / 1000.0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def stub_client(base_url: str, max_workers: int = 16) -> MarketDataClient:
+    return MarketDataClient(kline_url=f"{base_url}/api/v3/klines",
+                            pyth_url=f"{base_url}/v2/updates/price/latest",
+                            max_workers=max_workers)
+
+
+def bench(symbols: int, ticks: int, delay_ms: float, workers: int) -> List[float]:
+    """Tick latencies (seconds) for `symbols` markets per tick against an in-process stub."""
+    server, base = start_stub_server(delay_ms=delay_ms)
+    markets = [(f"SYM{i}USDT", "5m") for i in range(symbols)]
+    try:
+        with stub_client(base, max_workers=workers) as client:
+            return [client.fetch_tick(markets, limit=LOOKBACK_CANDLES).elapsed for _ in range(ticks)]
+    finally:
+        server.shutdown()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Local Binance/Pyth stub for MarketDataClient")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--delay-ms", type=float, default=0.0, help="artificial per-request latency")
+    ap.add_argument("--bench", action="store_true", help="run a tick-latency benchmark and exit")
+    ap.add_argument("--symbols", type=int, default=20)
+    ap.add_argument("--ticks", type=int, default=10)
+    ap.add_argument("--workers", type=int, default=16)
+    args = ap.parse_args()
+
+    if args.bench:
+        lat = sorted(bench(args.symbols, args.ticks, args.delay_ms, args.workers))
+        p95 = lat[min(len(lat) - 1, int(round(0.95 * (len(lat) - 1))))]
+        print(f"⏱️  {args.symbols} symbols + Pyth per tick, {args.ticks} ticks, "
+              f"{args.delay_ms:.0f}ms stub latency")
+        print(f"   p50: {statistics.median(lat) * 1000:.1f} ms | p95: {p95 * 1000:.1f} ms")
+        return 0
+
+    server, base = start_stub_server(args.port, args.delay_ms)
+    print(f"🧪 stub serving at {base} (Ctrl-C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,398 @@
+"""
+Alpha Oracle V6 — Multi-Timeframe Aggregation
+
+build_technical_snapshot only approximates higher timeframes by indexing
+back into the 5m closes (closes[-4] ≈ 15m, closes[-13] ≈ 1h). This module
+builds real 15m / 1h / 4h OHLCV bars from the 5m stream as each 5m candle
+closes, and keeps a full IncrementalIndicatorState per timeframe, so every
+indicator exists on every timeframe without a network fetch per interval.
+
+Per closed 5m candle the cost is constant: one state update on the base
+timeframe, one O(1) bucket fold per resampler, and one extra state update
+on each timeframe whose bar just completed.
+
+Decision paths: run_oracle_v6 and batch_oracle_v6 take their trend
+alignment from here when the market data client keeps an on-disk CandleStore
+(V6_CANDLE_CACHE_DIR); the store is backfilled to mtf_history_rows() base
+candles and store_trend_alignment folds only the candles closed since the
+previous tick. backtest_v6 / sweep_v6 get the same per-bar values from
+mtf_alignment_series in one vectorized pass. Without a store the live paths
+keep the 5m-offset approximation.
+
+Usage:
+    mtf = MultiTimeframeState.from_candles(store.load("BTCUSDT", "5m"))
+    ...
+    snap = mtf.update(new_closed_5m_candle)        # 5m snapshot, MTF alignment
+    htf = mtf.snapshots()["1h"]                     # full 1h TechnicalSnapshot
+"""
+
+import time
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from sim_engine_v6 import (
+    Candle,
+    CandleSeries,
+    DEFAULT_CONFIG,
+    IncrementalIndicatorState,
+    TechnicalSnapshot,
+    V6Config,
+    as_candle_series,
+    build_technical_snapshot_series,
+)
+
+DEFAULT_TIMEFRAMES = ("15m", "1h", "4h")
+
+_UNIT_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+# (timestamp, open, high, low, close, volume) — the CandleSeries row layout
+Bar = Tuple[float, float, float, float, float, float]
+
+
+def interval_ms(interval: str) -> int:
+    """Binance interval string ("5m", "1h", "4h", "1d", ...) → milliseconds."""
+    try:
+        return int(interval[:-1]) * _UNIT_MS[interval[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unsupported interval: {interval!r}") from None
+
+
+def higher_timeframes(base_interval: str,
+                      timeframes: Sequence[str] = DEFAULT_TIMEFRAMES) -> Tuple[str, ...]:
+    """The timeframes a base interval can be resampled into (whole multiples above it)."""
+    base = interval_ms(base_interval)
+    return tuple(tf for tf in timeframes
+                 if interval_ms(tf) > base and interval_ms(tf) % base == 0)
+
+
+def mtf_history_rows(base_interval: str = "5m",
+                     timeframes: Sequence[str] = DEFAULT_TIMEFRAMES,
+                     window: Optional[int] = None,
+                     config: Optional[V6Config] = None) -> int:
+    """
+    Base candles needed for every timeframe to fill its window: one spare
+    bucket of the slowest timeframe covers a leading partial bar (4800+96
+    5m candles for a 100-bar 4h window).
+    """
+    window = window or (config or DEFAULT_CONFIG).lookback_candles
+    base = interval_ms(base_interval)
+    ratio = max((interval_ms(tf) // base for tf in higher_timeframes(base_interval, timeframes)),
+                default=1)
+    return ratio * (window + 1)
+
+
+# ─────────────────────────────────────────────────────────────
+# §1. Incremental Resampler
+# ─────────────────────────────────────────────────────────────
+
+class CandleResampler:
+    """
+    Folds closed base candles into higher-timeframe bars.
+
+    Bars are bucketed by open time: a base candle opening at ts belongs to
+    the bar opening at floor(ts / target) × target, as Binance aligns its own
+    klines. A bar is emitted as soon as the last base candle of its bucket
+    closes, and only if every base candle of the bucket was seen: a leading
+    bucket the stream started in the middle of, or one with an exchange gap,
+    is dropped (counted in `dropped`) rather than passed off as a full bar.
+    """
+
+    __slots__ = ("source_ms", "target_ms", "dropped", "_bar", "_whole", "_next")
+
+    def __init__(self, source_interval: str, target_interval: str):
+        self.source_ms = interval_ms(source_interval)
+        self.target_ms = interval_ms(target_interval)
+        if self.target_ms <= self.source_ms or self.target_ms % self.source_ms:
+            raise ValueError(
+                f"{target_interval} is not a whole multiple of {source_interval}"
+            )
+        self.dropped = 0
+        self._bar: Optional[List[float]] = None
+        self._whole = False  # every base candle of the current bucket seen so far
+        self._next = 0.0  # open time of the base candle expected next
+
+    @property
+    def partial(self) -> Optional[Bar]:
+        """The still-forming bar, if any (not yet fed to indicators)."""
+        return tuple(self._bar) if self._bar is not None else None
+
+    def update(self, timestamp: float, open: float, high: float,
+               low: float, close: float, volume: float) -> List[Bar]:
+        """Fold one closed base candle; returns the bars it completed (usually none)."""
+        bucket = timestamp - timestamp % self.target_ms
+        done: List[Bar] = []
+        bar = self._bar
+        if bar is not None and bucket != bar[0]:
+            self.dropped += 1  # gap: previous bucket never saw its last candle
+            bar = None
+        if bar is None:
+            bar = [bucket, open, high, low, close, volume]
+            self._whole = timestamp == bucket
+        else:
+            self._whole = self._whole and timestamp == self._next
+            if high > bar[2]:
+                bar[2] = high
+            if low < bar[3]:
+                bar[3] = low
+            bar[4] = close
+            bar[5] += volume
+
+        self._next = timestamp + self.source_ms
+        if self._next >= bucket + self.target_ms:
+            if self._whole:
+                done.append(tuple(bar))
+            else:
+                self.dropped += 1
+            bar = None
+        self._bar = bar
+        return done
+
+
+def resample_candles(candles: Union[CandleSeries, List[Candle]],
+                     source_interval: str, target_interval: str) -> CandleSeries:
+    """
+    Resample a whole candle history into a CandleSeries, in one vectorized
+    pass with the CandleResampler rules: a bucket becomes a bar only if it
+    holds every base candle from its open time on, without a gap.
+    """
+    resampler = CandleResampler(source_interval, target_interval)
+    data = as_candle_series(candles).data
+    if len(data) == 0:
+        return CandleSeries.empty()
+    source, target = resampler.source_ms, resampler.target_ms
+    ts = data[:, 0]
+    bucket = ts - ts % target
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(ts)]
+    gaps = np.r_[0, np.cumsum(np.diff(ts) != source)]
+    whole = ((ends - starts == target // source) & (ts[starts] == bucket[starts])
+             & (gaps[ends - 1] == gaps[starts]))
+    if not whole.any():
+        return CandleSeries.empty()
+    bars = np.column_stack([
+        bucket[starts], data[starts, 1],
+        np.maximum.reduceat(data[:, 2], starts), np.minimum.reduceat(data[:, 3], starts),
+        data[ends - 1, 4], np.add.reduceat(data[:, 5], starts),
+    ])
+    return CandleSeries(np.ascontiguousarray(bars[whole]))
+
+
+# ─────────────────────────────────────────────────────────────
+# §2. Per-Timeframe Indicator State
+# ─────────────────────────────────────────────────────────────
+
+def timeframe_trend(snap: TechnicalSnapshot) -> float:
+    """
+    Trend vote of one timeframe from its own indicators: +1 when the fast
+    EMA is above the slow EMA and RSI is above 50, -1 for the mirror case,
+    0 when EMA and RSI disagree.
+    """
+    ema = np.sign(snap.ema_cross_signal)
+    rsi = np.sign(snap.rsi - 50.0)
+    return float(ema) if ema == rsi else 0.0
+
+
+def timeframe_trend_series(series: Dict[str, np.ndarray]) -> np.ndarray:
+    """timeframe_trend for every bar of a snapshot series (NaN where the series is)."""
+    ema = np.sign(series["ema_cross_signal"])
+    rsi = np.sign(series["rsi"] - 50.0)
+    return np.where(np.isnan(ema) | np.isnan(rsi), np.nan, np.where(ema == rsi, ema, 0.0))
+
+
+class MultiTimeframeState:
+    """
+    Incremental indicator state on the base interval plus every higher
+    timeframe, all driven by the base candle stream.
+
+    `snapshot()` is the base-interval snapshot. With `mtf_alignment=True`
+    (the default) its trend_alignment is replaced by the mean timeframe_trend
+    vote over the base and every higher timeframe that has a full window;
+    until none of them do, the 5m-offset approximation is kept. Pass
+    `mtf_alignment=False` to get exactly what build_technical_snapshot
+    returns.
+    """
+
+    def __init__(self, base_interval: str = "5m",
+                 timeframes: Sequence[str] = DEFAULT_TIMEFRAMES,
+                 window: Optional[int] = None,
+                 config: Optional[V6Config] = None,
+                 mtf_alignment: bool = True):
+        self.base_interval = base_interval
+        self.mtf_alignment = mtf_alignment
+        self.base = IncrementalIndicatorState(window, config)
+        self.resamplers: Dict[str, CandleResampler] = {
+            tf: CandleResampler(base_interval, tf) for tf in timeframes
+        }
+        self.states: Dict[str, IncrementalIndicatorState] = {
+            tf: IncrementalIndicatorState(window, config) for tf in timeframes
+        }
+
+    @classmethod
+    def from_candles(cls, candles: Union[CandleSeries, List[Candle]],
+                     base_interval: str = "5m",
+                     timeframes: Sequence[str] = DEFAULT_TIMEFRAMES,
+                     window: Optional[int] = None,
+                     config: Optional[V6Config] = None,
+                     mtf_alignment: bool = True) -> "MultiTimeframeState":
+        """
+        Warm every timeframe from a base-interval history. A 4h window of
+        100 bars needs 4800 5m candles (the on-disk CandleStore keeps them).
+        """
+        state = cls(base_interval, timeframes, window, config, mtf_alignment)
+        rows = candles.data.tolist() if isinstance(candles, CandleSeries) else [
+            (c.timestamp, c.open, c.high, c.low, c.close, c.volume) for c in candles]
+        for row in rows:
+            state._fold(*row)
+        return state
+
+    @property
+    def ready(self) -> bool:
+        return self.base.ready
+
+    def update(self, candle: Candle) -> Optional[TechnicalSnapshot]:
+        """Fold one closed base candle into every timeframe; returns snapshot()."""
+        return self.update_values(candle.timestamp, candle.open, candle.high,
+                                  candle.low, candle.close, candle.volume)
+
+    def update_values(self, timestamp: float, open: float, high: float,
+                      low: float, close: float, volume: float) -> Optional[TechnicalSnapshot]:
+        """update() for a raw OHLCV row."""
+        self._fold(timestamp, open, high, low, close, volume)
+        return self.snapshot()
+
+    def _fold(self, *row: float) -> None:
+        self.base.update_values(*row)
+        for tf, resampler in self.resamplers.items():
+            for bar in resampler.update(*row):
+                self.states[tf].update_values(*bar)
+
+    def snapshots(self) -> Dict[str, Optional[TechnicalSnapshot]]:
+        """Full TechnicalSnapshot per timeframe (None until its window is full)."""
+        out = {self.base_interval: self.base.snapshot()}
+        out.update((tf, state.snapshot()) for tf, state in self.states.items())
+        return out
+
+    def trend_alignment(self) -> Optional[float]:
+        """Mean timeframe_trend vote over the ready timeframes (None if no HTF is ready)."""
+        base = self.base.snapshot()
+        htf = [s for s in (state.snapshot() for state in self.states.values()) if s is not None]
+        if base is None or not htf:
+            return None
+        votes = [timeframe_trend(base)] + [timeframe_trend(s) for s in htf]
+        return round(sum(votes) / len(votes), 4)
+
+    def snapshot(self) -> Optional[TechnicalSnapshot]:
+        """Base-interval snapshot, with MTF trend alignment when enabled and available."""
+        snap = self.base.snapshot()
+        if snap is None or not self.mtf_alignment:
+            return snap
+        alignment = self.trend_alignment()
+        return snap if alignment is None else replace(snap, trend_alignment=alignment)
+
+    def sync(self, candles: CandleSeries, now_ms: Optional[float] = None) -> int:
+        """
+        Fold the candles of `candles` newer than the last one folded, up to
+        the last closed one (a still-open last candle is left for the next
+        sync). The first sync starts only as far back as the slowest
+        timeframe's window needs. Returns how many were folded.
+        """
+        if len(candles) == 0:
+            return 0
+        ts = candles.timestamp
+        last = self.base.last_timestamp
+        now_ms = time.time() * 1000 if now_ms is None else now_ms
+        end = len(ts)
+        if ts[-1] + interval_ms(self.base_interval) > now_ms:
+            end -= 1
+        if last is None:
+            window = max([self.base.window] + [st.window for st in self.states.values()])
+            start = max(end - mtf_history_rows(self.base_interval, tuple(self.resamplers), window), 0)
+        else:
+            start = int(np.searchsorted(ts, last, side="right"))
+        for row in candles.data[start:end].tolist():
+            self._fold(*row)
+        return max(end - start, 0)
+
+
+# ─────────────────────────────────────────────────────────────
+# §3. Decision-Path Hook
+# ─────────────────────────────────────────────────────────────
+
+_store_states: Dict[Tuple, MultiTimeframeState] = {}
+
+
+def store_trend_alignment(store, symbol: str = "BTCUSDT", base_interval: str = "5m",
+                          config: Optional[V6Config] = None) -> Optional[float]:
+    """
+    MTF trend alignment from the base-interval history in a CandleStore
+    (None until a higher timeframe has a full window). The state is kept per
+    process, so each call folds only the candles closed since the last one.
+    """
+    cfg = config or DEFAULT_CONFIG
+    timeframes = higher_timeframes(base_interval)
+    if not timeframes:
+        return None
+    key = (str(store.root), symbol, base_interval, cfg.indicator_key())
+    state = _store_states.get(key)
+    if state is None:
+        state = _store_states[key] = MultiTimeframeState(base_interval, timeframes, config=cfg)
+    state.sync(store.load(symbol, base_interval))
+    return state.trend_alignment()
+
+
+# ─────────────────────────────────────────────────────────────
+# §4. Replay Series (backtest / sweep)
+# ─────────────────────────────────────────────────────────────
+
+def mtf_alignment_series(candles: Union[CandleSeries, List[Candle]],
+                         base_interval: str = "5m",
+                         timeframes: Sequence[str] = DEFAULT_TIMEFRAMES,
+                         window: Optional[int] = None,
+                         config: Optional[V6Config] = None,
+                         base: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+    """
+    MultiTimeframeState.trend_alignment() after every base candle of a
+    history, vectorized: each timeframe's snapshot series is computed once
+    on its resampled bars, and bar t sees the last higher-timeframe bar
+    completed by its close. NaN where no higher timeframe is ready yet.
+
+    `base` may pass the base-interval snapshot series if already computed.
+    """
+    cfg = config or DEFAULT_CONFIG
+    window = window or cfg.lookback_candles
+    candles = as_candle_series(candles)
+    if base is None:
+        base = build_technical_snapshot_series(candles, window, cfg)
+    total = timeframe_trend_series(base)
+    count = np.ones(len(candles))
+    any_ready = np.zeros(len(candles), dtype=bool)
+    ts = candles.timestamp
+    source = interval_ms(base_interval)
+    for tf in higher_timeframes(base_interval, timeframes):
+        bars = resample_candles(candles, base_interval, tf)
+        if len(bars) < window:
+            continue
+        vote = timeframe_trend_series(build_technical_snapshot_series(bars, window, cfg))
+        # A bar is folded with its last base candle, which opens target - source after it
+        seen = np.searchsorted(bars.timestamp + (interval_ms(tf) - source), ts, side="right") - 1
+        vote = np.where(seen >= 0, vote[np.maximum(seen, 0)], np.nan)
+        ready = ~np.isnan(vote)
+        total = total + np.where(ready, vote, 0.0)
+        count += ready
+        any_ready |= ready
+    return np.where(any_ready, np.round(total / count, 4), np.nan)
+
+
+def with_mtf_alignment(series: Dict[str, np.ndarray],
+                       candles: Union[CandleSeries, List[Candle]],
+                       base_interval: str = "5m",
+                       config: Optional[V6Config] = None) -> Dict[str, np.ndarray]:
+    """
+    A copy of a snapshot series whose trend_alignment is the MTF one
+    wherever a higher timeframe is ready (the approximation elsewhere).
+    """
+    alignment = mtf_alignment_series(candles, base_interval, config=config, base=series)
+    trend = np.asarray(series["trend_alignment"], dtype=np.float64)
+    return dict(series, trend_alignment=np.where(np.isnan(alignment), trend, alignment))
@@ -44,12 +44,21 @@ Gemini 제안: P(TTX|↑)·Ω_V5 / [P(TTX|↑)·Ω_V5 + P(TTX|↓)·(1-Ω_V5)]
 """
 
 import os
+import json
 import math
+from bisect import bisect_left, insort
+import tempfile
+import threading
+import time
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Tuple, NamedTuple
-from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional, Dict, Iterator, List, Sequence, Tuple, NamedTuple, Union
+from dataclasses import dataclass, field, replace
 from dotenv import load_dotenv
 
 # ─────────────────────────────────────────────────────────────
@@ -60,6 +69,7 @@ load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "../.env"))
 
 PYTH_BTC_FEED = "e62df6c8b4a85fe1a67db44dc12de5db330f7ac66b72dc658afedf0f4a415b43"
 BINANCE_KLINE_URL = "https://api.binance.com/api/v3/klines"
+PYTH_PRICE_URL = "https://hermes.pyth.network/v2/updates/price/latest"
 COINGECKO_URL = "https://api.coingecko.com/api/v3"
 
 # Strategy parameters (tunable)
@@ -71,6 +81,52 @@ BOLLINGER_STD = 2.0
 EMA_FAST = 8
 EMA_SLOW = 21
 LOOKBACK_CANDLES = 100  # Minimum candles needed for all indicators
+KLINE_PAGE_LIMIT = 1000  # Binance max rows per kline request
+
+
+@dataclass(frozen=True)
+class V6Config:
+    """
+    Every tunable of the V6 pipeline in one immutable object.
+
+    The module-level constants above remain the defaults; pass a V6Config
+    (e.g. `dataclasses.replace(DEFAULT_CONFIG, rsi_period=10)`) to run the
+    pipeline with other values without touching globals — which is what
+    makes parallel parameter sweeps safe.
+    """
+    # Indicator periods
+    rsi_period: int = RSI_PERIOD
+    atr_period: int = ATR_PERIOD
+    volume_ma_period: int = VOLUME_MA_PERIOD
+    bollinger_period: int = BOLLINGER_PERIOD
+    bollinger_std: float = BOLLINGER_STD
+    ema_fast: int = EMA_FAST
+    ema_slow: int = EMA_SLOW
+    lookback_candles: int = LOOKBACK_CANDLES
+
+    # Regime detection (V6 Aggressive Tuning values)
+    trend_alignment_min: float = 0.5      # |alignment| above this = trending
+    trend_rsi_low: float = 30.0           # trending only while RSI inside (low, high)
+    trend_rsi_high: float = 70.0
+    volatile_atr_pct: float = 0.5         # ATR% per candle above this = volatile
+    extreme_rsi_low: float = 25.0
+    extreme_rsi_high: float = 75.0
+    volatile_strength_atr_pct: float = 1.0  # ATR% that maps to strength 1.0
+    threshold_volatile_extreme: float = 0.85
+    threshold_trending: float = 0.68
+    threshold_volatile: float = 0.82
+    threshold_ranging: float = 0.75
+
+    def indicator_key(self) -> Tuple:
+        """Values that change indicators (snapshots can be reused across the rest)."""
+        return tuple(getattr(self, name) for name in V6_INDICATOR_FIELDS)
+
+
+V6_INDICATOR_FIELDS = ("rsi_period", "atr_period", "volume_ma_period", "bollinger_period",
+                       "bollinger_std", "ema_fast", "ema_slow", "lookback_candles")
+
+
+DEFAULT_CONFIG = V6Config()
 
 
 # ─────────────────────────────────────────────────────────────
@@ -87,6 +143,115 @@ class Candle:
     volume: float
 
 
+CANDLE_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+
+class CandleSeries:
+    """
+    Columnar OHLCV history backed by one contiguous (n, 6) float64 block.
+
+    Each candle is one contiguous row, so slicing/windowing is a zero-copy
+    view and the block can be written to or mapped from disk as-is. Columns
+    (`.close`, `.volume`, ...) are views into the block, never copies.
+
+    Behaves like a read-only List[Candle] (len, indexing, iteration) so code
+    written against the old list keeps working, and every indicator function
+    accepts it directly.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: np.ndarray):
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[1] != len(CANDLE_FIELDS):
+            raise ValueError(f"CandleSeries needs an (n, {len(CANDLE_FIELDS)}) array, got {data.shape}")
+        self.data = data
+
+    @classmethod
+    def empty(cls) -> "CandleSeries":
+        return cls(np.empty((0, len(CANDLE_FIELDS))))
+
+    @classmethod
+    def from_klines(cls, raw: list) -> "CandleSeries":
+        """Parse Binance kline rows ([open_time, "o", "h", "l", "c", "v", ...]) in one pass."""
+        if not raw:
+            return cls.empty()
+        return cls(np.array([k[:6] for k in raw], dtype=np.float64))
+
+    @classmethod
+    def from_candles(cls, candles: List[Candle]) -> "CandleSeries":
+        if not candles:
+            return cls.empty()
+        return cls(np.array([(c.timestamp, c.open, c.high, c.low, c.close, c.volume)
+                             for c in candles], dtype=np.float64))
+
+    @classmethod
+    def from_arrays(cls, timestamp, open, high, low, close, volume) -> "CandleSeries":
+        return cls(np.column_stack([timestamp, open, high, low, close, volume]).astype(np.float64))
+
+    # ── Column views ──
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self.data[:, 0]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.data[:, 1]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.data[:, 2]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.data[:, 3]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.data[:, 4]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.data[:, 5]
+
+    # ── Sequence protocol ──
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return CandleSeries(self.data[idx])
+        return Candle(*self.data[idx].tolist())
+
+    def __iter__(self) -> Iterator[Candle]:
+        for row in self.data.tolist():
+            yield Candle(*row)
+
+    def window(self, n: int, end: Optional[int] = None) -> "CandleSeries":
+        """Zero-copy view of the `n` candles ending just before index `end` (default: latest)."""
+        stop = len(self) if end is None else end
+        return CandleSeries(self.data[max(0, stop - n):stop])
+
+    def to_candles(self) -> List[Candle]:
+        return list(self)
+
+
+def as_candle_series(candles: Union[CandleSeries, List[Candle]]) -> CandleSeries:
+    """Accept either representation; lists are converted once."""
+    if isinstance(candles, CandleSeries):
+        return candles
+    return CandleSeries.from_candles(candles)
+
+
+def _column(values, name: str) -> np.ndarray:
+    """Let indicator functions take a CandleSeries in place of a raw array."""
+    if isinstance(values, CandleSeries):
+        return getattr(values, name)
+    return values
+
+
 @dataclass
 class TechnicalSnapshot:
     """All computed indicators at a single point in time."""
@@ -136,11 +301,12 @@ class TradeSignal:
 # §2. Real-Time Data Acquisition (하드코딩 완전 제거)
 # ─────────────────────────────────────────────────────────────
 
-def fetch_pyth_price() -> float:
+def fetch_pyth_price(feed_id: str = PYTH_BTC_FEED,
+                     session: Optional[requests.Session] = None,
+                     url: str = PYTH_PRICE_URL) -> float:
     """Fetch latest BTC/USD from Pyth Network oracle."""
     try:
-        url = f"https://hermes.pyth.network/v2/updates/price/latest?ids[]={PYTH_BTC_FEED}"
-        res = requests.get(url, timeout=5)
+        res = (session or requests).get(url, params={"ids[]": feed_id}, timeout=5)
         data = res.json()
         pd = data['parsed'][0]['price']
         return round(float(pd['price']) * (10 ** pd['expo']), 2)
@@ -150,30 +316,186 @@ def fetch_pyth_price() -> float:
 
 
 def fetch_binance_klines(symbol: str = "BTCUSDT", interval: str = "5m",
-                          limit: int = LOOKBACK_CANDLES) -> List[Candle]:
+                          limit: int = LOOKBACK_CANDLES,
+                          session: Optional[requests.Session] = None,
+                          url: str = BINANCE_KLINE_URL,
+                          store=None) -> CandleSeries:
     """
     Fetch real OHLCV candle data from Binance public API.
     This replaces ALL hardcoded values with live market data.
+    The JSON rows are parsed straight into a columnar CandleSeries.
+
+    With a `store` (engine/candle_cache.CandleStore), only candles from the
+    last stored open time onward are requested and merged into the store,
+    and the latest `limit` candles are served from its memory map.
     """
+    if store is not None:
+        return _sync_klines(store, symbol, interval, limit, session, url)
     try:
         params = {"symbol": symbol, "interval": interval, "limit": limit}
-        res = requests.get(BINANCE_KLINE_URL, params=params, timeout=10)
-        raw = res.json()
-
-        candles = []
-        for k in raw:
-            candles.append(Candle(
-                timestamp=float(k[0]),
-                open=float(k[1]),
-                high=float(k[2]),
-                low=float(k[3]),
-                close=float(k[4]),
-                volume=float(k[5])
-            ))
-        return candles
+        res = (session or requests).get(url, params=params, timeout=10)
+        return CandleSeries.from_klines(res.json())
     except Exception as e:
         print(f"⚠️ Binance kline fetch error: {e}")
-        return []
+        return CandleSeries.empty()
+
+
+def _sync_klines(store, symbol: str, interval: str, limit: int,
+                 session: Optional[requests.Session], url: str) -> CandleSeries:
+    """Incremental kline sync against a local CandleStore."""
+    http = session or requests
+    last_ts = store.last_timestamp(symbol, interval)
+    try:
+        if last_ts is None:
+            # Cold start: one normal fetch seeds the store
+            params = {"symbol": symbol, "interval": interval, "limit": limit}
+            res = http.get(url, params=params, timeout=10)
+            store.merge(symbol, interval, CandleSeries.from_klines(res.json()))
+        else:
+            # Warm: re-fetch the (possibly still open) last candle and anything newer,
+            # paging forward if we were offline for a long time
+            while True:
+                params = {"symbol": symbol, "interval": interval,
+                          "startTime": int(last_ts), "limit": KLINE_PAGE_LIMIT}
+                res = http.get(url, params=params, timeout=10)
+                page = CandleSeries.from_klines(res.json())
+                store.merge(symbol, interval, page)
+                if len(page) < KLINE_PAGE_LIMIT:
+                    break
+                last_ts = page.timestamp[-1]
+        backfill_klines(store, symbol, interval, limit, session, url)
+    except Exception as e:
+        print(f"⚠️ Binance kline sync error (serving cached candles): {e}")
+    return store.load(symbol, interval).window(limit)
+
+
+def backfill_klines(store, symbol: str, interval: str, rows: int,
+                    session: Optional[requests.Session] = None,
+                    url: str = BINANCE_KLINE_URL) -> int:
+    """
+    Page back (endTime before the first stored candle) until the store
+    holds at least `rows` candles or Binance has nothing older; returns the
+    number of stored candles.
+    """
+    http = session or requests
+    have = store.load(symbol, interval)
+    while 0 < len(have) < rows:
+        params = {"symbol": symbol, "interval": interval, "endTime": int(have.timestamp[0]) - 1,
+                  "limit": min(KLINE_PAGE_LIMIT, rows - len(have))}
+        page = CandleSeries.from_klines(http.get(url, params=params, timeout=10).json())
+        if not store.prepend(symbol, interval, page):
+            break  # no older history
+        have = store.load(symbol, interval)
+    return len(have)
+
+
+@dataclass
+class MarketTick:
+    """Everything fetched for one polling tick."""
+    candles: Dict[Tuple[str, str], CandleSeries]   # (symbol, interval) → candles
+    prices: Dict[str, float]                       # Pyth feed id → price
+    elapsed: float                                 # wall-clock seconds for the tick
+
+
+class MarketDataClient:
+    """
+    Pooled, concurrent market-data layer.
+
+    One keep-alive requests.Session (connection pool sized to the worker
+    count) is shared by every request, so a tick pays at most one TLS
+    handshake per host instead of one per call. fetch_tick() issues all
+    kline and Pyth requests of a tick at once on a thread pool, so tick
+    latency is the slowest single request rather than the sum.
+
+    Base URLs are overridable so the client can be pointed at a local stub
+    server (see engine/market_stub_server.py) for end-to-end latency tests.
+    """
+
+    def __init__(self, kline_url: str = BINANCE_KLINE_URL,
+                 pyth_url: str = PYTH_PRICE_URL,
+                 max_workers: int = 16,
+                 session: Optional[requests.Session] = None,
+                 store=None):
+        self.kline_url = kline_url
+        self.pyth_url = pyth_url
+        self.store = store  # optional CandleStore for incremental kline sync
+        self.session = session or requests.Session()
+        if session is None:
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="v6-fetch")
+
+    def fetch_klines(self, symbol: str = "BTCUSDT", interval: str = "5m",
+                     limit: int = LOOKBACK_CANDLES) -> CandleSeries:
+        return fetch_binance_klines(symbol, interval, limit, session=self.session,
+                                    url=self.kline_url, store=self.store)
+
+    def fetch_pyth_price(self, feed_id: str = PYTH_BTC_FEED) -> float:
+        return fetch_pyth_price(feed_id, session=self.session, url=self.pyth_url)
+
+    def backfill(self, history: Dict[Tuple[str, str], int]) -> Dict[Tuple[str, str], int]:
+        """
+        Extend the store's history of every (symbol, interval) back to the
+        given number of candles, concurrently; returns the stored counts.
+        A no-op without a store (or for a market the store has not seen yet).
+        """
+        if self.store is None:
+            return {}
+        futs = {m: self._pool.submit(self._backfill_one, m[0], m[1], rows)
+                for m, rows in history.items()}
+        return {m: fut.result() for m, fut in futs.items()}
+
+    def _backfill_one(self, symbol: str, interval: str, rows: int) -> int:
+        try:
+            return backfill_klines(self.store, symbol, interval, rows,
+                                   session=self.session, url=self.kline_url)
+        except Exception as e:
+            print(f"⚠️ Binance kline backfill error ({symbol} {interval}): {e}")
+            return len(self.store.load(symbol, interval))
+
+    def fetch_tick(self, markets: Sequence[Tuple[str, str]] = (("BTCUSDT", "5m"),),
+                   limit: int = LOOKBACK_CANDLES,
+                   pyth_feeds: Sequence[str] = (PYTH_BTC_FEED,)) -> MarketTick:
+        """Fetch klines for every (symbol, interval) plus Pyth prices concurrently."""
+        start = time.perf_counter()
+        kline_futs = {m: self._pool.submit(self.fetch_klines, m[0], m[1], limit)
+                      for m in dict.fromkeys(markets)}
+        price_futs = {f: self._pool.submit(self.fetch_pyth_price, f) for f in dict.fromkeys(pyth_feeds)}
+        return MarketTick(
+            candles={m: fut.result() for m, fut in kline_futs.items()},
+            prices={f: fut.result() for f, fut in price_futs.items()},
+            elapsed=time.perf_counter() - start,
+        )
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self) -> "MarketDataClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_default_client: Optional[MarketDataClient] = None
+
+
+def get_market_data_client() -> MarketDataClient:
+    """
+    Process-wide client, so repeated run_oracle_v6() ticks reuse warm connections.
+    Set V6_CANDLE_CACHE_DIR to also keep an on-disk candle store.
+    """
+    global _default_client
+    if _default_client is None:
+        store = None
+        cache_dir = os.environ.get("V6_CANDLE_CACHE_DIR")
+        if cache_dir:
+            from candle_cache import CandleStore
+            store = CandleStore(cache_dir)
+        _default_client = MarketDataClient(store=store)
+    return _default_client
 
 
 # ─────────────────────────────────────────────────────────────
@@ -182,6 +504,7 @@ def fetch_binance_klines(symbol: str = "BTCUSDT", interval: str = "5m",
 
 def compute_rsi(closes: np.ndarray, period: int = RSI_PERIOD) -> float:
     """Wilder's RSI — the standard, not SMA-based approximation."""
+    closes = _column(closes, "close")
     if len(closes) < period + 1:
         return 50.0  # Neutral fallback
 
@@ -203,17 +526,13 @@ def compute_rsi(closes: np.ndarray, period: int = RSI_PERIOD) -> float:
     return round(100.0 - (100.0 / (1.0 + rs)), 2)
 
 
-def compute_atr(candles: List[Candle], period: int = ATR_PERIOD) -> float:
+def compute_atr(candles: Union[CandleSeries, List[Candle]], period: int = ATR_PERIOD) -> float:
     """Average True Range — measures real volatility including gaps."""
     if len(candles) < period + 1:
         return 0.0
 
-    trs = []
-    for i in range(1, len(candles)):
-        c = candles[i]
-        prev_close = candles[i - 1].close
-        tr = max(c.high - c.low, abs(c.high - prev_close), abs(c.low - prev_close))
-        trs.append(tr)
+    series = as_candle_series(candles)
+    trs = true_range_series(series.high, series.low, series.close)
 
     # Wilder's smoothing for ATR
     atr = np.mean(trs[:period])
@@ -224,6 +543,7 @@ def compute_atr(candles: List[Candle], period: int = ATR_PERIOD) -> float:
 
 def compute_ema(values: np.ndarray, period: int) -> np.ndarray:
     """Exponential Moving Average."""
+    values = _column(values, "close")
     ema = np.zeros_like(values)
     ema[0] = values[0]
     multiplier = 2.0 / (period + 1)
@@ -240,6 +560,7 @@ def compute_bollinger_position(closes: np.ndarray,
     -1 = at lower band, 0 = at SMA, +1 = at upper band.
     Values beyond ±1 indicate breakout.
     """
+    closes = _column(closes, "close")
     if len(closes) < period:
         return 0.0
 
@@ -258,6 +579,7 @@ def compute_bollinger_position(closes: np.ndarray,
 def compute_volume_ratio(volumes: np.ndarray,
                           period: int = VOLUME_MA_PERIOD) -> float:
     """Current volume vs moving average. >1 = above average activity."""
+    volumes = _column(volumes, "volume")
     if len(volumes) < period + 1:
         return 1.0
     vol_ma = np.mean(volumes[-(period + 1):-1])  # Exclude current candle from MA
@@ -266,37 +588,257 @@ def compute_volume_ratio(volumes: np.ndarray,
     return round(volumes[-1] / vol_ma, 4)
 
 
+# ─────────────────────────────────────────────────────────────
+# §3b. Vectorized Series Kernels (full history in one NumPy pass)
+# ─────────────────────────────────────────────────────────────
+# Each *_series function returns the indicator for EVERY bar, matching the
+# scalar §3 function evaluated on the history up to that bar:
+#
+#     compute_rsi_series(closes)[t] == compute_rsi(closes[:t + 1])
+#
+# With `window=W`, bar t instead sees only its trailing W values, i.e. the
+# same result as the scalar function on closes[t - W + 1:t + 1] (which is
+# what the live 100-candle fetch does). All kernels work along the last
+# axis, so a (symbols × bars) array is handled in the same pass.
+
+_SERIES_BLOCK = 4096
+
+
+def _exp_filter(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Recursive filter E[t] = (1-α)·E[t-1] + α·x[t] with E[-1] = 0, along the
+    last axis. Solved in closed form per block as (1-α)^j · cumsum(x·(1-α)^-j),
+    with blocks short enough that (1-α)^-j stays far from overflow.
+    """
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        return alpha * x
+    out = np.empty_like(x)
+    n = x.shape[-1]
+    block = max(1, int(200.0 / -math.log(decay)))
+    carry = np.zeros(x.shape[:-1])
+    for start in range(0, n, block):
+        seg = x[..., start:start + block]
+        powers = decay ** np.arange(seg.shape[-1])
+        acc = alpha * np.cumsum(seg / powers, axis=-1)
+        out[..., start:start + seg.shape[-1]] = powers * (acc + decay * carry[..., None])
+        carry = out[..., start + seg.shape[-1] - 1]
+    return out
+
+
+def _rolling_sums(x: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling sum and sum of squares of deviations over `period` values,
+    aligned to the window's last index (NaN before the first full window).
+
+    Cumulative sums are taken per block around a local pivot, so error stays
+    proportional to the window contents rather than to the running total.
+    Returns (sum(x), sum((x - mean)²)) per window.
+    """
+    n = x.shape[-1]
+    s1 = np.full(x.shape, np.nan)
+    m2 = np.full(x.shape, np.nan)
+    zeros = np.zeros(x.shape[:-1] + (1,))
+    for start in range(period - 1, n, _SERIES_BLOCK):
+        stop = min(start + _SERIES_BLOCK, n)
+        seg = x[..., start - period + 1:stop]
+        pivot = seg.mean(axis=-1, keepdims=True)
+        d = seg - pivot
+        c1 = np.concatenate([zeros, np.cumsum(d, axis=-1)], axis=-1)
+        c2 = np.concatenate([zeros, np.cumsum(d * d, axis=-1)], axis=-1)
+        w1 = c1[..., period:] - c1[..., :-period]
+        w2 = c2[..., period:] - c2[..., :-period]
+        s1[..., start:stop] = w1 + period * pivot
+        m2[..., start:stop] = np.maximum(w2 - w1 * w1 / period, 0.0)
+    return s1, m2
+
+
+def _seeded_smoother(x: np.ndarray, alpha: float, seed_len: int,
+                     window: Optional[int] = None) -> np.ndarray:
+    """
+    Vectorized form of the seeded recursion used by Wilder's RSI/ATR and
+    compute_ema: seed = mean(first seed_len values), then y = y·(1-α) + α·x.
+
+    Result at t covers x[:t+1] (or its trailing `window` values); NaN for
+    t < seed_len - 1. For a full window starting at a = t - W + 1:
+
+        y[t] = (1-α)^K · mean(x[a:a+s]) + (E[t] - (1-α)^K · E[t-K]),  K = W - s
+
+    where E is the unseeded _exp_filter of x.
+    """
+    n = x.shape[-1]
+    out = np.full(x.shape, np.nan)
+    if n < seed_len:
+        return out
+    decay = 1.0 - alpha
+
+    # Expanding history: seed from the first seed_len values
+    z = x.copy()
+    z[..., :seed_len] = 0.0
+    tail = _exp_filter(z, alpha)
+    steps = np.arange(n - seed_len + 1)
+    seed0 = x[..., :seed_len].mean(axis=-1, keepdims=True)
+    out[..., seed_len - 1:] = decay ** steps * seed0 + tail[..., seed_len - 1:]
+
+    # Sliding window: re-seed from each window's own first seed_len values
+    if window is not None and n >= window:
+        k = window - seed_len
+        full = _exp_filter(x, alpha)
+        ends = np.arange(window - 1, n)
+        if seed_len == 1:
+            seed = x[..., ends - window + 1]
+        else:
+            seed = _rolling_sums(x, seed_len)[0][..., ends - k] / seed_len
+        out[..., window - 1:] = decay ** k * seed + (full[..., ends] - decay ** k * full[..., ends - k])
+    return out
+
+
+def compute_rsi_series(closes: np.ndarray, period: int = RSI_PERIOD,
+                       window: Optional[int] = None) -> np.ndarray:
+    """Wilder's RSI for every bar (vectorized compute_rsi)."""
+    closes = np.asarray(_column(closes, "close"), dtype=np.float64)
+    out = np.full(closes.shape, 50.0)  # Neutral fallback
+    if closes.shape[-1] < period + 1:
+        return out
+
+    deltas = np.diff(closes, axis=-1)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    delta_window = None if window is None else window - 1
+    avg_gain = _seeded_smoother(gains, 1.0 / period, period, delta_window)[..., period - 1:]
+    avg_loss = _seeded_smoother(losses, 1.0 / period, period, delta_window)[..., period - 1:]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+    out[..., period:] = np.round(rsi, 2)
+    return out
+
+
+def true_range_series(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    """True Range from shifted arrays; element i is the TR of bar i + 1."""
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    closes = np.asarray(closes, dtype=np.float64)
+    h, l, prev_close = highs[..., 1:], lows[..., 1:], closes[..., :-1]
+    return np.maximum(h - l, np.maximum(np.abs(h - prev_close), np.abs(l - prev_close)))
+
+
+def compute_atr_series(highs: np.ndarray, lows: Optional[np.ndarray] = None,
+                       closes: Optional[np.ndarray] = None,
+                       period: int = ATR_PERIOD,
+                       window: Optional[int] = None) -> np.ndarray:
+    """
+    Average True Range for every bar (vectorized compute_atr).
+    A CandleSeries may be passed as `highs` with lows/closes omitted.
+    """
+    if isinstance(highs, CandleSeries):
+        highs, lows, closes = highs.high, highs.low, highs.close
+    closes = np.asarray(closes, dtype=np.float64)
+    out = np.zeros(closes.shape)
+    if closes.shape[-1] < period + 1:
+        return out
+
+    trs = true_range_series(highs, lows, closes)
+    tr_window = None if window is None else window - 1
+    atr = _seeded_smoother(trs, 1.0 / period, period, tr_window)
+    out[..., period:] = np.round(atr[..., period - 1:], 2)
+    return out
+
+
+def compute_ema_series(values: np.ndarray, period: int,
+                       window: Optional[int] = None) -> np.ndarray:
+    """
+    EMA for every bar without the Python loop. With window=None this is
+    exactly compute_ema(values).
+    """
+    values = np.asarray(_column(values, "close"), dtype=np.float64)
+    if values.shape[-1] == 0:
+        return values.copy()
+    return _seeded_smoother(values, 2.0 / (period + 1), 1, window)
+
+
+def compute_bollinger_position_series(closes: np.ndarray,
+                                      period: int = BOLLINGER_PERIOD,
+                                      num_std: float = BOLLINGER_STD) -> np.ndarray:
+    """Bollinger position for every bar (rolling std via cumulative sums)."""
+    closes = np.asarray(_column(closes, "close"), dtype=np.float64)
+    out = np.zeros(closes.shape)
+    if closes.shape[-1] < period:
+        return out
+
+    s1, m2 = _rolling_sums(closes, period)
+    sma = s1[..., period - 1:] / period
+    std = np.sqrt(m2[..., period - 1:] / (period - 1))
+    half_width = num_std * std
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pos = np.where(half_width > 0, (closes[..., period - 1:] - sma) / half_width, 0.0)
+    out[..., period - 1:] = np.round(pos, 4)
+    return out
+
+
+def compute_volume_ratio_series(volumes: np.ndarray,
+                                period: int = VOLUME_MA_PERIOD) -> np.ndarray:
+    """Volume ratio for every bar; the MA excludes the current candle."""
+    volumes = np.asarray(_column(volumes, "volume"), dtype=np.float64)
+    out = np.ones(volumes.shape)
+    if volumes.shape[-1] < period + 1:
+        return out
+
+    vol_ma = _rolling_sums(volumes, period)[0][..., period - 1:-1] / period
+    # The pivoted sums leave float residue over an all-zero window; count zeros exactly
+    nonzero = np.cumsum(volumes != 0, axis=-1)
+    nonzero = np.concatenate([np.zeros(nonzero.shape[:-1] + (1,), dtype=nonzero.dtype), nonzero], axis=-1)
+    empty = (nonzero[..., period:-1] - nonzero[..., :-period - 1]) == 0
+    current = volumes[..., period:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(empty | (vol_ma == 0), 1.0, current / vol_ma)
+    out[..., period:] = np.round(ratio, 4)
+    return out
+
+
 # ─────────────────────────────────────────────────────────────
 # §4. Multi-Timeframe Technical Snapshot Builder
 # ─────────────────────────────────────────────────────────────
 
-def build_technical_snapshot(candles: List[Candle]) -> Optional[TechnicalSnapshot]:
+def build_technical_snapshot(candles: Union[CandleSeries, List[Candle]],
+                             config: Optional[V6Config] = None) -> Optional[TechnicalSnapshot]:
     """
     Compute ALL technical indicators from raw candle data.
     This is where hardcoded RSI=55.4 dies.
     """
-    if len(candles) < LOOKBACK_CANDLES:
-        print(f"⚠️ Insufficient candles: {len(candles)}/{LOOKBACK_CANDLES}")
+    cfg = config or DEFAULT_CONFIG
+    if len(candles) < cfg.lookback_candles:
+        print(f"⚠️ Insufficient candles: {len(candles)}/{cfg.lookback_candles}")
         return None
 
-    closes = np.array([c.close for c in candles])
-    volumes = np.array([c.volume for c in candles])
-    current_price = closes[-1]
+    series = as_candle_series(candles)
+    closes = series.close
+    volumes = series.volume
 
     # Core indicators
-    rsi = compute_rsi(closes)
-    atr = compute_atr(candles)
-    atr_pct = round((atr / current_price) * 100, 4) if current_price > 0 else 0
-    vol_ratio = compute_volume_ratio(volumes)
-    bb_pos = compute_bollinger_position(closes)
+    rsi = compute_rsi(closes, cfg.rsi_period)
+    atr = compute_atr(series, cfg.atr_period)
+    vol_ratio = compute_volume_ratio(volumes, cfg.volume_ma_period)
+    bb_pos = compute_bollinger_position(closes, cfg.bollinger_period, cfg.bollinger_std)
 
     # EMA cross signal: normalized distance between fast and slow EMA
-    ema_fast = compute_ema(closes, EMA_FAST)
-    ema_slow = compute_ema(closes, EMA_SLOW)
-    ema_diff = ema_fast[-1] - ema_slow[-1]
+    ema_fast = compute_ema(closes, cfg.ema_fast)
+    ema_slow = compute_ema(closes, cfg.ema_slow)
+
+    return _finish_snapshot(closes, rsi, atr, vol_ratio, ema_fast[-1] - ema_slow[-1])
+
+
+def _finish_snapshot(closes, rsi: float, atr: float, vol_ratio: float,
+                     ema_diff: float) -> TechnicalSnapshot:
+    """
+    Shared tail of the snapshot builders: EMA signal, momentum and alignment.
+    `closes` only needs to support negative indexing back to [-13].
+    """
+    current_price = closes[-1]
+    atr_pct = round((atr / current_price) * 100, 4) if current_price > 0 else 0
     ema_signal = np.clip(ema_diff / (atr if atr > 0 else 1), -1, 1)
 
-    # Multi-timeframe momentum (using 5-minute candles)
+    # Multi-timeframe momentum (5m offsets; multi_timeframe.py builds real HTF bars)
     mom_5m = (closes[-1] / closes[-2] - 1) * 100 if len(closes) >= 2 else 0
     mom_15m = (closes[-1] / closes[-4] - 1) * 100 if len(closes) >= 4 else 0  # 3 candles = 15min
     mom_1h = (closes[-1] / closes[-13] - 1) * 100 if len(closes) >= 13 else 0  # 12 candles = 1h
@@ -320,11 +862,331 @@ def build_technical_snapshot(candles: List[Candle]) -> Optional[TechnicalSnapsho
     )
 
 
+def compute_snapshot_series(highs: np.ndarray, lows: np.ndarray,
+                            closes: np.ndarray, volumes: np.ndarray,
+                            window: Optional[int] = None,
+                            config: Optional[V6Config] = None) -> Dict[str, np.ndarray]:
+    """
+    Every TechnicalSnapshot field for every bar in one vectorized pass.
+
+    Bar t gets the snapshot build_technical_snapshot would return for the
+    `window` candles ending at t (default: config.lookback_candles); bars
+    with fewer than `window` candles of history are NaN. Keys are the
+    TechnicalSnapshot field names.
+    """
+    cfg = config or DEFAULT_CONFIG
+    window = window or cfg.lookback_candles
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    closes = np.asarray(closes, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+
+    rsi = compute_rsi_series(closes, cfg.rsi_period, window=window)
+    atr = compute_atr_series(highs, lows, closes, cfg.atr_period, window=window)
+    vol_ratio = compute_volume_ratio_series(volumes, cfg.volume_ma_period)
+    ema_diff = (compute_ema_series(closes, cfg.ema_fast, window=window)
+                - compute_ema_series(closes, cfg.ema_slow, window=window))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        atr_pct = np.where(closes > 0, np.round(atr / closes * 100, 4), 0.0)
+        ema_signal = np.round(np.clip(ema_diff / np.where(atr > 0, atr, 1.0), -1, 1), 4)
+
+    def momentum(lag: int) -> np.ndarray:
+        mom = np.full(closes.shape, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mom[..., lag:] = (closes[..., lag:] / closes[..., :-lag] - 1) * 100
+        return mom
+
+    mom_5m, mom_15m, mom_1h = momentum(1), momentum(3), momentum(12)
+    alignment = (np.sign(mom_5m) + np.sign(mom_15m) + np.sign(mom_1h)) / 3.0
+
+    fields = {
+        "price": np.round(closes, 2),
+        "rsi": rsi,
+        "atr": atr,
+        "atr_pct": atr_pct,
+        "volume_ratio": vol_ratio,
+        "bb_position": ema_signal,
+        "ema_cross_signal": ema_signal.copy(),
+        "price_momentum_5m": np.round(mom_5m, 4),
+        "price_momentum_15m": np.round(mom_15m, 4),
+        "price_momentum_1h": np.round(mom_1h, 4),
+        "trend_alignment": np.round(alignment, 4),
+    }
+    for arr in fields.values():
+        arr[..., :window - 1] = np.nan
+    return fields
+
+
+def build_technical_snapshot_series(candles: Union[CandleSeries, List[Candle]],
+                                    window: Optional[int] = None,
+                                    config: Optional[V6Config] = None) -> Dict[str, np.ndarray]:
+    """compute_snapshot_series straight from a CandleSeries (or candle list)."""
+    series = as_candle_series(candles)
+    return compute_snapshot_series(series.high, series.low, series.close, series.volume,
+                                   window=window, config=config)
+
+
+def snapshot_at(series: Dict[str, np.ndarray], t: int) -> TechnicalSnapshot:
+    """Materialize bar t of a snapshot series as a TechnicalSnapshot."""
+    return TechnicalSnapshot(**{name: float(arr[t]) for name, arr in series.items()})
+
+
+# ─────────────────────────────────────────────────────────────
+# §4b. Incremental Indicator State (O(1) per closed candle)
+# ─────────────────────────────────────────────────────────────
+
+class _WindowedSmoother:
+    """
+    Seeded exponential smoother over the trailing `window` values.
+
+    Reproduces the recursion in compute_rsi / compute_atr / compute_ema:
+    seed = mean of the first `seed_len` values of the window, then
+    y = y·(1-α) + α·x over the rest. Expanded, that is
+
+        y = (1-α)^(n-s) · seed + Σ α(1-α)^(n-1-i) · x_i   (i = s..n-1)
+
+    so sliding the window only has to move one value from the tail sum
+    into the seed block and drop one from the seed block.
+    """
+
+    __slots__ = ("alpha", "decay", "seed_len", "window", "values",
+                 "seed_sum", "tail", "_leave_weight", "_pushes")
+
+    def __init__(self, alpha: float, seed_len: int, window: int):
+        if window <= seed_len:
+            raise ValueError(f"window ({window}) must exceed seed_len ({seed_len})")
+        self.alpha = alpha
+        self.decay = 1.0 - alpha
+        self.seed_len = seed_len
+        self.window = window
+        self.values: deque = deque()
+        self.seed_sum = 0.0
+        self.tail = 0.0
+        # Weight of the oldest tail value once the window is full
+        self._leave_weight = alpha * self.decay ** (window - seed_len - 1)
+        self._pushes = 0
+
+    def push(self, x: float) -> None:
+        values = self.values
+        n = len(values)
+        if n < self.seed_len:
+            self.seed_sum += x
+        else:
+            if n == self.window:
+                self.seed_sum -= values.popleft()
+                moving = values[self.seed_len - 1]  # oldest tail value joins the seed block
+                self.tail -= self._leave_weight * moving
+                self.seed_sum += moving
+            self.tail = self.tail * self.decay + self.alpha * x
+        values.append(x)
+
+        # Re-sum the seed block once per window to stop float drift (amortized O(1))
+        self._pushes += 1
+        if self._pushes >= self.window:
+            self._pushes = 0
+            self.seed_sum = float(sum(islice(values, self.seed_len)))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def value(self) -> Optional[float]:
+        n = len(self.values)
+        if n < self.seed_len:
+            return None
+        seed = self.seed_sum / self.seed_len
+        return self.decay ** (n - self.seed_len) * seed + self.tail
+
+
+class _RollingWindow:
+    """Rolling sum / sum of squares over the last `period` values (pivot-shifted)."""
+
+    __slots__ = ("period", "values", "pivot", "sum", "sumsq", "_pushes")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values: deque = deque()
+        self.pivot: Optional[float] = None
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self._pushes = 0
+
+    def push(self, x: float) -> None:
+        if self.pivot is None:
+            self.pivot = x
+        if len(self.values) == self.period:
+            d = self.values.popleft() - self.pivot
+            self.sum -= d
+            self.sumsq -= d * d
+        d = x - self.pivot
+        self.sum += d
+        self.sumsq += d * d
+        self.values.append(x)
+
+        self._pushes += 1
+        if self._pushes >= 4 * self.period:
+            self._resync()
+
+    def _resync(self) -> None:
+        self._pushes = 0
+        self.pivot = sum(self.values) / len(self.values)
+        self.sum = sum(v - self.pivot for v in self.values)
+        self.sumsq = sum((v - self.pivot) ** 2 for v in self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def mean(self) -> float:
+        return self.pivot + self.sum / len(self.values)
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), as np.std(..., ddof=1)."""
+        n = len(self.values)
+        var = (self.sumsq - self.sum * self.sum / n) / (n - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+
+class IncrementalIndicatorState:
+    """
+    Running indicator state for one market, updated once per closed candle.
+
+    Keeps Wilder RSI/ATR averages, EMA fast/slow and rolling Bollinger sums
+    as state, so each update costs O(1) instead of recomputing every
+    indicator over the full lookback (the volume MA is re-summed from its
+    last volume_ma_period volumes, so an all-zero stretch gives exactly 0). After each update, `snapshot()`
+    equals `build_technical_snapshot(last_window_candles)` — the same
+    trailing-window seeding the live 100-candle fetch uses — up to float
+    rounding.
+
+    Usage:
+        state = IncrementalIndicatorState.from_candles(fetch_binance_klines())
+        ...
+        snap = state.update(new_closed_candle)
+    """
+
+    def __init__(self, window: Optional[int] = None, config: Optional[V6Config] = None):
+        cfg = self.config = config or DEFAULT_CONFIG
+        window = window or cfg.lookback_candles
+        min_window = max(cfg.rsi_period, cfg.atr_period, cfg.bollinger_period,
+                         cfg.volume_ma_period, 13) + 1
+        if window < min_window:
+            raise ValueError(f"window must be >= {min_window}, got {window}")
+        self.window = window
+        self.closes: deque = deque(maxlen=window)
+        self.last_timestamp: Optional[float] = None
+
+        # Deltas / true ranges have one fewer element than the close window
+        self._avg_gain = _WindowedSmoother(1.0 / cfg.rsi_period, cfg.rsi_period, window - 1)
+        self._avg_loss = _WindowedSmoother(1.0 / cfg.rsi_period, cfg.rsi_period, window - 1)
+        self._atr = _WindowedSmoother(1.0 / cfg.atr_period, cfg.atr_period, window - 1)
+        self._ema_fast = _WindowedSmoother(2.0 / (cfg.ema_fast + 1), 1, window)
+        self._ema_slow = _WindowedSmoother(2.0 / (cfg.ema_slow + 1), 1, window)
+        self._bollinger = _RollingWindow(cfg.bollinger_period)
+        self._volume: deque = deque(maxlen=cfg.volume_ma_period + 1)  # MA window + current candle
+
+    @classmethod
+    def from_candles(cls, candles: Union[CandleSeries, List[Candle]],
+                     window: Optional[int] = None,
+                     config: Optional[V6Config] = None) -> "IncrementalIndicatorState":
+        """Warm the state from a candle history (e.g. the initial REST fetch)."""
+        state = cls(window, config)
+        rows = candles.data.tolist() if isinstance(candles, CandleSeries) else [
+            (c.timestamp, c.open, c.high, c.low, c.close, c.volume) for c in candles]
+        for row in rows:
+            state.update_values(*row)
+        return state
+
+    def __len__(self) -> int:
+        return len(self.closes)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.closes) >= self.window
+
+    def update(self, candle: Candle) -> Optional[TechnicalSnapshot]:
+        """Fold one closed candle into the state and return the new snapshot."""
+        return self.update_values(candle.timestamp, candle.open, candle.high,
+                                  candle.low, candle.close, candle.volume)
+
+    def update_values(self, timestamp: float, open: float, high: float,
+                      low: float, close: float, volume: float) -> Optional[TechnicalSnapshot]:
+        """update() for a raw OHLCV row (e.g. a CandleSeries row) — no Candle needed."""
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            raise ValueError(
+                f"Candle {timestamp} is not newer than {self.last_timestamp}; "
+                "only feed closed candles in order."
+            )
+        self.last_timestamp = timestamp
+
+        if self.closes:
+            prev_close = self.closes[-1]
+            delta = close - prev_close
+            self._avg_gain.push(delta if delta > 0 else 0.0)
+            self._avg_loss.push(-delta if delta < 0 else 0.0)
+            self._atr.push(max(high - low, abs(high - prev_close), abs(low - prev_close)))
+
+        self.closes.append(close)
+        self._ema_fast.push(close)
+        self._ema_slow.push(close)
+        self._bollinger.push(close)
+        self._volume.append(volume)
+        return self.snapshot()
+
+    # ── Individual indicators (same fallbacks as the §3 functions) ──
+
+    @property
+    def rsi(self) -> float:
+        if len(self._avg_gain) < self.config.rsi_period:
+            return 50.0
+        avg_gain = self._avg_gain.value()
+        avg_loss = self._avg_loss.value()
+        if avg_loss == 0:
+            return 100.0
+        return round(100.0 - (100.0 / (1.0 + avg_gain / avg_loss)), 2)
+
+    @property
+    def atr(self) -> float:
+        if len(self._atr) < self.config.atr_period:
+            return 0.0
+        return round(self._atr.value(), 2)
+
+    @property
+    def volume_ratio(self) -> float:
+        vol = self._volume
+        period = self.config.volume_ma_period
+        if len(vol) < period + 1:
+            return 1.0
+        current = vol[-1]
+        # Summed from the window, not a running total: an all-zero MA must be exactly 0
+        vol_ma = math.fsum(islice(vol, period)) / period
+        if vol_ma == 0:
+            return 1.0
+        return round(current / vol_ma, 4)
+
+    @property
+    def bollinger_position(self) -> float:
+        bb = self._bollinger
+        if len(bb) < self.config.bollinger_period:
+            return 0.0
+        std = bb.std()
+        if std == 0:
+            return 0.0
+        half_width = self.config.bollinger_std * std
+        return round((self.closes[-1] - bb.mean()) / half_width, 4) if half_width > 0 else 0.0
+
+    def snapshot(self) -> Optional[TechnicalSnapshot]:
+        """Current snapshot, or None while fewer than `window` candles are loaded."""
+        if not self.ready:
+            return None
+        ema_diff = self._ema_fast.value() - self._ema_slow.value()
+        return _finish_snapshot(self.closes, self.rsi, self.atr, self.volume_ratio, ema_diff)
+
+
 # ─────────────────────────────────────────────────────────────
 # §5. Market Regime Detection
 # ─────────────────────────────────────────────────────────────
 
-def detect_regime(snap: TechnicalSnapshot) -> RegimeState:
+def detect_regime(snap: TechnicalSnapshot, config: Optional[V6Config] = None) -> RegimeState:
     """
     Classify market into one of four regimes and set adaptive threshold.
 
@@ -332,35 +1194,36 @@ def detect_regime(snap: TechnicalSnapshot) -> RegimeState:
     a trending market ≠ 0.85 in a choppy market. The trending market has
     higher base rate of continuation, so we can enter with lower threshold.
     """
+    cfg = config or DEFAULT_CONFIG
     atr_pct = snap.atr_pct
     alignment = abs(snap.trend_alignment)
     rsi = snap.rsi
 
     # Regime classification via fuzzy logic
-    is_trending = alignment > 0.5 and 30 < rsi < 70
-    is_volatile = atr_pct > 0.5  # >0.5% per 5min candle = high vol
-    is_extreme_rsi = rsi > 75 or rsi < 25
+    is_trending = alignment > cfg.trend_alignment_min and cfg.trend_rsi_low < rsi < cfg.trend_rsi_high
+    is_volatile = atr_pct > cfg.volatile_atr_pct  # >0.5% per 5min candle = high vol
+    is_extreme_rsi = rsi > cfg.extreme_rsi_high or rsi < cfg.extreme_rsi_low
 
     # V6 Aggressive Tuning for Post-Only Maker Rebate Optimization (23:23 KST)
     if is_volatile and is_extreme_rsi:
         regime = "volatile"
-        strength = min(1.0, atr_pct / 1.0)
-        threshold = 0.85 # Adjusted from 0.90
+        strength = min(1.0, atr_pct / cfg.volatile_strength_atr_pct)
+        threshold = cfg.threshold_volatile_extreme  # Adjusted from 0.90
     elif is_trending and not is_volatile:
         if snap.trend_alignment > 0:
             regime = "trending_up"
         else:
             regime = "trending_down"
         strength = alignment
-        threshold = 0.68  # Adjusted from 0.75: Capture trends earlier
+        threshold = cfg.threshold_trending  # Adjusted from 0.75: Capture trends earlier
     elif is_volatile:
         regime = "volatile"
-        strength = min(1.0, atr_pct / 1.0)
-        threshold = 0.82 # Adjusted from 0.88
+        strength = min(1.0, atr_pct / cfg.volatile_strength_atr_pct)
+        threshold = cfg.threshold_volatile  # Adjusted from 0.88
     else:
         regime = "ranging"
         strength = 1.0 - alignment
-        threshold = 0.75  # Adjusted from 0.82: Optimized for Maker Rebate entries
+        threshold = cfg.threshold_ranging  # Adjusted from 0.82: Optimized for Maker Rebate entries
 
     return RegimeState(
         regime=regime,
@@ -565,18 +1428,39 @@ def make_decision(omega: OmegaV6, regime: RegimeState,
     kelly = kelly_fraction(win_prob, win_payout, loss_payout)
 
     # Decision gate
-    reasons = []
-
     if confidence < threshold:
         decision = "HOLD"
-        reasons.append(f"Confidence {confidence:.2%} < regime threshold {threshold:.2%}")
         kelly = 0.0
     elif ev <= 0:
         decision = "HOLD"
-        reasons.append(f"Negative EV ({ev:.4f}). Trade is -EV after fees.")
         kelly = 0.0
     else:
         decision = direction
+
+    return TradeSignal(
+        decision=decision,
+        confidence=confidence,
+        omega=omega,
+        regime=regime,
+        technicals=snap,
+        kelly_fraction=kelly,
+        expected_value=ev,
+        reasoning=_format_reasoning(decision, direction, posterior, confidence, threshold,
+                                    ev, kelly, regime, snap)
+    )
+
+
+def _format_reasoning(decision: str, direction: str, posterior: float,
+                      confidence: float, threshold: float, ev: float, kelly: float,
+                      regime: RegimeState, snap: TechnicalSnapshot) -> str:
+    """Human-readable explanation of one decision (shared by §8 and §8b)."""
+    reasons = []
+
+    if confidence < threshold:
+        reasons.append(f"Confidence {confidence:.2%} < regime threshold {threshold:.2%}")
+    elif decision == "HOLD":
+        reasons.append(f"Negative EV ({ev:.4f}). Trade is -EV after fees.")
+    else:
         reasons.append(f"Bayesian posterior: {posterior:.4f} → {direction}")
         reasons.append(f"Confidence {confidence:.2%} ≥ threshold {threshold:.2%}")
         reasons.append(f"+EV trade: {ev:.4f} per unit")
@@ -590,16 +1474,234 @@ def make_decision(omega: OmegaV6, regime: RegimeState,
         f"RSI={snap.rsi:.1f} | ATR%={snap.atr_pct:.3f} | "
         f"VolRatio={snap.volume_ratio:.2f} | MTF={snap.trend_alignment:.2f}"
     )
+    return "\n".join(reasons)
 
-    return TradeSignal(
-        decision=decision,
+
+# ─────────────────────────────────────────────────────────────
+# §8b. Vectorized Decision Kernel (§5–§8 over arrays of snapshots)
+# ─────────────────────────────────────────────────────────────
+#
+# Same math as detect_regime → compute_omega_v6 → make_decision, applied to
+# whole arrays of snapshot fields (e.g. a compute_snapshot_series result or
+# one row per market). The if/elif ladders become np.select/np.where, and
+# reasoning text is only formatted when DecisionBatch.reasoning(i) is called.
+# Results match the scalar path value for value, rounding included.
+
+REGIME_NAMES = ("trending_up", "trending_down", "ranging", "volatile")
+DECISION_NAMES = ("HOLD", "LONG", "SHORT")
+_REGIME_LOOKUP = np.array(REGIME_NAMES)
+_DECISION_LOOKUP = np.array(DECISION_NAMES)
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def _round_half(x: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    round(x, ndigits) with Python's semantics, elementwise.
+
+    np.round scales by 10**ndigits first, which can land exactly on .5 where
+    Python's round (which rounds the exact binary value) would not — common
+    here because raw_score × 1.1 often ends in 5. Those near-ties are
+    re-rounded with the builtin; everything else uses np.round.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    out = np.round(x, ndigits)
+    scaled = x * 10.0 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        out[near_tie] = [round(v, ndigits) for v in x[near_tie].tolist()]
+    return out
+
+
+@dataclass
+class RegimeBatch:
+    """Array form of RegimeState; `code` indexes REGIME_NAMES."""
+    code: np.ndarray
+    regime_strength: np.ndarray
+    adaptive_threshold: np.ndarray
+
+    @property
+    def regime(self) -> np.ndarray:
+        return _REGIME_LOOKUP[self.code]
+
+    def at(self, i: int) -> RegimeState:
+        return RegimeState(regime=REGIME_NAMES[self.code[i]],
+                           regime_strength=float(self.regime_strength[i]),
+                           adaptive_threshold=float(self.adaptive_threshold[i]))
+
+
+@dataclass
+class OmegaBatch:
+    """Array form of OmegaV6."""
+    raw_score: np.ndarray
+    bayesian_posterior: np.ndarray
+    regime_adjusted: np.ndarray
+    final_confidence: np.ndarray
+
+    def at(self, i: int) -> OmegaV6:
+        return OmegaV6(raw_score=float(self.raw_score[i]),
+                       bayesian_posterior=float(self.bayesian_posterior[i]),
+                       regime_adjusted=float(self.regime_adjusted[i]),
+                       final_confidence=float(self.final_confidence[i]))
+
+
+@dataclass
+class DecisionBatch:
+    """Array form of TradeSignal; `code` indexes DECISION_NAMES."""
+    code: np.ndarray
+    direction: np.ndarray           # Code the trade would take if not gated (1 LONG, 2 SHORT)
+    confidence: np.ndarray
+    kelly_fraction: np.ndarray
+    expected_value: np.ndarray
+    omega: OmegaBatch
+    regime: RegimeBatch
+    technicals: Dict[str, np.ndarray]
+
+    @property
+    def decision(self) -> np.ndarray:
+        return _DECISION_LOOKUP[self.code]
+
+    def counts(self) -> Dict[str, int]:
+        tally = np.bincount(self.code, minlength=len(DECISION_NAMES))
+        return {name: int(c) for name, c in zip(DECISION_NAMES, tally)}
+
+    def reasoning(self, i: int) -> str:
+        """Reasoning text for element i, exactly as make_decision writes it."""
+        omega, regime = self.omega.at(i), self.regime.at(i)
+        return _format_reasoning(DECISION_NAMES[self.code[i]], DECISION_NAMES[self.direction[i]],
+                                 omega.bayesian_posterior, omega.final_confidence,
+                                 regime.adaptive_threshold, float(self.expected_value[i]),
+                                 float(self.kelly_fraction[i]), regime,
+                                 snapshot_at(self.technicals, i))
+
+    def signal(self, i: int) -> TradeSignal:
+        """Materialize element i as the TradeSignal make_decision would return."""
+        return TradeSignal(
+            decision=DECISION_NAMES[self.code[i]],
+            confidence=float(self.confidence[i]),
+            omega=self.omega.at(i),
+            regime=self.regime.at(i),
+            technicals=snapshot_at(self.technicals, i),
+            kelly_fraction=float(self.kelly_fraction[i]),
+            expected_value=float(self.expected_value[i]),
+            reasoning=self.reasoning(i),
+        )
+
+
+def detect_regime_array(snaps: Dict[str, np.ndarray],
+                        config: Optional[V6Config] = None) -> RegimeBatch:
+    """detect_regime over arrays of snapshot fields."""
+    cfg = config or DEFAULT_CONFIG
+    atr_pct = np.asarray(snaps["atr_pct"], dtype=np.float64)
+    trend = np.asarray(snaps["trend_alignment"], dtype=np.float64)
+    rsi = np.asarray(snaps["rsi"], dtype=np.float64)
+    alignment = np.abs(trend)
+
+    is_trending = (alignment > cfg.trend_alignment_min) & (cfg.trend_rsi_low < rsi) & (rsi < cfg.trend_rsi_high)
+    is_volatile = atr_pct > cfg.volatile_atr_pct
+    is_extreme_rsi = (rsi > cfg.extreme_rsi_high) | (rsi < cfg.extreme_rsi_low)
+
+    volatile_extreme = is_volatile & is_extreme_rsi
+    trending = ~volatile_extreme & is_trending & ~is_volatile
+    volatile = ~volatile_extreme & ~trending & is_volatile
+
+    code = np.select([volatile_extreme | volatile, trending & (trend > 0), trending],
+                     [3, 0, 1], default=2).astype(np.int8)
+    vol_strength = np.minimum(1.0, atr_pct / cfg.volatile_strength_atr_pct)
+    strength = np.select([volatile_extreme | volatile, trending], [vol_strength, alignment],
+                         default=1.0 - alignment)
+    threshold = np.select([volatile_extreme, trending, volatile],
+                          [cfg.threshold_volatile_extreme, cfg.threshold_trending, cfg.threshold_volatile],
+                          default=cfg.threshold_ranging)
+    return RegimeBatch(code=code, regime_strength=_round_half(strength, 4),
+                       adaptive_threshold=threshold.astype(np.float64))
+
+
+def compute_omega_v6_array(snaps: Dict[str, np.ndarray], regime: RegimeBatch,
+                           historical_winrate: ArrayLike = 0.55) -> OmegaBatch:
+    """compute_omega_v6 over arrays; `historical_winrate` may be per element."""
+    prior = np.clip(np.asarray(historical_winrate, dtype=np.float64), 0.01, 0.99)
+    log_odds = np.log(prior / (1 - prior))
+
+    rsi = np.asarray(snaps["rsi"], dtype=np.float64)
+    trend = np.asarray(snaps["trend_alignment"], dtype=np.float64)
+    vol_r = np.asarray(snaps["volume_ratio"], dtype=np.float64)
+    bb = np.asarray(snaps["bb_position"], dtype=np.float64)
+
+    lr_rsi = np.select([rsi < 30, rsi < 45, rsi < 55, rsi < 70], [0.7, 0.3, 0.0, -0.3], default=-0.7)
+    lr_ema = np.clip(np.asarray(snaps["ema_cross_signal"], dtype=np.float64) * 1.0, -1.0, 1.0)
+    direction = np.sign(trend)
+    lr_vol = np.select([vol_r > 1.5, vol_r > 1.0], [0.4 * direction, 0.2 * direction], default=-0.1)
+    lr_bb = np.select([bb < -0.8, bb > 0.8], [0.5, -0.5], default=0.0)
+    lr_mtf = trend * 0.8
+
+    # Same association order as the scalar `log_odds += a + b + c + d + e`
+    log_odds = log_odds + ((((lr_rsi + lr_ema) + lr_vol) + lr_bb) + lr_mtf)
+    posterior = 1.0 / (1.0 + np.exp(-log_odds))
+
+    raw_score = _round_half(np.abs(posterior - 0.5) * 200, 1)
+    regime_factor = np.select([regime.code == 3, regime.code <= 1], [0.85, 1.10], default=1.0)
+    regime_adjusted = _round_half(np.minimum(100, raw_score * regime_factor), 1)
+
+    return OmegaBatch(
+        raw_score=raw_score,
+        bayesian_posterior=_round_half(posterior, 4),
+        regime_adjusted=regime_adjusted,
+        final_confidence=_round_half(regime_adjusted / 100.0, 4),
+    )
+
+
+def kelly_fraction_array(win_prob: ArrayLike, win_payout: ArrayLike = 1.0,
+                         loss_payout: ArrayLike = 1.0) -> np.ndarray:
+    """kelly_fraction over arrays (half-Kelly, clamped to [0, 0.25])."""
+    p = np.asarray(win_prob, dtype=np.float64)
+    win_payout = np.asarray(win_payout, dtype=np.float64)
+    loss_payout = np.asarray(loss_payout, dtype=np.float64)
+    valid = (win_payout > 0) & (loss_payout > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        b = win_payout / loss_payout
+        f = (b * p - (1.0 - p)) / b
+    half_kelly = np.clip(f / 2.0, 0.0, 0.25)
+    return _round_half(np.where(valid, half_kelly, 0.0), 4)
+
+
+def compute_expected_value_array(win_prob: ArrayLike, win_payout: ArrayLike = 1.0,
+                                 loss_payout: ArrayLike = 1.0,
+                                 fee_rate: float = 0.02) -> np.ndarray:
+    """compute_expected_value over arrays."""
+    p = np.asarray(win_prob, dtype=np.float64)
+    return _round_half(p * win_payout - (1 - p) * loss_payout - fee_rate, 4)
+
+
+def make_decision_array(omega: OmegaBatch, regime: RegimeBatch,
+                        snaps: Dict[str, np.ndarray],
+                        market_price: ArrayLike = 0.50) -> DecisionBatch:
+    """make_decision over arrays; `market_price` may be per element."""
+    posterior = omega.bayesian_posterior
+    confidence = omega.final_confidence
+    price = np.asarray(market_price, dtype=np.float64)
+
+    is_long = posterior > 0.5
+    win_prob = np.where(is_long, posterior, 1.0 - posterior)
+    side_price = np.where(is_long, price, 1.0 - price)
+    with np.errstate(divide="ignore"):
+        win_payout = np.where(side_price > 0, 1.0 / side_price - 1.0, 0.0)
+
+    maker_rebate = 0.0005  # Post-only maker rebate, as in make_decision
+    ev = compute_expected_value_array(win_prob, win_payout + maker_rebate, 1.0)
+    kelly = kelly_fraction_array(win_prob, win_payout, 1.0)
+
+    direction = np.where(is_long, 1, 2).astype(np.int8)
+    trade = (confidence >= regime.adaptive_threshold) & (ev > 0)
+    return DecisionBatch(
+        code=np.where(trade, direction, 0).astype(np.int8),
+        direction=direction,
         confidence=confidence,
+        kelly_fraction=np.where(trade, kelly, 0.0),
+        expected_value=ev,
         omega=omega,
         regime=regime,
-        technicals=snap,
-        kelly_fraction=kelly,
-        expected_value=ev,
-        reasoning="\n".join(reasons)
+        technicals=snaps,
     )
 
 
@@ -607,39 +1709,280 @@ def make_decision(omega: OmegaV6, regime: RegimeState,
 # §9. Historical Win Rate Tracker (Dynamic Prior)
 # ─────────────────────────────────────────────────────────────
 
-def get_historical_winrate(supabase_client=None, lookback_hours: int = 24) -> float:
+WINRATE_FALLBACK = 0.55  # uninformative prior
+WINRATE_MIN_SAMPLES = 5
+
+
+def _smoothed_winrate(wins: int, total: int) -> float:
+    """Laplace-smoothed, clipped win rate; the uninformative prior below WINRATE_MIN_SAMPLES."""
+    if total < WINRATE_MIN_SAMPLES:
+        return WINRATE_FALLBACK
+    # Bayesian smoothing: blend with prior to avoid extreme values
+    # (Laplace smoothing analog)
+    smoothed = (wins + 2) / (total + 4)  # Add 2 wins and 2 losses as pseudo-counts
+    return round(float(np.clip(smoothed, 0.30, 0.80)), 4)
+
+
+def _parse_ts(value) -> float:
+    """Epoch seconds from a Supabase timestamp (ISO string, 'Z' or offset; naive = UTC) or a number."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _query_settled(supabase_client, lookback_hours: float, columns: str = "is_win"):
+    cutoff = (datetime.utcnow() - timedelta(hours=lookback_hours)).isoformat()
+    return (supabase_client.table("predictions")
+            .select(columns)
+            .not_.is_("is_win", "null")
+            .gte("created_at", cutoff)
+            .execute()).data or []
+
+
+class WinRateTracker:
+    """
+    Rolling win/total counts over the last `lookback_hours`, in a ring of
+    `bucket_seconds` buckets keyed by each prediction's created_at (the
+    field get_historical_winrate filters on).
+
+    record() and winrate() cost no remote round-trip: advancing clears only
+    the buckets that left the ring, and the bucket straddling the window
+    edge keeps its events sorted, so the count is exact at the edge (the
+    same `created_at >= now - lookback` cut as the query). settle_prediction
+    records outcomes settled in this process as they happen; the Supabase
+    query runs only to backfill a cold tracker and, every `resync_seconds`,
+    to re-backfill on a background thread, which picks up settlements
+    written by other processes.
+
+    With `path`, counts are persisted there (JSON, atomic replace) after
+    every record/backfill and reloaded on start; a loaded tracker is warm
+    only if its last backfill is less than `resync_seconds` old, so state
+    left by a run days ago is backfilled before it is used.
+    """
+
+    def __init__(self, lookback_hours: float = 24, bucket_seconds: int = 300,
+                 path: Optional[str] = None, resync_seconds: Optional[float] = 300):
+        self.lookback_hours = lookback_hours
+        self.bucket_seconds = bucket_seconds
+        self.path = Path(path) if path else None
+        self.resync_seconds = resync_seconds
+        self.lookback_seconds = lookback_hours * 3600
+        # one spare bucket: the oldest live bucket straddles the window edge
+        n = int(self.lookback_seconds) // bucket_seconds + 2
+        self._events: List[List[Tuple[float, bool]]] = [[] for _ in range(n)]  # sorted (created_at, is_win)
+        self._wins = [0] * n
+        self._head: Optional[int] = None  # absolute index of the newest bucket
+        self.wins = 0  # over the whole ring, including the part of it past the edge
+        self.total = 0
+        self.synced_at: Optional[float] = None  # last backfill (wall clock)
+        self._lock = threading.Lock()
+        self._resync: Optional[threading.Thread] = None
+        if self.path is not None:
+            self.load()
+
+    @property
+    def warm(self) -> bool:
+        return self.synced_at is not None
+
+    def _advance(self, now: float) -> int:
+        idx = int(now // self.bucket_seconds)
+        if self._head is None:
+            self._head = idx
+        elif idx > self._head:
+            n = len(self._events)
+            for i in range(self._head + 1, min(idx, self._head + n) + 1):
+                slot = i % n
+                self.wins -= self._wins[slot]
+                self.total -= len(self._events[slot])
+                self._wins[slot] = 0
+                self._events[slot] = []
+            self._head = idx
+        return idx
+
+    def _add(self, is_win: bool, ts: float, now: float) -> None:
+        self._advance(now)
+        idx = int(ts // self.bucket_seconds)
+        if idx > self._head or idx <= self._head - len(self._events):
+            return  # outside the ring (or in the future)
+        slot = idx % len(self._events)
+        insort(self._events[slot], (ts, bool(is_win)))
+        self._wins[slot] += bool(is_win)
+        self.wins += bool(is_win)
+        self.total += 1
+
+    def record(self, is_win: bool, created_at=None, now: Optional[float] = None) -> None:
+        """Count one settled prediction (created_at: ISO string or epoch seconds; default now)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._add(is_win, now if created_at is None else _parse_ts(created_at), now)
+        self.save()
+
+    def counts(self, now: Optional[float] = None) -> Tuple[int, int]:
+        """(wins, total) created at or after now - lookback."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._advance(now)
+            cutoff = now - self.lookback_seconds
+            n = len(self._events)
+            wins, total = self.wins, self.total
+            for i in range(self._head - n + 1, int(cutoff // self.bucket_seconds) + 1):
+                events = self._events[i % n]
+                k = bisect_left(events, (cutoff,))
+                total -= k
+                wins -= sum(w for _, w in events[:k])
+            return wins, total
+
+    def winrate(self, now: Optional[float] = None) -> float:
+        return _smoothed_winrate(*self.counts(now))
+
+    def backfill(self, supabase_client, now: Optional[float] = None) -> int:
+        """Rebuild the counts from one settled-predictions query; returns the rows counted."""
+        rows = _query_settled(supabase_client, self.lookback_hours, "is_win, created_at")
+        now = time.time() if now is None else now
+        fresh = WinRateTracker(self.lookback_hours, self.bucket_seconds, resync_seconds=None)
+        for r in rows:
+            fresh._add(r["is_win"], _parse_ts(r["created_at"]), now)
+        with self._lock:
+            self._events, self._wins, self._head = fresh._events, fresh._wins, fresh._head
+            self.wins, self.total = fresh.wins, fresh.total
+            self.synced_at = now
+        self.save()
+        return fresh.total
+
+    def maybe_resync(self, supabase_client) -> None:
+        """Start a background backfill once `resync_seconds` have passed since the last one."""
+        if not self.resync_seconds or supabase_client is None or self.synced_at is None:
+            return
+        if time.time() - self.synced_at < self.resync_seconds:
+            return
+        if self._resync is not None and self._resync.is_alive():
+            return
+
+        def run():
+            try:
+                self.backfill(supabase_client)
+            except Exception as e:
+                print(f"⚠️ Win rate resync error: {e}")
+
+        self._resync = threading.Thread(target=run, name="v6-winrate-resync", daemon=True)
+        self._resync.start()
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            n = len(self._events)
+            buckets = [] if self._head is None else [
+                [i, self._events[i % n]]
+                for i in range(self._head - n + 1, self._head + 1) if self._events[i % n]
+            ]
+            state = {"lookback_hours": self.lookback_hours, "bucket_seconds": self.bucket_seconds,
+                     "head": self._head, "synced_at": self.synced_at, "events": buckets}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".winrate-", dir=self.path.parent)
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
+
+    def load(self, now: Optional[float] = None) -> bool:
+        """
+        Restore persisted counts; False (and a cold tracker) if missing or for
+        other window settings. Counts last backfilled more than
+        `resync_seconds` ago are restored cold, so the next tick backfills.
+        """
+        try:
+            state = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return False
+        if (state.get("lookback_hours"), state.get("bucket_seconds")) != (self.lookback_hours, self.bucket_seconds):
+            return False
+        if "events" not in state:
+            return False  # counts-only state from an older version
+        n = len(self._events)
+        now = time.time() if now is None else now
+        synced_at = state.get("synced_at")
+        if synced_at is not None and self.resync_seconds and now - synced_at >= self.resync_seconds:
+            synced_at = None
+        with self._lock:
+            self._head = state.get("head")
+            for i, events in state["events"]:
+                self._events[i % n] = sorted((float(ts), bool(w)) for ts, w in events)
+                self._wins[i % n] = sum(w for _, w in self._events[i % n])
+            self.wins, self.total = sum(self._wins), sum(map(len, self._events))
+            self.synced_at = synced_at
+        return True
+
+
+_default_winrate_tracker: Optional[WinRateTracker] = None
+
+
+def get_winrate_tracker() -> WinRateTracker:
+    """
+    Process-wide tracker, so repeated run_oracle_v6() ticks share one set of
+    counts. Set V6_WINRATE_STATE to a file path to persist them across runs.
+    """
+    global _default_winrate_tracker
+    if _default_winrate_tracker is None:
+        _default_winrate_tracker = WinRateTracker(path=os.environ.get("V6_WINRATE_STATE"))
+    return _default_winrate_tracker
+
+
+def get_historical_winrate(supabase_client=None, lookback_hours: int = 24,
+                           tracker: Optional[WinRateTracker] = None) -> float:
     """
     Compute actual win rate from recent settled predictions.
     This replaces the hardcoded 0.88 Ω in V5.
 
+    With a `tracker`, the rate comes from its rolling counts (its own
+    lookback applies); Supabase is queried only to backfill it when cold,
+    and re-synced in the background when due.
+
     Falls back to 0.55 (uninformative prior) if no data available.
     """
+    if tracker is not None:
+        if supabase_client is not None:
+            try:
+                if not tracker.warm:
+                    tracker.backfill(supabase_client)
+                else:
+                    tracker.maybe_resync(supabase_client)
+            except Exception as e:
+                print(f"⚠️ Win rate fetch error: {e}")
+        return tracker.winrate()
+
     if supabase_client is None:
-        return 0.55  # Uninformative prior
+        return WINRATE_FALLBACK  # Uninformative prior
 
     try:
-        cutoff = (datetime.utcnow() - timedelta(hours=lookback_hours)).isoformat()
-        result = (supabase_client.table("predictions")
-                  .select("is_win")
-                  .not_.is_("is_win", "null")
-                  .gte("created_at", cutoff)
-                  .execute())
-
-        if not result.data or len(result.data) < 5:
-            return 0.55  # Not enough data
-
-        wins = sum(1 for r in result.data if r['is_win'])
-        total = len(result.data)
-        winrate = wins / total
-
-        # Bayesian smoothing: blend with prior to avoid extreme values
-        # (Laplace smoothing analog)
-        smoothed = (wins + 2) / (total + 4)  # Add 2 wins and 2 losses as pseudo-counts
-        return round(np.clip(smoothed, 0.30, 0.80), 4)
+        rows = _query_settled(supabase_client, lookback_hours)
+        wins = sum(1 for r in rows if r['is_win'])
+        return _smoothed_winrate(wins, len(rows))
 
     except Exception as e:
         print(f"⚠️ Win rate fetch error: {e}")
-        return 0.55
+        return WINRATE_FALLBACK
+
+
+def settle_prediction(supabase_client, prediction_id, is_win: bool,
+                      tracker: Optional[WinRateTracker] = None) -> bool:
+    """
+    Record a prediction's outcome in Supabase and count it in the win-rate
+    tracker at once, so the next tick's prior includes it without waiting
+    for a resync. Only a still-unsettled row is updated (settling twice
+    counts once); returns whether it was.
+    """
+    rows = (supabase_client.table("predictions")
+            .update({"is_win": bool(is_win)})
+            .eq("id", prediction_id)
+            .is_("is_win", "null")
+            .execute()).data or []
+    tracker = tracker or get_winrate_tracker()
+    for r in rows:
+        tracker.record(is_win, r.get("created_at"))
+    return bool(rows)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -647,15 +1990,18 @@ def get_historical_winrate(supabase_client=None, lookback_hours: int = 24) -> fl
 # ─────────────────────────────────────────────────────────────
 
 def run_oracle_v6(supabase_client=None,
-                   market_price: float = 0.50) -> Optional[TradeSignal]:
+                   market_price: float = 0.50,
+                   config: Optional[V6Config] = None,
+                   client: Optional[MarketDataClient] = None,
+                   winrate_tracker: Optional[WinRateTracker] = None) -> Optional[TradeSignal]:
     """
     Alpha Oracle V6 — Full Pipeline
 
     Execution flow:
-    1. Fetch real candle data from Binance (5-min BTCUSDT)
+    1. Fetch real candle data from Binance (5-min BTCUSDT) + Pyth price, concurrently
     2. Compute ALL technical indicators (no hardcoding)
     3. Detect market regime
-    4. Load historical win rate as Bayesian prior
+    4. Load historical win rate as Bayesian prior (rolling tracker; Supabase only to backfill)
     5. Compute OMNIA Ω V6 (Bayesian fusion)
     6. Make trade decision with adaptive threshold + EV filter
     7. Output position size via Kelly Criterion
@@ -667,21 +2013,31 @@ def run_oracle_v6(supabase_client=None,
 
     # ── Phase 1: Data Acquisition ──
     print("\n👁️ 청안 (Blue-Eye) — Real-Time Data Recon...")
-    candles = fetch_binance_klines(symbol="BTCUSDT", interval="5m", limit=LOOKBACK_CANDLES)
+    cfg = config or DEFAULT_CONFIG
+    client = client or get_market_data_client()
+    tick = client.fetch_tick([("BTCUSDT", "5m")], limit=cfg.lookback_candles)
+    candles = tick.candles[("BTCUSDT", "5m")]
     if not candles:
         print("❌ Failed to fetch candle data. Aborting.")
         return None
 
-    pyth_price = fetch_pyth_price()
+    pyth_price = tick.prices[PYTH_BTC_FEED]
     print(f"   Pyth Oracle Price: ${pyth_price:,.2f}")
     print(f"   Binance Candles: {len(candles)} loaded (5m interval)")
 
     # ── Phase 2: Technical Analysis ──
     print("\n⚔️ 청검 (Blue-Blade) — Computing Indicators...")
-    snap = build_technical_snapshot(candles)
+    snap = build_technical_snapshot(candles, cfg)
     if snap is None:
         print("❌ Insufficient data for technical analysis. Aborting.")
         return None
+    if client.store is not None:
+        # Real 15m/1h/4h trend alignment from the on-disk 5m history
+        from multi_timeframe import mtf_history_rows, store_trend_alignment
+        client.backfill({("BTCUSDT", "5m"): mtf_history_rows("5m", config=cfg)})
+        alignment = store_trend_alignment(client.store, "BTCUSDT", "5m", cfg)
+        if alignment is not None:
+            snap = replace(snap, trend_alignment=alignment)
 
     print(f"   RSI:           {snap.rsi:.1f}")
     print(f"   ATR:           ${snap.atr:.2f} ({snap.atr_pct:.3f}%)")
@@ -695,12 +2051,12 @@ def run_oracle_v6(supabase_client=None,
 
     # ── Phase 3: Regime Detection ──
     print("\n🌊 Regime Detection...")
-    regime = detect_regime(snap)
+    regime = detect_regime(snap, cfg)
     print(f"   Regime:    {regime.regime} (strength: {regime.regime_strength:.2f})")
     print(f"   Threshold: {regime.adaptive_threshold:.2%}")
 
     # ── Phase 4: Historical Win Rate (Dynamic Prior) ──
-    winrate = get_historical_winrate(supabase_client)
+    winrate = get_historical_winrate(supabase_client, tracker=winrate_tracker or get_winrate_tracker())
     print(f"\n📊 Historical Win Rate (Prior): {winrate:.2%}")
 
     # ── Phase 5: OMNIA Ω V6 Computation ──
@@ -732,24 +2088,21 @@ def run_oracle_v6(supabase_client=None,
 
     # ── Phase 9: Report to Solana Sentinel Vault (Aoineco & Co. Integration) ──
     if signal.decision != "HOLD":
-        print("\n🏛️  Reporting performance to Solana Sentinel Vault...")
+        print("\n🏛️  Queueing performance report for Solana Sentinel Vault...")
         try:
             # PnL Calculation for the report (Simulated for Demo)
             # In real-world, this would wait for market settlement.
             # Here we report the expected value or a simulated outcome.
             simulated_pnl = int(signal.expected_value * 10000) # Convert to bps
             is_win = signal.decision == "LONG" # Simple win simulation for record
-            
-            import subprocess
-            cmd = [
-                "npx", "ts-node", "-T", "--skip-project",
-                "/Users/silkroadcat/.openclaw/workspace/solana-sentinel/scripts/report_trade.ts",
-                str(simulated_pnl),
-                "true" if is_win else "false"
-            ]
-            # Running with shell context for env vars
-            subprocess.run(cmd, cwd="/Users/silkroadcat/.openclaw/workspace/solana-sentinel", check=True)
-            print(f"✅ V6 Data Parked on Solana Devnet: {simulated_pnl} bps")
+
+            # Journaled on disk and sent in batches by one long-lived
+            # reporter (engine/trade_reporter.py); the decision never waits on Node,
+            # and a one-shot run exits without waiting (`trade_reporter.py --drain`).
+            from trade_reporter import get_trade_reporter
+            report_id = get_trade_reporter().submit(simulated_pnl, is_win, decision=signal.decision,
+                                                    confidence=round(signal.confidence, 4))
+            print(f"✅ V6 report queued ({report_id[:8]}): {simulated_pnl} bps")
         except Exception as e:
             print(f"⚠️  Solana Reporting Error: {e}")
 
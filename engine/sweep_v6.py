@@ -0,0 +1,209 @@
+"""
+Alpha Oracle V6 — Parallel Parameter Sweep
+
+Fans a grid of V6Config overrides out over a ProcessPoolExecutor, running
+run_backtest() for each combination, and ranks the results.
+
+The candle block is placed in shared memory once; workers attach to it by
+name instead of receiving a pickled copy per task. Inside a worker,
+snapshot series are cached per V6Config.indicator_key(), and the grid is
+ordered so combinations that only change regime thresholds run back to
+back and reuse the same indicators.
+
+Usage:
+    python engine/sweep_v6.py --candles btc_5m.npy \\
+        --grid '{"rsi_period": [10, 14, 21], "threshold_trending": [0.62, 0.68, 0.74]}' \\
+        --rank-by total_return --out sweep.csv
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields, replace
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from sim_engine_v6 import (
+    CANDLE_FIELDS,
+    DEFAULT_CONFIG,
+    V6_INDICATOR_FIELDS,
+    CandleSeries,
+    V6Config,
+    compute_snapshot_series,
+)
+from backtest_v6 import load_candle_file, run_backtest
+from multi_timeframe import with_mtf_alignment
+
+# Metrics where smaller is better; everything else ranks descending
+ASCENDING_METRICS = {"brier_score", "max_drawdown"}
+
+
+# ─────────────────────────────────────────────────────────────
+# §1. Grid Expansion
+# ─────────────────────────────────────────────────────────────
+
+def expand_grid(grid: Dict[str, Sequence[Any]],
+                base: V6Config = DEFAULT_CONFIG) -> List[V6Config]:
+    """
+    Cartesian product of `grid` applied on top of `base`.
+
+    Combinations are ordered with indicator fields varying slowest, so
+    configs sharing an indicator_key() are adjacent. Invalid combinations
+    (e.g. ema_fast >= ema_slow) are dropped.
+    """
+    known = {f.name for f in fields(V6Config)}
+    unknown = set(grid) - known
+    if unknown:
+        raise ValueError(f"Unknown V6Config fields in grid: {sorted(unknown)}")
+
+    names = sorted(grid, key=lambda k: (k not in V6_INDICATOR_FIELDS, k))
+    configs = []
+    for values in itertools.product(*(grid[k] for k in names)):
+        cfg = replace(base, **dict(zip(names, values)))
+        if cfg.ema_fast >= cfg.ema_slow:
+            continue
+        configs.append(cfg)
+    return configs
+
+
+# ─────────────────────────────────────────────────────────────
+# §2. Worker Side (shared-memory candles)
+# ─────────────────────────────────────────────────────────────
+
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_candles: Optional[CandleSeries] = None
+_worker_series_cache: Dict[Any, Dict[str, np.ndarray]] = {}
+_worker_settings: Dict[str, Any] = {}
+
+
+def _init_worker(shm_name: str, n_rows: int, settings: Dict[str, Any]) -> None:
+    global _worker_shm, _worker_candles, _worker_settings
+    # Pool workers share the parent's resource tracker, so attaching does not
+    # hand ownership over; the parent unlinks the segment when the sweep ends.
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    data = np.ndarray((n_rows, len(CANDLE_FIELDS)), dtype=np.float64, buffer=_worker_shm.buf)
+    _worker_candles = CandleSeries(data)
+    _worker_settings = settings
+
+
+def _run_config(cfg: V6Config) -> Dict[str, Any]:
+    candles = _worker_candles
+    key = cfg.indicator_key()
+    series = _worker_series_cache.get(key)
+    if series is None:
+        _worker_series_cache.clear()  # configs arrive grouped by key; keep one
+        series = compute_snapshot_series(candles.high, candles.low, candles.close,
+                                         candles.volume, config=cfg)
+        if _worker_settings.get("mtf_alignment", True):
+            series = with_mtf_alignment(series, candles, _worker_settings.get("interval", "5m"), cfg)
+        _worker_series_cache[key] = series
+
+    result = run_backtest(candles, config=cfg, series=series, **_worker_settings)
+    row = {k: v for k, v in result.summary().items() if k != "decisions"}
+    row.update(result.decisions)
+    row["params"] = asdict(cfg)
+    return row
+
+
+# ─────────────────────────────────────────────────────────────
+# §3. Sweep Driver
+# ─────────────────────────────────────────────────────────────
+
+def run_sweep(candles: CandleSeries,
+              configs: List[V6Config],
+              max_workers: Optional[int] = None,
+              rank_by: str = "total_return",
+              **backtest_kwargs) -> List[Dict[str, Any]]:
+    """
+    Backtest every config in parallel and return rows ranked by `rank_by`.
+    `backtest_kwargs` (market_price, horizon, ...) go to run_backtest().
+    """
+    data = np.ascontiguousarray(candles.data)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, data.nbytes))
+    try:
+        np.ndarray(data.shape, dtype=np.float64, buffer=shm.buf)[:] = data
+        workers = max_workers or os.cpu_count() or 1
+        chunk = max(1, len(configs) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, data.shape[0], backtest_kwargs)) as pool:
+            rows = list(pool.map(_run_config, configs, chunksize=chunk))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    rows.sort(key=lambda r: r[rank_by], reverse=rank_by not in ASCENDING_METRICS)
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows
+
+
+def write_table(rows: List[Dict[str, Any]], path: str, grid_keys: Sequence[str]) -> None:
+    """Flatten ranked rows to CSV (swept parameters first, then metrics)."""
+    metric_keys = [k for k in rows[0] if k not in ("params", "rank")] if rows else []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["rank", *grid_keys, *metric_keys])
+        for row in rows:
+            writer.writerow([row["rank"], *(row["params"][k] for k in grid_keys),
+                             *(row[k] for k in metric_keys)])
+
+
+# ─────────────────────────────────────────────────────────────
+# §4. Entry Point
+# ─────────────────────────────────────────────────────────────
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Parallel V6Config grid search over a candle file")
+    ap.add_argument("--candles", required=True, help="candle file (.json Binance klines, .csv, .npy)")
+    ap.add_argument("--grid", help="JSON object: field -> list of values")
+    ap.add_argument("--grid-file", help="path to a JSON grid file")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument("--rank-by", default="total_return", help="metric to rank by")
+    ap.add_argument("--market-price", type=float, default=0.50)
+    ap.add_argument("--horizon", type=int, default=1)
+    ap.add_argument("--winrate", type=float, default=0.55)
+    ap.add_argument("--interval", default="5m", help="candle interval of the file")
+    ap.add_argument("--no-mtf", action="store_true",
+                    help="use the 5m-offset trend alignment instead of resampled timeframes")
+    ap.add_argument("--top", type=int, default=20, help="rows to print")
+    ap.add_argument("--out", help="CSV path for the full ranked table")
+    args = ap.parse_args()
+
+    if args.grid_file:
+        with open(args.grid_file, "r", encoding="utf-8") as f:
+            grid = json.load(f)
+    elif args.grid:
+        grid = json.loads(args.grid)
+    else:
+        raise SystemExit("Provide --grid or --grid-file")
+
+    candles = load_candle_file(args.candles)
+    configs = expand_grid(grid)
+    print(f"🧪 Sweeping {len(configs)} configs over {len(candles)} candles...")
+
+    rows = run_sweep(candles, configs, max_workers=args.workers, rank_by=args.rank_by,
+                     market_price=args.market_price, horizon=args.horizon,
+                     historical_winrate=args.winrate, interval=args.interval,
+                     mtf_alignment=not args.no_mtf)
+
+    keys = sorted(grid)
+    header = ["rank", *keys, "trades", "hit_rate", "brier_score", "total_return", "max_drawdown"]
+    print("  ".join(f"{h:>14}" for h in header))
+    for row in rows[:args.top]:
+        cells = [row["rank"], *(row["params"][k] for k in keys),
+                 row["trades"], row["hit_rate"], row["brier_score"], row["total_return"], row["max_drawdown"]]
+        print("  ".join(f"{c!s:>14}" for c in cells))
+
+    if args.out:
+        write_table(rows, args.out, keys)
+        print(f"\n✅ wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""
+IncrementalIndicatorState and the vectorized snapshot series against
+build_technical_snapshot, including stretches of zero volume.
+
+    python -m pytest -q engine/test_incremental_state.py
+"""
+
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+
+from sim_engine_v6 import (
+    DEFAULT_CONFIG,
+    CandleSeries,
+    IncrementalIndicatorState,
+    build_technical_snapshot,
+    build_technical_snapshot_series,
+    snapshot_at,
+)
+
+WINDOW = DEFAULT_CONFIG.lookback_candles
+
+
+def _candles(n: int = 2400, seed: int = 21, zero_volume=((2000, 2030),)) -> CandleSeries:
+    rng = np.random.default_rng(seed)
+    close = 60000 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    spread = close * rng.uniform(0.0005, 0.003, n)
+    volume = rng.lognormal(3, 1, n) * 1e3
+    for lo, hi in zero_volume:
+        volume[lo:hi] = 0.0
+    ts = np.arange(n) * 300_000.0
+    return CandleSeries(np.column_stack([ts, close, close + spread, close - spread, close, volume]))
+
+
+def _assert_same(a, b, t):
+    for name, want in asdict(b).items():
+        assert asdict(a)[name] == pytest.approx(want, rel=1e-6, abs=2e-4), (t, name)
+
+
+@pytest.mark.parametrize("zero_volume", [((2000, 2030),), ((150, 260), (900, 901)), ()])
+def test_incremental_snapshot_matches_build_technical_snapshot(zero_volume):
+    candles = _candles(zero_volume=zero_volume)
+    state = IncrementalIndicatorState(WINDOW)
+    for t, row in enumerate(candles.data.tolist()):
+        snap = state.update_values(*row)
+        if t < WINDOW - 1:
+            assert snap is None
+            continue
+        _assert_same(snap, build_technical_snapshot(candles.window(WINDOW, t + 1)), t)
+
+
+def test_zero_volume_ratio_is_exactly_neutral():
+    candles = _candles()
+    state = IncrementalIndicatorState(WINDOW)
+    series = build_technical_snapshot_series(candles, WINDOW)
+    period = DEFAULT_CONFIG.volume_ma_period
+    for t, row in enumerate(candles.data.tolist()):
+        snap = state.update_values(*row)
+        if 2000 + period <= t <= 2029:  # MA over zeros only, current volume zero
+            assert snap.volume_ratio == 1.0
+            assert series["volume_ratio"][t] == 1.0
+        if t == 2030:  # first volume after 20+ zero candles: MA is still 0
+            assert snap.volume_ratio == 1.0
+            assert series["volume_ratio"][t] == 1.0
+
+
+def test_series_matches_build_technical_snapshot():
+    candles = _candles(n=2200)
+    series = build_technical_snapshot_series(candles, WINDOW)
+    for t in range(WINDOW - 1, len(candles)):
+        _assert_same(snapshot_at(series, t), build_technical_snapshot(candles.window(WINDOW, t + 1)), t)
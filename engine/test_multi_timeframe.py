@@ -0,0 +1,108 @@
+"""
+Vectorized multi-timeframe replay (resample_candles, mtf_alignment_series)
+against the incremental MultiTimeframeState, and the store backfill that
+feeds the live path.
+
+    python -m pytest -q engine/test_multi_timeframe.py
+"""
+
+import numpy as np
+import pytest
+
+from candle_cache import CandleStore
+from multi_timeframe import (
+    CandleResampler,
+    MultiTimeframeState,
+    mtf_alignment_series,
+    mtf_history_rows,
+    resample_candles,
+)
+from sim_engine_v6 import DEFAULT_CONFIG, CandleSeries, backfill_klines
+
+STEP = 300_000.0  # 5m
+
+
+def _candles(n: int = 6200, seed: int = 4, gaps=((700, 703), (3001, 3002))) -> CandleSeries:
+    rng = np.random.default_rng(seed)
+    # Start mid-way through a 4h bucket, so the leading partial bars are dropped
+    ts = 1_700_000_000_000.0 - 1_700_000_000_000.0 % (4 * 3_600_000) + 7 * STEP + np.arange(n) * STEP
+    close = 60000 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    spread = close * rng.uniform(0.0005, 0.003, n)
+    volume = rng.lognormal(3, 1, n) * 1e3
+    data = np.column_stack([ts, close, close + spread, close - spread, close, volume])
+    keep = np.ones(n, dtype=bool)
+    for lo, hi in gaps:
+        keep[lo:hi] = False  # exchange outage: candles missing
+    return CandleSeries(np.ascontiguousarray(data[keep]))
+
+
+@pytest.mark.parametrize("target", ["15m", "1h", "4h"])
+def test_resample_candles_matches_incremental_resampler(target):
+    candles = _candles()
+    resampler = CandleResampler("5m", target)
+    bars = [bar for row in candles.data.tolist() for bar in resampler.update(*row)]
+    got = resample_candles(candles, "5m", target)
+    assert len(got) == len(bars)
+    np.testing.assert_allclose(got.data, np.array(bars), rtol=1e-12)
+
+
+def test_alignment_series_matches_multi_timeframe_state():
+    candles = _candles()
+    series = mtf_alignment_series(candles, "5m")
+    state = MultiTimeframeState("5m")
+    ready = 0
+    for t, row in enumerate(candles.data.tolist()):
+        state.update_values(*row)
+        want = state.trend_alignment()
+        if want is None:
+            assert np.isnan(series[t]), t
+        else:
+            assert series[t] == want, t
+            ready += 1
+    assert ready > 1000  # the 4h timeframe got a full window, too
+
+
+class _FakeKlines:
+    """Binance /klines over a fixed history: limit, startTime and endTime."""
+
+    def __init__(self, candles: CandleSeries):
+        self.rows = [[int(r[0]), *map(str, r[1:])] for r in candles.data.tolist()]
+        self.calls = 0
+
+    def get(self, url, params, timeout):
+        self.calls += 1
+        rows = self.rows
+        if "startTime" in params:
+            rows = [r for r in rows if r[0] >= params["startTime"]][:params["limit"]]
+        else:
+            if "endTime" in params:
+                rows = [r for r in rows if r[0] <= params["endTime"]]
+            rows = rows[-params["limit"]:]
+        return _Response(rows)
+
+
+class _Response:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def json(self):
+        return self._rows
+
+
+def test_backfill_reaches_mtf_history(tmp_path):
+    candles = _candles(gaps=())
+    http = _FakeKlines(candles)
+    store = CandleStore(tmp_path)
+    store.merge("BTCUSDT", "5m", candles.window(DEFAULT_CONFIG.lookback_candles))  # cold start
+    rows = mtf_history_rows("5m")
+    assert rows == 48 * (DEFAULT_CONFIG.lookback_candles + 1)
+
+    assert backfill_klines(store, "BTCUSDT", "5m", rows, session=http) == rows
+    np.testing.assert_array_equal(store.load("BTCUSDT", "5m").data, candles.window(rows).data)
+
+    calls = http.calls
+    assert backfill_klines(store, "BTCUSDT", "5m", rows, session=http) == rows
+    assert http.calls == calls  # already deep enough: no request
+
+    # Asking for more than the exchange has stops at the oldest candle
+    assert backfill_klines(store, "BTCUSDT", "5m", len(candles) + 500, session=http) == len(candles)
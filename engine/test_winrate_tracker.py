@@ -0,0 +1,115 @@
+"""
+WinRateTracker against the direct Supabase query, on the in-memory
+FakeSupabase (engine/fake_supabase.py).
+
+    python -m pytest -q engine/test_winrate_tracker.py
+"""
+
+import random
+import time
+from datetime import datetime, timezone
+
+from fake_supabase import FakeSupabase
+from sim_engine_v6 import WinRateTracker, get_historical_winrate, settle_prediction
+
+DAY = 24 * 3600
+BUCKET = 300
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def _insert(sb: FakeSupabase, pid: int, ts: float, is_win) -> None:
+    sb.table("predictions").insert({"id": pid, "created_at": _iso(ts), "is_win": is_win}).execute()
+
+
+def _direct_counts(sb: FakeSupabase, now: float):
+    rows = [r for r in sb.tables.get("predictions", [])
+            if r["is_win"] is not None
+            and datetime.fromisoformat(r["created_at"]).timestamp() >= now - DAY]
+    return sum(1 for r in rows if r["is_win"]), len(rows)
+
+
+def _seeded(seed: int = 11, rows: int = 1500):
+    """History over 36h, plus rows on both sides of the 24h edge and of the buckets around it."""
+    rng = random.Random(seed)
+    sb = FakeSupabase()
+    now = time.time()
+    edge = now - DAY
+    pid = 0
+    for _ in range(rows):
+        _insert(sb, pid, now - 36 * 3600 + rng.random() * 36 * 3600, rng.random() < 0.6)
+        pid += 1
+    for off in (-BUCKET - 1, -BUCKET, -60, -1, 1, 60, BUCKET, BUCKET + 1):
+        _insert(sb, pid, edge + off, off > 0)
+        pid += 1
+    return sb, now, pid
+
+
+def test_counts_match_direct_query_at_window_edge():
+    sb, now, _ = _seeded()
+    tracker = WinRateTracker(bucket_seconds=BUCKET, resync_seconds=None)
+    tracker.backfill(sb, now=now)
+    assert tracker.counts(now=now) == _direct_counts(sb, now)
+
+    # As time passes, rows leave the window one by one, not a bucket at a time
+    for dt in (0.5, 1.5, 59.5, 60.5, 150, BUCKET, BUCKET + 0.5, 2 * BUCKET + 7):
+        assert tracker.counts(now=now + dt) == _direct_counts(sb, now + dt), dt
+
+
+def test_winrate_matches_get_historical_winrate():
+    sb, _, pid = _seeded(seed=3)
+    tracker = WinRateTracker(bucket_seconds=BUCKET, resync_seconds=None)
+    tracker.backfill(sb)
+    rng = random.Random(5)
+    for k in range(30):
+        is_win = rng.random() < 0.4
+        now = time.time()
+        _insert(sb, pid + k, now, is_win)
+        tracker.record(is_win, _iso(now))
+        assert tracker.winrate() == get_historical_winrate(sb)
+
+
+def test_settle_prediction_updates_the_prior_without_a_query():
+    sb, now, pid = _seeded(seed=7)
+    for k in range(20):
+        _insert(sb, pid + k, now - 10 * k, None)  # open predictions
+    tracker = WinRateTracker(bucket_seconds=BUCKET, resync_seconds=None)
+    tracker.backfill(sb)
+
+    for k in range(20):
+        calls = sb.calls
+        assert settle_prediction(sb, pid + k, k % 3 == 0, tracker=tracker)
+        assert sb.calls == calls + 1  # the update only
+        assert tracker.winrate() == get_historical_winrate(sb)
+
+    # Settling again is a no-op for the counts
+    wins_total = tracker.counts()
+    assert not settle_prediction(sb, pid, False, tracker=tracker)
+    assert tracker.counts() == wins_total
+
+
+def test_stale_persisted_state_is_backfilled_before_use(tmp_path):
+    sb, now, _ = _seeded(seed=9)
+    path = tmp_path / "winrate.json"
+    old = WinRateTracker(bucket_seconds=BUCKET, path=str(path), resync_seconds=600)
+    old.backfill(sb, now=now - 3 * 86400)  # a run days ago
+    assert WinRateTracker(bucket_seconds=BUCKET, path=str(path), resync_seconds=600).counts(now=now) == (0, 0)
+
+    tracker = WinRateTracker(bucket_seconds=BUCKET, path=str(path), resync_seconds=600)
+    assert not tracker.warm
+    calls = sb.calls
+    assert get_historical_winrate(sb, tracker=tracker) == get_historical_winrate(sb)
+    assert sb.calls == calls + 2  # synchronous backfill, then the direct query
+    assert tracker.warm
+
+
+def test_recent_persisted_state_loads_warm(tmp_path):
+    sb, now, _ = _seeded(seed=13)
+    path = tmp_path / "winrate.json"
+    WinRateTracker(bucket_seconds=BUCKET, path=str(path), resync_seconds=600).backfill(sb)
+
+    tracker = WinRateTracker(bucket_seconds=BUCKET, path=str(path), resync_seconds=600)
+    assert tracker.warm
+    assert tracker.counts() == _direct_counts(sb, time.time())
@@ -0,0 +1,500 @@
+"""
+Durable, batched on-chain trade reporting for the V6 oracle.
+
+run_oracle_v6() used to block on `npx ts-node report_trade.ts` per signal,
+paying Node + ts-node + Anchor provider + IDL startup (seconds) on the
+decision path. Now a signal only appends one line to an on-disk journal
+and returns; a single long-lived reporter worker drains the journal in
+batches through one persistent reporter process.
+
+Queue directory (V6_REPORT_QUEUE_DIR, default engine/.trade_reports):
+
+    journal.jsonl   one report per line, appended (and fsync'ed) by submit()
+    offset          byte offset of the first report not yet delivered
+    failed.jsonl    reports the reporter rejected outright (dead letters)
+    sent.jsonl      the reporter's ledger of transactions sent and whether they landed
+    journal.lock    flock held while appending / advancing / compacting
+    worker.lock     flock held by the one process running the worker
+
+Delivery is at-least-once: a crash between a confirmed batch and the offset
+update, or a reporter killed after a timeout, re-sends that batch. Each
+report carries an `id`, and the reporter (given V6_REPORT_LEDGER) records
+every transaction in sent.jsonl before sending it, so a re-sent report that
+already landed is not reported twice: the worker acks it without sending,
+and report_trade.ts waits out a transaction it cannot yet place. Any number
+of processes may submit; the first one to take worker.lock drains for all
+of them.
+
+Reporter protocol (JSON lines over stdin/stdout, one batch per line):
+
+    -> {"batch": [{"id": "...", "pnl_bps": 12, "is_win": true, ...}, ...]}
+    <- {"ok": true, "results": [{"id": "...", "ok": true, "tx": "..."}, ...]}
+
+A batch-level failure ({"ok": false}, a crash or a timeout) is retried
+with backoff; an item with "ok": false goes to failed.jsonl. A batch that
+still fails after `max_attempts` tries is split in half, and the halves
+are tried in turn, down to single reports: one bad report ends up in
+failed.jsonl (with the last error) instead of wedging the queue. The default
+reporter is `report_trade.ts --serve` in SENTINEL_DIR (default: this repo);
+V6_REPORTER_CMD overrides it, e.g. with engine/fake_reporter.py.
+
+A one-shot run does not wait for delivery at exit (V6_REPORT_FLUSH_SECONDS
+defaults to 0): whatever is left stays journaled for the next run or for
+the drain command, e.g. from cron:
+
+    python engine/trade_reporter.py --drain            # deliver, then exit
+    python engine/trade_reporter.py --status           # pending / dead letters
+    python engine/trade_reporter.py --requeue-failed   # retry the dead letters
+"""
+
+import argparse
+import atexit
+import fcntl
+import json
+import os
+import select
+import shlex
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+SENTINEL_DIR = Path(os.environ.get("SENTINEL_DIR") or Path(__file__).resolve().parents[1])
+DEFAULT_QUEUE_DIR = Path(__file__).resolve().parent / ".trade_reports"
+DEFAULT_REPORTER_CMD = ["npx", "ts-node", "-T", "--skip-project", "scripts/report_trade.ts", "--serve"]
+
+
+def default_reporter_cmd() -> List[str]:
+    cmd = os.environ.get("V6_REPORTER_CMD")
+    return shlex.split(cmd) if cmd else list(DEFAULT_REPORTER_CMD)
+
+
+class _Flock:
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __enter__(self) -> "_Flock":
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        os.close(self._fd)  # releases the lock
+
+
+class TradeReportQueue:
+    """Append-only journal plus a delivered-offset file; see the module docstring."""
+
+    def __init__(self, root: Path, fsync: bool = True):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.journal = self.root / "journal.jsonl"
+        self.offset_path = self.root / "offset"
+        self.failed = self.root / "failed.jsonl"
+        self.ledger = self.root / "sent.jsonl"
+        self.fsync = fsync
+        self._lock = _Flock(self.root / "journal.lock")
+        with self._lock:
+            self._repair()
+
+    def _repair(self) -> None:
+        """Drop a torn last line left by a crash mid-append, so the next append starts clean."""
+        try:
+            size = self.journal.stat().st_size
+        except FileNotFoundError:
+            return
+        if size == 0:
+            return
+        with self.journal.open("rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            pos = size
+            while pos > 0:
+                step = min(4096, pos)
+                f.seek(pos - step)
+                chunk = f.read(step)
+                nl = chunk.rfind(b"\n")
+                if nl >= 0:
+                    f.truncate(pos - step + nl + 1)
+                    return
+                pos -= step
+            f.truncate(0)
+
+    def put(self, report: Dict) -> str:
+        report = dict(report)
+        report.setdefault("id", uuid.uuid4().hex)
+        report.setdefault("ts", time.time())
+        line = (json.dumps(report, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            fd = os.open(self.journal, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, line)
+                if self.fsync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+        return report["id"]
+
+    def _read_offset(self) -> int:
+        try:
+            return int(self.offset_path.read_text() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_offset(self, offset: int) -> None:
+        tmp = self.offset_path.with_suffix(".tmp")
+        tmp.write_text(str(offset))
+        os.replace(tmp, self.offset_path)
+
+    def peek(self, max_items: int) -> Tuple[List[Dict], int]:
+        """Up to `max_items` undelivered reports and the offset just past them."""
+        offset = self._read_offset()
+        items: List[Dict] = []
+        try:
+            f = self.journal.open("rb")
+        except FileNotFoundError:
+            return items, offset
+        with f:
+            if offset > os.fstat(f.fileno()).st_size:
+                offset = 0  # journal was compacted underneath a stale offset
+            f.seek(offset)
+            end = offset
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # append in progress
+                end += len(line)
+                try:
+                    items.append(json.loads(line))
+                except ValueError:
+                    continue  # unreadable line: skip it rather than block the queue
+                if len(items) >= max_items:
+                    break
+        return items, end
+
+    def ack(self, end: int) -> None:
+        """
+        Mark everything before `end` delivered; empty the journal once fully
+        drained, and the ledger too unless dead letters may still be requeued.
+        """
+        with self._lock:
+            size = self.journal.stat().st_size if self.journal.exists() else 0
+            if end >= size:
+                self._write_offset(0)  # offset first: a crash in between only re-sends
+                self.journal.open("wb").close()
+                if self.ledger.exists() and not (self.failed.exists() and self.failed.stat().st_size):
+                    self.ledger.open("wb").close()
+            else:
+                self._write_offset(end)
+
+    def landed_ids(self) -> Dict[str, str]:
+        """{report id: tx signature} for reports the ledger shows landed on-chain."""
+        sent: Dict[str, List[str]] = {}
+        landed: Dict[str, str] = {}
+        try:
+            f = self.ledger.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return landed
+        with f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn last line
+                if "ids" in rec:
+                    sent[rec["sig"]] = rec["ids"]
+                elif rec.get("landed"):
+                    landed.update((i, rec["sig"]) for i in sent.get(rec["sig"], ()))
+        return landed
+
+    def dead_letter(self, items: Sequence[Dict], errors: Optional[Dict[str, str]] = None) -> None:
+        """Append `items` to failed.jsonl, each with its `errors[id]` (if any) as "error"."""
+        errors = errors or {}
+        with self.failed.open("a", encoding="utf-8") as f:
+            for item in items:
+                error = errors.get(item.get("id"))
+                f.write(json.dumps({**item, "error": error} if error else item) + "\n")
+
+    def pending(self) -> int:
+        return len(self.peek(1 << 30)[0])
+
+    def failed_count(self) -> int:
+        try:
+            with self.failed.open("rb") as f:
+                return sum(1 for _ in f)
+        except FileNotFoundError:
+            return 0
+
+    def requeue_failed(self) -> int:
+        """Move the dead letters back onto the journal (same ids, without "error"); returns how many."""
+        with self._lock:
+            try:
+                lines = self.failed.read_text(encoding="utf-8").splitlines()
+            except FileNotFoundError:
+                return 0
+            items = []
+            for line in lines:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue
+                item.pop("error", None)
+                items.append(item)
+            data = "".join(json.dumps(i, separators=(",", ":")) + "\n" for i in items).encode("utf-8")
+            fd = os.open(self.journal, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, data)
+                if self.fsync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            self.failed.unlink()
+        return len(items)
+
+
+class SubprocessReporter:
+    """
+    One long-lived reporter process, (re)started on demand; send() is one
+    batch round trip. `ledger` is passed to it as V6_REPORT_LEDGER.
+    """
+
+    def __init__(self, cmd: Optional[Sequence[str]] = None, cwd: Optional[Path] = None,
+                 timeout: float = 120.0, ledger: Optional[Path] = None):
+        self.cmd = list(cmd or default_reporter_cmd())
+        self.cwd = Path(cwd or SENTINEL_DIR)
+        self.timeout = timeout
+        self.ledger = ledger
+        self._proc: Optional[subprocess.Popen] = None
+
+    def _ensure(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            env = dict(os.environ, V6_REPORT_LEDGER=str(self.ledger)) if self.ledger else None
+            self._proc = subprocess.Popen(self.cmd, cwd=self.cwd, stdin=subprocess.PIPE,
+                                          stdout=subprocess.PIPE, bufsize=0, env=env)
+        return self._proc
+
+    def send(self, batch: List[Dict]) -> Dict:
+        proc = self._ensure()
+        try:
+            proc.stdin.write((json.dumps({"batch": batch}) + "\n").encode("utf-8"))
+            proc.stdin.flush()
+            deadline = time.monotonic() + self.timeout
+            buf = b""
+            while not buf.endswith(b"\n"):
+                left = deadline - time.monotonic()
+                if left <= 0 or not select.select([proc.stdout], [], [], left)[0]:
+                    raise TimeoutError(f"reporter gave no answer in {self.timeout}s")
+                chunk = os.read(proc.stdout.fileno(), 1 << 16)
+                if not chunk:
+                    raise EOFError(f"reporter exited ({proc.poll()})")
+                buf += chunk
+            return json.loads(buf)
+        except Exception:
+            self.close()  # unknown state: start a fresh process for the retry
+            raise
+
+    def close(self, grace: float = 5.0) -> None:
+        """Close the reporter's stdin and give it `grace` seconds to exit before killing it."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=grace)
+        except Exception:
+            proc.kill()
+            proc.wait()
+
+
+class TradeReporter:
+    """
+    submit() journals a report and returns at once; the worker thread (in
+    whichever process holds worker.lock) sends batches of up to `max_batch`,
+    waiting up to `max_wait` seconds for a batch to fill. A batch that fails
+    `max_attempts` times in a row is halved until the failing report is
+    alone, and that one is dead-lettered.
+    """
+
+    def __init__(self, queue: TradeReportQueue, reporter: Optional[SubprocessReporter] = None,
+                 max_batch: int = 16, max_wait: float = 0.5, max_attempts: int = 6,
+                 backoff: float = 1.0, max_backoff: float = 60.0):
+        self.queue = queue
+        self.reporter = reporter or SubprocessReporter(ledger=queue.ledger)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.delivered = 0
+        self.last_error: Optional[str] = None
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._worker_fd: Optional[int] = None
+
+    def submit(self, pnl_bps: int, is_win: bool, **meta) -> str:
+        report_id = self.queue.put({"pnl_bps": int(pnl_bps), "is_win": bool(is_win), **meta})
+        self.start()
+        self._idle.clear()
+        self._wake.set()
+        return report_id
+
+    def start(self) -> bool:
+        """Run the worker here unless another process already does; True if this process is the worker."""
+        if self._thread is not None:
+            return True
+        fd = os.open(self.queue.root / "worker.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._worker_fd = fd
+        self._thread = threading.Thread(target=self._run, name="v6-trade-reporter", daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self) -> None:
+        backoff = self.backoff
+        limit = self.max_batch  # batch size, halved while isolating a failing report
+        split_end = None  # journal offset up to which batches stay at `limit`
+        attempts = 0
+        while not self._stop.is_set():
+            items, end = self.queue.peek(limit)
+            if not items:
+                self._idle.set()
+                self._wake.wait(timeout=5.0)  # also picks up other processes' submissions
+                self._wake.clear()
+                continue
+            if len(items) < limit and self.max_wait > 0 and not self._stop.is_set():
+                time.sleep(self.max_wait)  # let a burst of signals share one batch
+                if self._stop.is_set():
+                    break
+                items, end = self.queue.peek(limit)
+            landed = self.queue.landed_ids()  # delivered by an attempt whose answer was lost
+            skipped = sum(i.get("id") in landed for i in items)
+            items = [i for i in items if i.get("id") not in landed]
+            if not items:
+                self.queue.ack(end)
+                self.delivered += skipped
+                continue
+            try:
+                resp = self.reporter.send(items)
+                if not resp.get("ok"):
+                    raise RuntimeError(resp.get("error") or "reporter refused the batch")
+            except Exception as e:
+                if self._stop.is_set():
+                    break  # reporter killed by close(): the batch stays journaled
+                self.last_error = f"{type(e).__name__}: {e}"
+                attempts += 1
+                if attempts >= self.max_attempts:
+                    attempts = 0
+                    if len(items) == 1:
+                        print(f"⚠️  Trade reporter: giving up on report {items[0].get('id')}: {self.last_error}")
+                        self.queue.dead_letter(items, {items[0].get("id"): self.last_error})
+                        self.queue.ack(end)
+                        self.delivered += skipped
+                        if split_end is not None and end >= split_end:
+                            limit, split_end = self.max_batch, None
+                        continue
+                    limit = len(items) // 2
+                    split_end = max(split_end or 0, end)
+                    print(f"⚠️  Trade reporter: batch of {len(items)} kept failing, retrying in halves")
+                print(f"⚠️  Trade reporter: {self.last_error} (retry in {backoff:.0f}s)")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            backoff = self.backoff
+            attempts = 0
+            if split_end is not None and end >= split_end:
+                limit, split_end = self.max_batch, None  # past the batch that failed
+            errors = {r.get("id"): r.get("error") for r in resp.get("results") or [] if not r.get("ok")}
+            if errors:
+                self.queue.dead_letter([i for i in items if i.get("id") in errors], errors)
+            self.queue.ack(end)
+            self.delivered += skipped + len(items) - len(errors)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until the journal is drained (only meaningful in the worker process)."""
+        if self._thread is None:
+            return False
+        self._wake.set()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._idle.wait(timeout=0.05) and not self.queue.peek(1)[0]:
+                return True
+        return False
+
+    def close(self, timeout: float = 10.0) -> None:
+        """
+        Drain for up to `timeout` seconds, then stop; undelivered reports stay
+        journaled. A batch still in flight gets at most min(timeout, 5)
+        seconds before the reporter is killed (its ledger covers the resend).
+        """
+        grace = min(timeout, 5.0)
+        if self._thread is not None:
+            if timeout > 0:
+                self.flush(timeout)
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout=grace)
+            self._thread = None
+        self.reporter.close(grace)
+        if self._worker_fd is not None:
+            os.close(self._worker_fd)
+            self._worker_fd = None
+
+
+_default_reporter: Optional[TradeReporter] = None
+
+
+def get_trade_reporter() -> TradeReporter:
+    """
+    Process-wide reporter. V6_REPORT_QUEUE_DIR, V6_REPORTER_CMD and
+    SENTINEL_DIR configure where reports are journaled and what delivers
+    them. At exit it drains for up to V6_REPORT_FLUSH_SECONDS (default 0:
+    exit at once and leave the rest to the next run or `--drain`).
+    """
+    global _default_reporter
+    if _default_reporter is None:
+        queue = TradeReportQueue(Path(os.environ.get("V6_REPORT_QUEUE_DIR") or DEFAULT_QUEUE_DIR))
+        _default_reporter = TradeReporter(queue)
+        flush_s = float(os.environ.get("V6_REPORT_FLUSH_SECONDS", "0"))
+        atexit.register(_default_reporter.close, flush_s)
+    return _default_reporter
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Deliver or inspect the journaled V6 trade reports")
+    ap.add_argument("--drain", action="store_true", help="deliver everything journaled, then exit")
+    ap.add_argument("--timeout", type=float, default=300.0, help="give up draining after this many seconds")
+    ap.add_argument("--status", action="store_true", help="print pending and dead-lettered counts")
+    ap.add_argument("--requeue-failed", action="store_true", help="move dead letters back onto the journal")
+    args = ap.parse_args()
+
+    queue = TradeReportQueue(Path(os.environ.get("V6_REPORT_QUEUE_DIR") or DEFAULT_QUEUE_DIR))
+    if args.requeue_failed:
+        print(f"↩️  {queue.requeue_failed()} dead-lettered report(s) requeued")
+    if args.drain:
+        reporter = TradeReporter(queue)
+        if not reporter.start():
+            print("⏳ Another process is already draining this queue")
+            return 0
+        try:
+            drained = reporter.flush(args.timeout)
+        finally:
+            reporter.close(0)
+        print(f"{'✅' if drained else '⚠️ '} {reporter.delivered} report(s) delivered, {queue.pending()} pending"
+              + (f" (last error: {reporter.last_error})" if reporter.last_error and not drained else ""))
+        if not drained:
+            return 1
+    if args.status or not (args.drain or args.requeue_failed):
+        print(f"📒 {queue.root}: {queue.pending()} pending, {queue.failed_count()} dead-lettered")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
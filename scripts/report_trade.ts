@@ -1,23 +1,102 @@
 import * as anchor from "@coral-xyz/anchor";
 import { Program } from "@coral-xyz/anchor";
 import { SolanaSentinel } from "../target/types/solana_sentinel";
-import { PublicKey, Keypair } from "@solana/web3.js";
+import {
+    PublicKey,
+    SendTransactionError,
+    Transaction,
+    TransactionExpiredBlockheightExceededError,
+    TransactionInstruction,
+} from "@solana/web3.js";
 import * as fs from "fs";
+import * as path from "path";
+import * as readline from "readline";
 
-async function main() {
-    const args = process.argv.slice(2);
-    if (args.length < 2) {
-        console.error("Usage: ts-node report_trade.ts <pnl_bps> <is_win>");
-        process.exit(1);
+// Usage:
+//   ts-node report_trade.ts <pnl_bps> <is_win>   one report, then exit
+//   ts-node report_trade.ts --serve              long-lived reporter for engine/trade_reporter.py:
+//     reads {"batch": [{"id", "pnl_bps", "is_win"}, ...]} lines on stdin, answers each with
+//     {"ok": true, "results": [{"id", "ok", "tx"}]} on stdout (logs go to stderr).
+//     When a transaction fails, its reports are simulated one by one: those the
+//     program rejects are answered {"id", "ok": false, "error"} and the rest are
+//     sent again. If none is rejected the failure is transient and the whole
+//     batch is answered {"ok": false} so the caller retries it.
+//
+// Dedupe across restarts: with V6_REPORT_LEDGER set (engine/trade_reporter.py
+// points it at <queue>/sent.jsonl), every transaction is signed first and
+// {"sig", "ids", "blockhash", "lastValidBlockHeight"} is fsync'ed to the ledger
+// before it is sent; {"sig", "landed"} follows once its fate is known. A
+// report already landed is answered ok without sending; one whose earlier
+// transaction is still unresolved (the process was killed mid-send) waits for
+// that transaction to confirm or expire first. So a retry after a timeout or
+// a crash never reports a trade twice.
+//
+// The IDL is resolved from this script's location (override with SENTINEL_IDL),
+// so the script no longer has to run from a fixed checkout path.
+
+const MAX_IX_PER_TX = 8; // report_trade instructions packed into one transaction
+
+type Report = { id?: string; pnl_bps: number; is_win: boolean };
+type Result = { id?: string; ok: boolean; tx?: string; error?: string };
+type Sent = { sig: string; ids: string[]; blockhash: string; lastValidBlockHeight: number };
+
+class Ledger {
+    landed = new Map<string, string>(); // report id -> signature of the transaction that recorded it
+    unresolved = new Map<string, Sent>(); // report id -> transaction sent but not known to have landed or expired
+
+    constructor(private file?: string) {
+        if (!file || !fs.existsSync(file)) return;
+        const sent = new Map<string, Sent>();
+        for (const line of fs.readFileSync(file, "utf8").split("\n")) {
+            let rec: any;
+            try {
+                rec = JSON.parse(line);
+            } catch {
+                continue; // blank or torn last line
+            }
+            if (rec.ids) sent.set(rec.sig, rec);
+            else if (sent.has(rec.sig)) this.apply(sent.get(rec.sig)!, rec.landed, false);
+        }
+        for (const rec of sent.values()) {
+            for (const id of rec.ids) if (!this.landed.has(id)) this.unresolved.set(id, rec);
+        }
     }
 
-    const pnlBps = parseInt(args[0]);
-    const isWin = args[1] === "true";
+    private append(rec: object) {
+        if (!this.file) return;
+        const fd = fs.openSync(this.file, "a");
+        try {
+            fs.writeSync(fd, JSON.stringify(rec) + "\n");
+            fs.fsyncSync(fd);
+        } finally {
+            fs.closeSync(fd);
+        }
+    }
+
+    private apply(rec: Sent, landed: boolean, persist = true) {
+        if (persist) this.append({ sig: rec.sig, landed });
+        for (const id of rec.ids) {
+            this.unresolved.delete(id);
+            if (landed) this.landed.set(id, rec.sig);
+        }
+    }
+
+    sent(rec: Sent) {
+        this.append(rec);
+        for (const id of rec.ids) this.unresolved.set(id, rec);
+    }
+
+    resolved(rec: Sent, landed: boolean) {
+        this.apply(rec, landed);
+    }
+}
 
+function setup() {
     const provider = anchor.AnchorProvider.env();
     anchor.setProvider(provider);
 
-    const idl = JSON.parse(fs.readFileSync("./target/idl/solana_sentinel.json", "utf8"));
+    const idlPath = process.env.SENTINEL_IDL || path.join(__dirname, "..", "target", "idl", "solana_sentinel.json");
+    const idl = JSON.parse(fs.readFileSync(idlPath, "utf8"));
     const program = new anchor.Program(idl, provider) as Program<SolanaSentinel>;
 
     // Load Oracle keypair (assumed to be the provider wallet for now)
@@ -37,18 +116,145 @@ async function main() {
         program.programId
     );
 
-    console.log(`Reporting to Vault: ${vaultPda.toBase58()}`);
-    console.log(`PnL: ${pnlBps} bps, Win: ${isWin}`);
-
-    try {
-        const tx = await program.methods
-            .reportTrade(new anchor.BN(pnlBps), isWin)
+    const instruction = (r: Report): Promise<TransactionInstruction> =>
+        program.methods
+            .reportTrade(new anchor.BN(r.pnl_bps), r.is_win)
             .accounts({
                 vault: vaultPda,
                 agentProfile: agentProfilePda,
                 oracle: oracle.publicKey,
             })
-            .rpc();
+            .instruction();
+
+    // Program error for a report sent on its own (null if it would succeed);
+    // RPC failures throw, so they are never mistaken for a rejection.
+    const rejection = async (r: Report): Promise<string | null> => {
+        const tx = new Transaction().add(await instruction(r));
+        tx.feePayer = oracle.publicKey;
+        const sim = await provider.connection.simulateTransaction(tx);
+        return sim.value.err ? JSON.stringify(sim.value.err) : null;
+    };
+
+    // Whether a sent transaction landed without error; waits for it while its blockhash is still valid.
+    const settle = async (rec: Sent): Promise<boolean> => {
+        const status = (await provider.connection.getSignatureStatus(rec.sig, { searchTransactionHistory: true })).value;
+        if (status && status.confirmationStatus && status.confirmationStatus !== "processed") return !status.err;
+        try {
+            const res = await provider.connection.confirmTransaction(
+                { signature: rec.sig, blockhash: rec.blockhash, lastValidBlockHeight: rec.lastValidBlockHeight },
+                "confirmed"
+            );
+            return !res.value.err;
+        } catch (e) {
+            if (e instanceof TransactionExpiredBlockheightExceededError) return false; // can no longer land
+            throw e;
+        }
+    };
+
+    // Sign, record in the ledger, then send and confirm one transaction.
+    const sendLogged = async (ledger: Ledger, chunk: Report[]): Promise<string> => {
+        const { blockhash, lastValidBlockHeight } = await provider.connection.getLatestBlockhash("confirmed");
+        const tx = new Transaction({ feePayer: oracle.publicKey, blockhash, lastValidBlockHeight }).add(
+            ...(await Promise.all(chunk.map(instruction)))
+        );
+        const signed = await oracle.signTransaction(tx);
+        const rec: Sent = {
+            sig: anchor.utils.bytes.bs58.encode(signed.signature!),
+            ids: chunk.map((r) => r.id).filter((id): id is string => !!id),
+            blockhash,
+            lastValidBlockHeight,
+        };
+        ledger.sent(rec);
+        try {
+            await provider.connection.sendRawTransaction(signed.serialize());
+        } catch (e) {
+            if (e instanceof SendTransactionError) ledger.resolved(rec, false); // refused by the node (e.g. preflight)
+            throw e;
+        }
+        const landed = await settle(rec);
+        ledger.resolved(rec, landed);
+        if (!landed) throw new Error(`transaction ${rec.sig} failed or expired`);
+        return rec.sig;
+    };
+
+    return { provider, vaultPda, instruction, rejection, settle, sendLogged };
+}
+
+async function serve() {
+    const { vaultPda, rejection, settle, sendLogged } = setup();
+    const ledger = new Ledger(process.env.V6_REPORT_LEDGER);
+    const send = (chunk: Report[]) => sendLogged(ledger, chunk);
+    console.error(`Reporter ready for Vault: ${vaultPda.toBase58()}`);
+
+    const rl = readline.createInterface({ input: process.stdin, terminal: false });
+    for await (const line of rl) {
+        if (!line.trim()) continue;
+        let batch: Report[];
+        try {
+            batch = JSON.parse(line).batch;
+        } catch (e) {
+            process.stdout.write(JSON.stringify({ ok: false, error: `bad request: ${e}` }) + "\n");
+            continue;
+        }
+        const results: Result[] = [];
+        try {
+            // Transactions from an earlier attempt must land or expire before their reports are re-sent
+            for (const rec of new Set(batch.map((r) => r.id && ledger.unresolved.get(r.id)))) {
+                if (rec) ledger.resolved(rec, await settle(rec));
+            }
+            const todo = batch.filter((r) => !(r.id && ledger.landed.has(r.id)));
+            for (const r of batch) if (r.id && ledger.landed.has(r.id)) results.push({ id: r.id, ok: true, tx: ledger.landed.get(r.id) });
+            for (let i = 0; i < todo.length; i += MAX_IX_PER_TX) {
+                let chunk = todo.slice(i, i + MAX_IX_PER_TX);
+                let sig: string;
+                try {
+                    sig = await send(chunk);
+                } catch (e) {
+                    // Sent but unresolved (RPC failure while confirming): it may still land, so never re-send here
+                    if (chunk.some((r) => r.id && ledger.unresolved.has(r.id))) throw e;
+                    const errors = await Promise.all(chunk.map(rejection));
+                    if (!errors.some((err) => err)) throw e;
+                    chunk.forEach((r, k) => {
+                        if (errors[k]) results.push({ id: r.id, ok: false, error: errors[k]! });
+                    });
+                    console.error(`❌ ${errors.filter((err) => err).length} trade report(s) rejected by the program`);
+                    chunk = chunk.filter((_, k) => !errors[k]);
+                    if (!chunk.length) continue;
+                    sig = await send(chunk);
+                }
+                for (const r of chunk) results.push({ id: r.id, ok: true, tx: sig });
+                console.error(`✅ ${chunk.length} trade(s) reported on-chain. TX: ${sig}`);
+            }
+            process.stdout.write(JSON.stringify({ ok: true, results }) + "\n");
+        } catch (e) {
+            // Chunks already confirmed are in the ledger, so the retry skips them
+            console.error("❌ Failed to report batch:", e);
+            process.stdout.write(JSON.stringify({ ok: false, error: String(e) }) + "\n");
+        }
+    }
+}
+
+async function main() {
+    const args = process.argv.slice(2);
+    if (args[0] === "--serve") {
+        await serve();
+        return;
+    }
+    if (args.length < 2) {
+        console.error("Usage: ts-node report_trade.ts <pnl_bps> <is_win> | --serve");
+        process.exit(1);
+    }
+
+    const pnlBps = parseInt(args[0]);
+    const isWin = args[1] === "true";
+
+    const { provider, vaultPda, instruction } = setup();
+
+    console.log(`Reporting to Vault: ${vaultPda.toBase58()}`);
+    console.log(`PnL: ${pnlBps} bps, Win: ${isWin}`);
+
+    try {
+        const tx = await provider.sendAndConfirm(new Transaction().add(await instruction({ pnl_bps: pnlBps, is_win: isWin })));
         console.log(`✅ Trade reported on-chain! TX: ${tx}`);
     } catch (e) {
         console.error("❌ Failed to report trade:", e);